@@ -4,12 +4,11 @@
 # See top-level LICENSE file for more information
 
 from collections import defaultdict
-import functools
 from functools import wraps
 import os
 import re
 import textwrap
-from typing import List
+from typing import Any, Callable, Dict, List
 
 import docutils.nodes
 import docutils.parsers.rst
@@ -331,6 +330,21 @@ class APIDocException(Exception):
     """
 
 
+_doc_data_registry: Dict[Callable, Dict[str, Any]] = {}
+
+
+def get_doc_data_registry() -> Dict[Callable, Dict[str, Any]]:
+    """
+    Return documentation data of all declared API endpoints, indexed by
+    endpoint implementation function.
+
+    Documentation data are compiled once when an endpoint is declared through
+    the :func:`api_doc` decorator so docstrings are never parsed when
+    processing requests.
+    """
+    return _doc_data_registry
+
+
 def api_doc(
     route: str,
     *,
@@ -364,9 +378,13 @@ def api_doc(
 
     # @api_doc() Decorator call
     def decorator(f):
+        # compile documentation data once, views below only hold a reference
+        # to them
+        doc_data = get_doc_data(f, route, noargs)
+        _doc_data_registry[f] = doc_data
+
         # if the route is not hidden, add it to the index
         if "hidden" not in tags_set:
-            doc_data = get_doc_data(f, route, noargs)
             doc_desc = doc_data["description"]
             api_urls.add_doc_route(
                 route,
@@ -381,7 +399,6 @@ def api_doc(
         @api_view(["GET", "HEAD"])
         @wraps(f)
         def doc_view(request):
-            doc_data = get_doc_data(f, route, noargs)
             return make_api_response(request, None, doc_data)
 
         route_name = "%s-doc" % route[1:-1].replace("/", "-")
@@ -403,7 +420,6 @@ def api_doc(
 
         @wraps(f)
         def documented_view(request, **kwargs):
-            doc_data = get_doc_data(f, route, noargs)
             try:
                 return {"data": f(request, **kwargs), "doc_data": doc_data}
             except Exception as exc:
@@ -415,10 +431,13 @@ def api_doc(
     return decorator
 
 
-@functools.lru_cache(maxsize=32)
 def get_doc_data(f, route, noargs):
     """
     Build documentation data for the decorated api endpoint function
+
+    As this involves parsing its docstring with docutils, data should rather
+    be obtained from :func:`get_doc_data_registry` once the endpoint is
+    declared.
     """
     data = {
         "description": "",
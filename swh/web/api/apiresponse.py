@@ -127,7 +127,9 @@ def make_api_response(
         options["headers"] = compute_link_header(data)
         data = transform(data)
         data = filter_by_fields(request, data)
-    doc_data = doc_data or {}
+    # documentation data are shared between requests, copy them before
+    # adding response specific entries
+    doc_data = dict(doc_data or {})
     headers = {}
     if "headers" in options:
         doc_data["headers_data"] = options["headers"]
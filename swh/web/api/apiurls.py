@@ -12,6 +12,7 @@ from rest_framework.decorators import api_view
 
 from swh.web.api import throttling
 from swh.web.api.apiresponse import make_api_response
+from swh.web.utils.immutable_objects import ObjectIdentifier, immutable_object_response
 from swh.web.utils.urlsindex import UrlsIndex
 
 CategoryId = Literal[
@@ -75,6 +76,7 @@ def api_route(
     never_cache: bool = False,
     api_urls: APIUrls = api_urls,
     query_params_serializer: Optional[type[serializers.Serializer]] = None,
+    immutable_object: Optional[ObjectIdentifier] = None,
 ):
     """
     Decorator to ease the registration of an API endpoint
@@ -91,8 +93,12 @@ def api_route(
         never_cache: define if api response must be cached
         query_params_serializer: an optional DRF serializer to validate the API call
             query parameters
+        immutable_object: if the API route serves an immutable archived object,
+            function computing its identifier from the view arguments, see
+            :mod:`swh.web.utils.immutable_objects`
 
     """
+    assert not (never_cache and immutable_object), "immutable objects can be cached"
 
     url_pattern = "api/" + api_version + url_pattern
 
@@ -123,22 +129,29 @@ def api_route(
                 serializer.is_valid(raise_exception=True)
                 kwargs["validated_query_params"] = serializer.validated_data
 
-            response = f(request, **kwargs)
-            doc_data = None
-            # check if response has been forwarded by api_doc decorator
-            if isinstance(response, dict) and "doc_data" in response:
-                doc_data = response["doc_data"]
-                response = response["data"]
-            # check if HTTP response needs to be created
-            api_response: HttpResponseBase
-            if not isinstance(response, HttpResponseBase):
-                api_response = make_api_response(
-                    request, data=response, doc_data=doc_data
+            def get_response() -> HttpResponseBase:
+                response = f(request, **kwargs)
+                doc_data = None
+                # check if response has been forwarded by api_doc decorator
+                if isinstance(response, dict) and "doc_data" in response:
+                    doc_data = response["doc_data"]
+                    response = response["data"]
+                # check if HTTP response needs to be created
+                api_response: HttpResponseBase
+                if not isinstance(response, HttpResponseBase):
+                    api_response = make_api_response(
+                        request, data=response, doc_data=doc_data
+                    )
+                else:
+                    api_response = response
+
+                return api_response
+
+            if immutable_object is not None:
+                return immutable_object_response(
+                    request, immutable_object(**kwargs), get_response
                 )
-            else:
-                api_response = response
-
-            return api_response
+            return get_response()
 
         # small hacks for correctly generating API endpoints index doc
         api_view_f.__name__ = f.__name__
@@ -0,0 +1,62 @@
+# Copyright (C) 2026  The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU Affero General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+import functools
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.urls import get_resolver
+
+from swh.web.api.apidoc import get_doc_data, get_doc_data_registry
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the per request overhead of obtaining API documentation data "
+        "under a mixed endpoints load"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=10000,
+            help="Number of simulated API requests",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Seed of the endpoints sequence"
+        )
+
+    def handle(self, *args, **options):
+        # ensure all API endpoints are declared
+        get_resolver().url_patterns
+        registry = get_doc_data_registry()
+        endpoints = random.Random(options["seed"]).choices(
+            list(registry), k=options["requests"]
+        )
+
+        # previous implementation, docstrings parsed with docutils when
+        # processing a request and results stored in a 32 entries LRU cache
+        lru_get_doc_data = functools.lru_cache(maxsize=32)(get_doc_data)
+        start = time.perf_counter()
+        for f in endpoints:
+            doc_data = registry[f]
+            lru_get_doc_data(f, doc_data["route"], doc_data["noargs"])
+        lru_latency = (time.perf_counter() - start) / len(endpoints)
+        cache_info = lru_get_doc_data.cache_info()
+
+        start = time.perf_counter()
+        for f in endpoints:
+            registry[f]
+        registry_latency = (time.perf_counter() - start) / len(endpoints)
+
+        self.stdout.write(
+            f"{len(registry)} documented endpoints, {len(endpoints)} requests\n"
+            f"lru_cache(32): {lru_latency * 1e6:.2f}us per request "
+            f"({cache_info.misses} docstrings parsed)\n"
+            f"registry: {registry_latency * 1e6:.2f}us per request "
+            "(no docstring parsed)"
+        )
@@ -0,0 +1,118 @@
+# Copyright (C) 2026  The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU Affero General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+from datetime import datetime, timedelta, timezone
+import hashlib
+import time
+from typing import Any, Callable, Dict, List
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from swh.web.api.renderers import FastJSONRenderer, orjson
+
+
+def _sha1_git(seed: str) -> str:
+    return hashlib.sha1(seed.encode()).hexdigest()
+
+
+def snapshot_payload(nb_branches: int) -> Dict[str, Any]:
+    """Build a payload similar to the one returned by /api/1/snapshot/."""
+    return {
+        "id": _sha1_git("snapshot"),
+        "branches": {
+            f"refs/heads/branch-{i}": {
+                "target": _sha1_git(f"revision-{i}"),
+                "target_type": "revision",
+                "target_url": (
+                    "https://archive.softwareheritage.org/api/1/revision/"
+                    f"{_sha1_git(f'revision-{i}')}/"
+                ),
+            }
+            for i in range(nb_branches)
+        },
+        "next_branch": None,
+    }
+
+
+def origin_search_payload(nb_origins: int) -> List[Dict[str, Any]]:
+    """Build a payload similar to the one returned by /api/1/origin/search/."""
+    date = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "url": f"https://example.org/user/project-{i}",
+            "origin_visits_url": (
+                "https://archive.softwareheritage.org/api/1/origin/"
+                f"https://example.org/user/project-{i}/visits/"
+            ),
+            "visit_types": ["git"],
+            "has_visits": True,
+            "metadata": {
+                "description": f"Project number {i}",
+                "last_update": date + timedelta(days=i),
+                "name": f"project-{i}".encode(),
+            },
+        }
+        for i in range(nb_origins)
+    ]
+
+
+PAYLOADS: Dict[str, Callable[[int], Any]] = {
+    "snapshot": snapshot_payload,
+    "origin_search": origin_search_payload,
+}
+
+
+class Command(BaseCommand):
+    help = "Compare latencies of the JSON renderers used by the Web API"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[10, 100, 1000, 10000],
+            help="Number of items in benchmarked payloads",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=100,
+            help="Number of renderings for each payload",
+        )
+
+    def _latency(self, renderer, data: Any, iterations: int) -> float:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            renderer.render(data)
+        return (time.perf_counter() - start) / iterations
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stderr.write(
+                self.style.WARNING(
+                    "orjson is not installed, FastJSONRenderer falls back "
+                    "to the default DRF renderer"
+                )
+            )
+        renderers = {"drf": JSONRenderer(), "fast": FastJSONRenderer()}
+        self.stdout.write(
+            f"{'payload':<15}{'size':>8}{'bytes':>12}"
+            f"{'drf (ms)':>12}{'fast (ms)':>12}{'speedup':>10}"
+        )
+        for name, payload in PAYLOADS.items():
+            for size in options["sizes"]:
+                data = payload(size)
+                latencies = {
+                    renderer_name: self._latency(renderer, data, options["iterations"])
+                    for renderer_name, renderer in renderers.items()
+                }
+                nb_bytes = len(renderers["fast"].render(data))
+                self.stdout.write(
+                    f"{name:<15}{size:>8}{nb_bytes:>12}"
+                    f"{latencies['drf'] * 1000:>12.3f}"
+                    f"{latencies['fast'] * 1000:>12.3f}"
+                    f"{latencies['drf'] / latencies['fast']:>9.1f}x"
+                )
@@ -1,4 +1,4 @@
-# Copyright (C) 2017-2020  The Software Heritage developers
+# Copyright (C) 2017-2026  The Software Heritage developers
 # See the AUTHORS file at the top-level directory of this distribution
 # License: GNU Affero General Public License version 3, or any later version
 # See top-level LICENSE file for more information
@@ -6,6 +6,12 @@
 import yaml
 
 from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
 
 class YAMLRenderer(renderers.BaseRenderer):
@@ -48,3 +54,70 @@ class PlainTextRenderer(renderers.BaseRenderer):
 
     def render(self, data, media_type=None, renderer_context=None):
         return data
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    Renderer which serializes to JSON using orjson when it is installed.
+
+    The produced JSON is the same as the one produced by the default DRF
+    renderer: compact output, UTC datetimes suffixed by ``Z``, bytes decoded
+    and other types not natively supported by orjson converted using the DRF
+    JSON encoder. The default DRF renderer is used when orjson is not
+    installed, when an indented output is requested or when orjson cannot
+    serialize the data (for instance integers larger than 64 bits).
+    """
+
+    _drf_encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Renders `data` into serialized JSON.
+        """
+        if (
+            orjson is None
+            or data is None
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self._drf_encoder.default,
+                option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # same escaping as DRF renderer for the unicode line and paragraph
+        # separators which are not valid in JavaScript strings
+        return ret.replace("\u2028".encode(), b"\\u2028").replace(
+            "\u2029".encode(), b"\\u2029"
+        )
+
+
+class NDJSONRenderer(FastJSONRenderer):
+    """
+    Renderer which serializes to newline delimited JSON: each item of a list
+    is serialized on its own line, other data on a single line.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def render_line(self, data) -> bytes:
+        """
+        Renders `data` into a line of serialized JSON.
+        """
+        return super().render(data) + b"\n"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Renders `data` into serialized newline delimited JSON.
+        """
+        if data is None:
+            return b""
+        if isinstance(data, list):
+            return b"".join(self.render_line(item) for item in data)
+        return self.render_line(data)
@@ -1,4 +1,4 @@
-# Copyright (C) 2015-2024  The Software Heritage developers
+# Copyright (C) 2015-2026  The Software Heritage developers
 # See the AUTHORS file at the top-level directory of this distribution
 # License: GNU Affero General Public License version 3, or any later version
 # See top-level LICENSE file for more information
@@ -11,7 +11,8 @@ import pytest
 from rest_framework.response import Response
 
 from swh.storage.exc import StorageAPIError, StorageDBError
-from swh.web.api.apidoc import _parse_httpdomain_doc, api_doc
+from swh.web.api import apidoc
+from swh.web.api.apidoc import _parse_httpdomain_doc, api_doc, get_doc_data_registry
 from swh.web.api.apiurls import api_route
 from swh.web.tests.django_asserts import assert_contains, assert_not_contains
 from swh.web.tests.helpers import (
@@ -184,6 +185,32 @@ def test_apidoc_post_only(client):
     check_html_get_response(client, url, status_code=200, template_used="apidoc.html")
 
 
+def test_apidoc_doc_data_compiled_once(mocker):
+    spy_parse_doc = mocker.spy(apidoc, "_parse_httpdomain_doc")
+
+    @api_doc("/test/compiled/doc/", category="test")
+    def apidoc_compiled_tester(request):
+        """
+        .. http:get:: /api/1/test/compiled/doc/
+
+            Sample doc
+
+            :statuscode 200: no error
+        """
+        return {"result": "some data"}
+
+    assert spy_parse_doc.call_count == 1
+    doc_data = get_doc_data_registry()[apidoc_compiled_tester.__wrapped__]
+    assert doc_data["route"] == "/test/compiled/doc/"
+    assert doc_data["status_codes"] == [{"code": "200", "doc": "no error"}]
+
+    for _ in range(3):
+        response = apidoc_compiled_tester(None)
+        assert response["data"] == {"result": "some data"}
+        assert response["doc_data"] is doc_data
+    assert spy_parse_doc.call_count == 1
+
+
 def test_api_doc_parse_httpdomain():
     doc_data = {
         "description": "",
@@ -1,4 +1,4 @@
-# Copyright (C) 2015-2021  The Software Heritage developers
+# Copyright (C) 2015-2026  The Software Heritage developers
 # See the AUTHORS file at the top-level directory of this distribution
 # License: GNU Affero General Public License version 3, or any later version
 # See top-level LICENSE file for more information
@@ -117,6 +117,18 @@ def test_swh_multi_response_mimetype(mocker, api_request_factory):
             assert_contains(rv, json.dumps(data))
 
 
+def test_make_api_response_doc_data_not_modified(api_request_factory):
+    doc_data = {"route": "/test/path/", "noargs": True}
+    request = api_request_factory.get("/api/test/path/")
+    setattr(request, "accepted_media_type", "application/json")
+    setattr(request, "query_params", request.GET)
+
+    rv = make_api_response(request, {"foo": "bar"}, doc_data, {"status": 201})
+
+    assert rv.status_code == 201
+    assert doc_data == {"route": "/test/path/", "noargs": True}
+
+
 def test_swh_filter_renderer_do_nothing(api_request_factory):
     input_data = {"a": "some-data"}
 
@@ -1,12 +1,17 @@
-# Copyright (C) 2020  The Software Heritage developers
+# Copyright (C) 2020-2026  The Software Heritage developers
 # See the AUTHORS file at the top-level directory of this distribution
 # License: GNU Affero General Public License version 3, or any later version
 # See top-level LICENSE file for more information
 
 
+from typing import List
+
+from swh.model.swhids import ObjectType
 from swh.web.api.apiurls import api_route
-from swh.web.tests.helpers import check_api_get_responses
+from swh.web.tests.helpers import check_api_get_responses, check_http_get_response
 from swh.web.utils import reverse
+from swh.web.utils.exc import NotFoundExc
+from swh.web.utils.immutable_objects import swhid_from_hash_arg
 
 
 @api_route(r"/some/route/(?P<int_arg>[0-9]+)/", "api-1-some-route")
@@ -32,6 +37,21 @@ def api_never_cache_route_with_error(request):
     raise Exception("error")
 
 
+_immutable_route_calls: List[str] = []
+
+
+@api_route(
+    r"/immutable/route/(?P<sha1_git>[0-9a-f]+)/",
+    "api-1-immutable-route",
+    immutable_object=swhid_from_hash_arg(ObjectType.DIRECTORY, "sha1_git"),
+)
+def api_immutable_route(request, sha1_git):
+    _immutable_route_calls.append(sha1_git)
+    if sha1_git == "0" * 40:
+        raise NotFoundExc("Directory not found")
+    return {"result": sha1_git}
+
+
 def test_api_route_with_cache(api_client):
     url = reverse("api-1-some-route", url_args={"int_arg": 1})
     resp = check_api_get_responses(api_client, url, status_code=200)
@@ -55,3 +75,46 @@ def test_api_route_never_cache_with_error(api_client):
     resp = check_api_get_responses(api_client, url, status_code=500)
     assert "Cache-Control" in resp
     assert resp["Cache-Control"].startswith(_cache_control)
+
+
+_immutable_cache_control = "public, max-age=31536000, immutable"
+
+
+def test_api_route_immutable_object(api_client):
+    sha1_git = "1" * 40
+    url = reverse("api-1-immutable-route", url_args={"sha1_git": sha1_git})
+    _immutable_route_calls.clear()
+
+    resp = check_http_get_response(
+        api_client, url, status_code=200, content_type="application/json"
+    )
+    assert resp.data == {"result": sha1_git}
+    assert resp["Cache-Control"] == _immutable_cache_control
+    etag = resp["ETag"]
+    assert etag.startswith(f'"swh:1:dir:{sha1_git}-')
+    assert _immutable_route_calls == [sha1_git]
+
+    # the view is not called when the client already has the response
+    resp = api_client.get(url, HTTP_ACCEPT="application/json", HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 304
+    assert resp["ETag"] == etag
+    assert resp["Cache-Control"] == _immutable_cache_control
+    assert _immutable_route_calls == [sha1_git]
+
+    # other representations of the object get other ETags
+    resp = check_http_get_response(
+        api_client,
+        url,
+        status_code=200,
+        content_type="application/yaml",
+        HTTP_IF_NONE_MATCH=etag,
+    )
+    assert resp["ETag"] != etag
+    assert _immutable_route_calls == [sha1_git, sha1_git]
+
+
+def test_api_route_immutable_object_not_found(api_client):
+    url = reverse("api-1-immutable-route", url_args={"sha1_git": "0" * 40})
+    resp = check_api_get_responses(api_client, url, status_code=404)
+    assert "ETag" not in resp
+    assert "Cache-Control" not in resp
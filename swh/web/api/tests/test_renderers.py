@@ -0,0 +1,87 @@
+# Copyright (C) 2026  The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU Affero General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+import json
+
+import pytest
+
+from django.core.management import call_command
+from rest_framework.renderers import JSONRenderer
+
+from swh.web.api import renderers
+from swh.web.api.renderers import FastJSONRenderer, NDJSONRenderer
+
+DATA = {
+    "date_utc": datetime(2026, 1, 1, 12, 30, tzinfo=timezone.utc),
+    "date_offset": datetime(
+        2026, 1, 1, 12, 30, 15, 123456, tzinfo=timezone(timedelta(hours=2))
+    ),
+    "naive_date": datetime(2026, 1, 1, 12, 30),
+    "bytes": b"swh",
+    "map": map(str, range(3)),
+    "tuple": (1, 2),
+    "set": {1},
+    "delta": timedelta(minutes=1),
+    "unicode": "caf\u00e9 \u2028 \u2029",
+    "nested": [{"a": None, "b": True, "c": 1.5, 1: "non str key"}],
+}
+
+
+def _data():
+    return {**DATA, "map": map(str, range(3))}
+
+
+@pytest.mark.skipif(renderers.orjson is None, reason="orjson is not installed")
+def test_fast_json_renderer_same_output_as_drf():
+    assert FastJSONRenderer().render(_data()) == JSONRenderer().render(_data())
+
+
+def test_fast_json_renderer_none():
+    assert FastJSONRenderer().render(None) == b""
+
+
+def test_fast_json_renderer_indent():
+    output = FastJSONRenderer().render(
+        {"foo": "bar"}, accepted_media_type="application/json; indent=4"
+    )
+    assert output == b'{\n    "foo": "bar"\n}'
+
+
+def test_fast_json_renderer_large_integer():
+    data = {"value": 2**70}
+    assert json.loads(FastJSONRenderer().render(data)) == data
+
+
+def test_fast_json_renderer_without_orjson(mocker):
+    mocker.patch.object(renderers, "orjson", None)
+    assert FastJSONRenderer().render(_data()) == JSONRenderer().render(_data())
+
+
+def test_benchmark_json_renderers_command():
+    out = StringIO()
+    call_command(
+        "benchmark_json_renderers",
+        "--sizes",
+        "1",
+        "10",
+        "--iterations",
+        "1",
+        stdout=out,
+    )
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 5
+    assert lines[1].split()[:2] == ["snapshot", "1"]
+
+
+def test_ndjson_renderer():
+    renderer = NDJSONRenderer()
+    data = [{"name": "a", "length": 1}, {"name": "b\nc"}]
+    assert renderer.render(data) == b"".join(
+        FastJSONRenderer().render(item) + b"\n" for item in data
+    )
+    assert renderer.render(data[0]) == FastJSONRenderer().render(data[0]) + b"\n"
+    assert renderer.render(None) == b""
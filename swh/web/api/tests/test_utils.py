@@ -204,6 +204,18 @@ def test_enrich_directory_entry_with_type(api_request_factory, archive_data, dir
     assert actual_directory == dir_entry
 
 
+def test_enrich_directory_entries(api_request_factory, archive_data, directory):
+    dir_content = archive_data.directory_ls(directory)
+
+    url = reverse("api-1-directory", url_args={"sha1_git": directory})
+    request = api_request_factory.get(url)
+
+    assert list(utils.enrich_directory_entries(dir_content, request)) == [
+        utils.enrich_directory_entry(dict(dir_entry), request)
+        for dir_entry in dir_content
+    ]
+
+
 def test_enrich_content_without_hashes():
     assert utils.enrich_content({"id": "123"}) == {"id": "123"}
 
@@ -230,6 +230,35 @@ def test_api_content_raw_text_with_nonascii_filename(
     assert int(rv["Content-Length"]) == len(expected_data["data"])
 
 
+def test_api_content_raw_range(api_client, archive_data, content):
+    url = reverse("api-1-content-raw", url_args={"q": "sha1:%s" % content["sha1"]})
+    expected_data = archive_data.content_get_data(content["sha1"])["data"]
+    length = len(expected_data)
+
+    rv = check_http_get_response(
+        api_client, url, status_code=206, HTTP_RANGE="bytes=1-"
+    )
+    assert rv["Content-Range"] == f"bytes 1-{length - 1}/{length}"
+    assert int(rv["Content-Length"]) == length - 1
+    assert b"".join(rv.streaming_content) == expected_data[1:]
+
+    rv = check_http_get_response(
+        api_client, url, status_code=416, HTTP_RANGE=f"bytes={length}-"
+    )
+    assert rv["Content-Range"] == f"bytes */{length}"
+
+
+def test_api_content_raw_etag(api_client, archive_data, content):
+    url = reverse("api-1-content-raw", url_args={"q": "sha1:%s" % content["sha1"]})
+
+    rv = check_http_get_response(api_client, url, status_code=200)
+    assert rv["ETag"].startswith('"sha1:%s-' % content["sha1"])
+
+    check_http_get_response(
+        api_client, url, status_code=304, HTTP_IF_NONE_MATCH=rv["ETag"]
+    )
+
+
 def test_api_check_content_known(api_client, content):
     url = reverse("api-1-content-known", url_args={"q": content["sha1"]})
     rv = check_api_get_responses(api_client, url, status_code=200)
@@ -1,10 +1,15 @@
-# Copyright (C) 2015-2019  The Software Heritage developers
+# Copyright (C) 2015-2026  The Software Heritage developers
 # See the AUTHORS file at the top-level directory of this distribution
 # License: GNU Affero General Public License version 3, or any later version
 # See top-level LICENSE file for more information
 
+import json
 import random
+import re
 
+from swh.model.from_disk import DentryPerms
+from swh.model.hashutil import hash_to_bytes
+from swh.model.model import Directory, DirectoryEntry
 from swh.web.api.utils import enrich_directory_entry
 from swh.web.tests.data import random_sha1
 from swh.web.tests.helpers import check_api_get_responses, check_http_get_response
@@ -23,6 +28,162 @@ def test_api_directory(api_client, archive_data, directory):
     assert rv.data == expected_data
 
 
+def _sorted_enriched_directory_entries(archive_data, directory, request):
+    return sorted(
+        (
+            enrich_directory_entry(entry, request)
+            for entry in archive_data.directory_ls(directory)
+        ),
+        key=lambda entry: entry["name"],
+    )
+
+
+def _next_page_url(response):
+    if not response.has_header("Link"):
+        return None
+    return re.match(r'<(.*)>; rel="next"', response["Link"]).group(1)
+
+
+def test_api_directory_paginated(api_client, archive_data, directory):
+    entries_count = 2
+    url = reverse(
+        "api-1-directory",
+        url_args={"sha1_git": directory},
+        query_params={"entries_count": entries_count},
+    )
+
+    entries = []
+    while url:
+        rv = check_api_get_responses(api_client, url, status_code=200)
+        assert len(rv.data) <= entries_count
+        entries += rv.data
+        url = _next_page_url(rv)
+
+    assert entries == _sorted_enriched_directory_entries(
+        archive_data, directory, rv.wsgi_request
+    )
+
+
+def test_api_directory_paginated_non_utf8_names(api_client, archive_data, content):
+    directory = Directory(
+        entries=tuple(
+            DirectoryEntry(
+                name=name,
+                type="file",
+                target=hash_to_bytes(content["sha1_git"]),
+                perms=DentryPerms.content,
+            )
+            for name in (b"a", b"b\xff", b"c")
+        )
+    )
+    archive_data.directory_add([directory])
+
+    url = reverse(
+        "api-1-directory",
+        url_args={"sha1_git": directory.id.hex()},
+        query_params={"entries_count": 1},
+    )
+    rv = check_api_get_responses(api_client, url, status_code=200)
+    assert _next_page_url(rv) == reverse(
+        "api-1-directory",
+        url_args={"sha1_git": directory.id.hex()},
+        query_params={"entries_from_hex": b"b\xff".hex(), "entries_count": "1"},
+        request=rv.wsgi_request,
+    )
+
+    names = [entry["name"] for entry in rv.data]
+    url = _next_page_url(rv)
+    while url:
+        rv = check_api_get_responses(api_client, url, status_code=200)
+        names += [entry["name"] for entry in rv.data]
+        url = _next_page_url(rv)
+
+    assert names == ["a", "b\\xff", "c"]
+
+
+def test_api_directory_entries_from_hex_invalid(api_client, directory):
+    url = reverse(
+        "api-1-directory",
+        url_args={"sha1_git": directory},
+        query_params={"entries_from_hex": "xyz"},
+    )
+    check_api_get_responses(api_client, url, status_code=400)
+
+
+def test_api_directory_entries_from(api_client, archive_data, directory):
+    expected_entries = _sorted_enriched_directory_entries(archive_data, directory, None)
+    entry = random.choice(expected_entries)
+
+    url = reverse(
+        "api-1-directory",
+        url_args={"sha1_git": directory},
+        query_params={"entries_from": entry["name"]},
+    )
+    rv = check_api_get_responses(api_client, url, status_code=200)
+
+    assert [e["name"] for e in rv.data] == [
+        e["name"] for e in expected_entries if e["name"] >= entry["name"]
+    ]
+    assert "Link" not in rv
+
+
+def test_api_directory_ndjson(api_client, archive_data, directory):
+    url = reverse("api-1-directory", url_args={"sha1_git": directory})
+    rv = api_client.get(url, HTTP_ACCEPT="application/x-ndjson")
+
+    assert rv.status_code == 200
+    assert rv["Content-Type"] == "application/x-ndjson"
+    assert rv.streaming
+
+    lines = b"".join(rv.streaming_content).decode().splitlines()
+    dir_content = list(archive_data.directory_ls(directory))
+    assert [json.loads(line) for line in lines] == [
+        enrich_directory_entry(entry, rv.wsgi_request) for entry in dir_content
+    ]
+
+
+def test_api_directory_ndjson_paginated(api_client, archive_data, directory):
+    expected_entries = _sorted_enriched_directory_entries(archive_data, directory, None)
+
+    url = reverse(
+        "api-1-directory",
+        url_args={"sha1_git": directory},
+        query_params={"entries_count": 1, "format": "ndjson"},
+    )
+    rv = api_client.get(url)
+
+    assert rv.status_code == 200
+    assert rv["Content-Type"] == "application/x-ndjson"
+    lines = b"".join(rv.streaming_content).decode().splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["name"] == expected_entries[0]["name"]
+    if len(expected_entries) > 1:
+        assert _next_page_url(rv) == reverse(
+            "api-1-directory",
+            url_args={"sha1_git": directory},
+            query_params={
+                "entries_from": expected_entries[1]["name"],
+                "entries_count": "1",
+            },
+            request=rv.wsgi_request,
+        )
+
+
+def test_api_directory_ndjson_not_found(api_client):
+    unknown_directory_ = random_sha1()
+
+    url = reverse("api-1-directory", url_args={"sha1_git": unknown_directory_})
+    rv = api_client.get(url, HTTP_ACCEPT="application/x-ndjson")
+
+    assert rv.status_code == 404
+    assert rv["Content-Type"] == "application/x-ndjson"
+    error = json.loads(rv.content)
+    assert error["exception"] == "NotFoundExc"
+    assert (
+        error["reason"] == "Directory with sha1_git %s not found" % unknown_directory_
+    )
+
+
 def test_api_directory_not_found(api_client):
     unknown_directory_ = random_sha1()
 
@@ -0,0 +1,70 @@
+# Copyright (C) 2026  The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU Affero General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+import pytest
+
+from swh.web.tests.helpers import check_api_get_responses, check_http_get_response
+from swh.web.utils import reverse
+
+
+@pytest.mark.parametrize(
+    "view_name,object_fixture,url_arg,swhid_prefix",
+    [
+        ("api-1-content", "content", "q", "swh:1:cnt:"),
+        ("api-1-directory", "directory", "sha1_git", "swh:1:dir:"),
+        ("api-1-revision", "revision", "sha1_git", "swh:1:rev:"),
+        ("api-1-release", "release", "sha1_git", "swh:1:rel:"),
+        ("api-1-snapshot", "snapshot", "snapshot_id", "swh:1:snp:"),
+    ],
+)
+def test_api_immutable_object(
+    api_client, mocker, request, view_name, object_fixture, url_arg, swhid_prefix
+):
+    object_id = request.getfixturevalue(object_fixture)
+    if object_fixture == "content":
+        object_id = f"sha1_git:{object_id['sha1_git']}"
+    url = reverse(view_name, url_args={url_arg: object_id})
+
+    resp = check_http_get_response(
+        api_client, url, status_code=200, content_type="application/json"
+    )
+    etag = resp["ETag"]
+    assert etag.startswith(f'"{swhid_prefix}')
+    assert "immutable" in resp["Cache-Control"]
+
+    # conditional requests are answered without looking up the archive
+    mocker.patch("swh.web.config.storage", side_effect=AssertionError)
+    resp = api_client.get(url, HTTP_ACCEPT="application/json", HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 304
+    assert resp["ETag"] == etag
+
+
+def test_api_content_raw_immutable(api_client, mocker, content):
+    url = reverse("api-1-content-raw", url_args={"q": f"sha1:{content['sha1']}"})
+
+    resp = check_http_get_response(api_client, url, status_code=200)
+    etag = resp["ETag"]
+    assert etag.startswith(f'"sha1:{content["sha1"]}-')
+    assert "immutable" in resp["Cache-Control"]
+
+    # conditional requests are answered without looking up the archive
+    mocker.patch("swh.web.config.storage", side_effect=AssertionError)
+    resp = api_client.get(url, HTTP_ACCEPT="*/*", HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 304
+    assert resp["ETag"] == etag
+
+
+def test_api_mutable_objects_not_cached(api_client, origin, revision):
+    for url in (
+        # revisions log grows when missing ancestors get archived
+        reverse("api-1-revision-log", url_args={"sha1_git": revision}),
+        reverse("api-1-origin", url_args={"origin_url": origin["url"]}),
+        reverse("api-1-origin-visits", url_args={"origin_url": origin["url"]}),
+        reverse("api-1-origin-visit-latest", url_args={"origin_url": origin["url"]}),
+        reverse("api-1-origin-search", url_args={"url_pattern": "github"}),
+    ):
+        resp = check_api_get_responses(api_client, url, status_code=200)
+        assert "ETag" not in resp
+        assert "Cache-Control" not in resp
@@ -1,4 +1,4 @@
-# Copyright (C) 2022  The Software Heritage developers
+# Copyright (C) 2022-2026  The Software Heritage developers
 # See the AUTHORS file at the top-level directory of this distribution
 # License: GNU Affero General Public License version 3, or any later version
 # See top-level LICENSE file for more information
@@ -80,6 +80,37 @@ def test_api_raw_snapshot(api_client, archive_data, snapshot, regular_user):
     _test_api_raw_hash(api_client, regular_user, archive_data, snapshot, "snp")
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize("object_ty", ["cnt", "snp"])
+def test_api_raw_streamed(
+    api_client, regular_user, config_updater, tmp_path, content, snapshot, object_ty
+):
+    config_updater(
+        {
+            "raw_objects_cache": {
+                "timeout": 60,
+                "max_memory_size": 0,
+                "disk_cache_dir": str(tmp_path),
+                "max_disk_size": 1024 * 1024,
+            }
+        }
+    )
+    object_id = content["sha1_git"] if object_ty == "cnt" else snapshot
+    api_client.force_login(regular_user)
+    url = reverse(
+        "api-1-raw-object",
+        url_args={"swhid": f"swh:1:{object_ty}:{object_id}"},
+    )
+
+    rv = api_client.get(url)
+    assert rv.status_code == 200
+    assert rv.streaming
+    assert rv["Content-Type"] == "application/octet-stream"
+    raw_bytes = b"".join(rv.streaming_content)
+    assert int(rv["Content-Length"]) == len(raw_bytes)
+    assert hashlib.new("sha1", raw_bytes).digest() == hash_to_bytes(object_id)
+
+
 @pytest.mark.django_db
 def test_api_raw_rate_limit(api_client, revision, regular_user):
     api_client.force_login(regular_user)
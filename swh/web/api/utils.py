@@ -3,7 +3,7 @@
 # License: GNU Affero General Public License version 3, or any later version
 # See top-level LICENSE file for more information
 
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from django.http import HttpRequest
 
@@ -119,6 +119,39 @@ def enrich_directory_entry(
     return directory
 
 
+def enrich_directory_entries(
+    entries: Iterable[Dict[str, str]], request: Optional[HttpRequest] = None
+) -> Iterator[Dict[str, str]]:
+    """Enrich directory entries with urls to their targets, the same way
+    as :func:`enrich_directory_entry` does but reversing target urls only
+    once for each entry type.
+
+    Args:
+        entries: dicts of data associated to swh directory entries
+        request: Absolute URIs will be generated if provided
+
+    Yields:
+        Enriched directory dicts filled with additional url
+    """
+    placeholder = "0" * 40
+    url_parts = {
+        "file": reverse(
+            "api-1-content", url_args={"q": f"sha1_git:{placeholder}"}, request=request
+        ).split(placeholder),
+        "dir": reverse(
+            "api-1-directory", url_args={"sha1_git": placeholder}, request=request
+        ).split(placeholder),
+        "rev": reverse(
+            "api-1-revision", url_args={"sha1_git": placeholder}, request=request
+        ).split(placeholder),
+    }
+    for entry in entries:
+        if "type" in entry:
+            prefix, suffix = url_parts.get(entry["type"], url_parts["rev"])
+            entry["target_url"] = prefix + entry["target"] + suffix
+        yield entry
+
+
 def enrich_metadata_endpoint(
     content_metadata: Dict[str, str], request: Optional[HttpRequest] = None
 ) -> Dict[str, str]:
@@ -4,11 +4,9 @@
 # See top-level LICENSE file for more information
 
 import functools
-import io
 import os
 from typing import Optional
 
-from django.http import FileResponse
 from rest_framework import serializers
 from rest_framework.request import Request
 
@@ -18,6 +16,8 @@ from swh.web.api.apiurls import api_route
 from swh.web.api.views.utils import api_lookup
 from swh.web.utils import archive
 from swh.web.utils.exc import NotFoundExc
+from swh.web.utils.immutable_objects import content_from_checksum_arg
+from swh.web.utils.raw_content import raw_content_response
 
 
 class ContentRawQuerySerializer(serializers.Serializer):
@@ -182,6 +182,7 @@ def api_content_license(request: Request, q: str):
     "api-1-content-raw",
     checksum_args=["q"],
     query_params_serializer=ContentRawQuerySerializer,
+    immutable_object=content_from_checksum_arg("q"),
 )
 @api_doc("/content/raw/", category="Archive")
 def api_content_raw(request: Request, q: str, validated_query_params: dict[str, str]):
@@ -199,11 +200,17 @@ def api_content_raw(request: Request, q: str, validated_query_params: dict[str,
         :query string filename: if provided, the downloaded content will get that
             filename
 
+        :reqheader If-None-Match: the ETag of a previously downloaded content
+        :reqheader Range: a single byte range to download a part of the content
         :resheader Content-Type: application/octet-stream
+        :resheader ETag: identifier of the downloaded content
 
         :statuscode 200: no error
+        :statuscode 206: the requested byte range of the content is returned
+        :statuscode 304: content was not modified since it was downloaded
         :statuscode 400: an invalid **hash_type** or **hash** has been provided
         :statuscode 404: requested content cannot be found in the archive
+        :statuscode 416: the requested byte range cannot be satisfied
 
         **Example:**
 
@@ -211,7 +218,7 @@ def api_content_raw(request: Request, q: str, validated_query_params: dict[str,
 
             :swh_web_api:`content/sha1:dc2830a9e72f23c1dfebef4413003221baa5fb62/raw/`
     """
-    content = archive.lookup_content(q, with_data=True)
+    content = archive.lookup_content(q)
     if not content:
         raise NotFoundExc("Content %s is not found." % q)
 
@@ -219,12 +226,7 @@ def api_content_raw(request: Request, q: str, validated_query_params: dict[str,
         ":", "_"
     )
 
-    return FileResponse(
-        io.BytesIO(content["data"]),  # not copied, as this is never modified
-        filename=os.path.basename(filename),
-        content_type="application/octet-stream",
-        as_attachment=True,
-    )
+    return raw_content_response(request, content, filename=os.path.basename(filename))
 
 
 @api_route(r"/content/known/search/", "api-1-content-known", methods=["POST"])
@@ -297,7 +299,10 @@ def api_check_content_known(request: Request, q: Optional[str] = None):
 
 
 @api_route(
-    r"/content/(?P<q>[0-9a-z_:]*[0-9a-f]+)/", "api-1-content", checksum_args=["q"]
+    r"/content/(?P<q>[0-9a-z_:]*[0-9a-f]+)/",
+    "api-1-content",
+    checksum_args=["q"],
+    immutable_object=content_from_checksum_arg("q"),
 )
 @api_doc("/content/", category="Archive")
 @format_docstring()
@@ -1,32 +1,80 @@
-# Copyright (C) 2015-2022  The Software Heritage developers
+# Copyright (C) 2015-2026  The Software Heritage developers
 # See the AUTHORS file at the top-level directory of this distribution
 # License: GNU Affero General Public License version 3, or any later version
 # See top-level LICENSE file for more information
 
-from typing import Optional
+from typing import Any, Dict, Iterable, Iterator, Optional
 
+from django.http.response import StreamingHttpResponse
+from rest_framework import serializers
+from rest_framework.decorators import renderer_classes
+from rest_framework.renderers import TemplateHTMLRenderer
 from rest_framework.request import Request
 
+from swh.model.swhids import ObjectType
 from swh.web.api import utils
 from swh.web.api.apidoc import api_doc, format_docstring
+from swh.web.api.apiresponse import compute_link_header
 from swh.web.api.apiurls import api_route
+from swh.web.api.renderers import FastJSONRenderer, NDJSONRenderer, YAMLRenderer
+from swh.web.api.serializers import SoftLimitsIntegerField
 from swh.web.api.views.utils import api_lookup
-from swh.web.utils import archive
+from swh.web.utils import archive, reverse
+from swh.web.utils.immutable_objects import swhid_from_hash_arg
+
+
+class DirectoryQuerySerializer(serializers.Serializer):
+    """Directory query parameters serializer."""
+
+    entries_from = serializers.CharField(default="", required=False)
+    entries_from_hex = serializers.RegexField(
+        r"^([0-9a-fA-F]{2})*$", default="", required=False
+    )
+    entries_count = SoftLimitsIntegerField(
+        default=None, required=False, min_value=1, max_value=10000
+    )
+
+
+def _ndjson_stream(entries: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    renderer = NDJSONRenderer()
+    for entry in entries:
+        yield renderer.render_line(entry)
+
+
+def _entries_from_query_param(name: bytes) -> Dict[str, str]:
+    try:
+        return {"entries_from": name.decode("utf-8")}
+    except UnicodeDecodeError:
+        # names that are not valid UTF-8 cannot be passed as query
+        # parameter values without loss
+        return {"entries_from_hex": name.hex()}
 
 
 @api_route(
     r"/directory/(?P<sha1_git>[0-9a-f]+)/",
     "api-1-directory",
     checksum_args=["sha1_git"],
+    query_params_serializer=DirectoryQuerySerializer,
+    immutable_object=swhid_from_hash_arg(ObjectType.DIRECTORY, "sha1_git"),
 )
 @api_route(
     r"/directory/(?P<sha1_git>[0-9a-f]+)/(?P<path>.+)/",
     "api-1-directory",
     checksum_args=["sha1_git"],
+    query_params_serializer=DirectoryQuerySerializer,
+    immutable_object=swhid_from_hash_arg(ObjectType.DIRECTORY, "sha1_git"),
+)
+@renderer_classes(
+    [FastJSONRenderer, YAMLRenderer, TemplateHTMLRenderer, NDJSONRenderer]
 )
 @api_doc("/directory/", category="Archive")
 @format_docstring()
-def api_directory(request: Request, sha1_git: str, path: Optional[str] = None):
+def api_directory(
+    request: Request,
+    sha1_git: str,
+    validated_query_params: Dict[str, Any],
+    path: Optional[str] = None,
+):
     """
     .. http:get:: /api/1/directory/(sha1_git)/[(path)/]
 
@@ -46,8 +94,18 @@ def api_directory(request: Request, sha1_git: str, path: Optional[str] = None):
             **sha1_git** identifier
         :param string path: optional parameter to get information about the
             directory entry pointed by that relative path
+        :query string entries_from: optional parameter used to skip entries
+            whose name is lesser than it before returning them, entries are
+            then sorted by name
+        :query string entries_from_hex: same as ``entries_from`` but with
+            the name given as the hexadecimal representation of its bytes,
+            used in pagination links when a name is not valid UTF-8
+        :query int entries_count: optional parameter used to restrain the amount
+            of returned entries (cannot exceed 10000), entries are then sorted
+            by name
 
         {common_headers}
+        {resheader_link}
 
         :>jsonarr object checksums: object holding the computed checksum values for
             a directory entry (only for file entries)
@@ -64,6 +122,11 @@ def api_directory(request: Request, sha1_git: str, path: Optional[str] = None):
         :>jsonarr string type: the type of the directory entry, can be either
             ``dir``, ``file`` or ``rev``
 
+        The directory entries can also be streamed as newline delimited JSON,
+        one entry per line, by requesting the ``application/x-ndjson`` media
+        type through the ``Accept`` header or the ``format=ndjson`` query
+        parameter.
+
         :statuscode 200: no error
         :statuscode 400: an invalid **hash_type** or **hash** has been provided
         :statuscode 404: requested directory cannot be found in the archive
@@ -86,12 +149,38 @@ def api_directory(request: Request, sha1_git: str, path: Optional[str] = None):
             enrich_fn=utils.enrich_directory_entry,
             request=request,
         )
+
+    entries_from = validated_query_params["entries_from"].encode()
+    if validated_query_params["entries_from_hex"]:
+        entries_from = bytes.fromhex(validated_query_params["entries_from_hex"])
+    entries_count = validated_query_params["entries_count"]
+    headers: Dict[str, str] = {}
+    entries: Iterable[Dict[str, Any]]
+    if entries_from or entries_count is not None:
+        entries_count = entries_count or 1000
+        entries, next_entry = archive.lookup_directory_entries(
+            sha1_git, entries_from, entries_count
+        )
+        if next_entry is not None:
+            headers["link-next"] = reverse(
+                "api-1-directory",
+                url_args={"sha1_git": sha1_git},
+                query_params={
+                    **_entries_from_query_param(next_entry),
+                    "entries_count": str(entries_count),
+                },
+                request=request,
+            )
     else:
-        error_msg_nopath = "Directory with sha1_git %s not found." % sha1_git
-        return api_lookup(
-            archive.lookup_directory,
-            sha1_git,
-            notfound_msg=error_msg_nopath,
-            enrich_fn=utils.enrich_directory_entry,
-            request=request,
+        entries = archive.lookup_directory(sha1_git)
+
+    entries = utils.enrich_directory_entries(entries, request=request)
+
+    if request.accepted_media_type == NDJSONRenderer.media_type:
+        return StreamingHttpResponse(
+            _ndjson_stream(entries),
+            content_type=NDJSONRenderer.media_type,
+            headers=compute_link_header({"headers": headers}),
         )
+
+    return {"results": list(entries), "headers": headers}
@@ -1,35 +1,25 @@
-# Copyright (C) 2022-2025  The Software Heritage developers
+# Copyright (C) 2022-2026  The Software Heritage developers
 # See the AUTHORS file at the top-level directory of this distribution
 # License: GNU Affero General Public License version 3, or any later version
 # See top-level LICENSE file for more information
 
 
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
+from django.http.response import HttpResponseBase
 from rest_framework.request import Request
 
-from swh.model import model
-from swh.model.git_objects import (
-    content_git_object,
-    directory_git_object,
-    release_git_object,
-    revision_git_object,
-    snapshot_git_object,
-)
-from swh.model.swhids import ObjectType
-from swh.storage.algos.directory import directory_get
-from swh.storage.algos.snapshot import snapshot_get_all_branches
-from swh.web import config
 from swh.web.api.apidoc import api_doc, format_docstring
 from swh.web.api.apiurls import api_route
-from swh.web.utils import archive
-from swh.web.utils.exc import NotFoundExc
 from swh.web.utils.identifiers import parse_core_swhid
+from swh.web.utils.immutable_objects import swhid_from_arg
+from swh.web.utils.raw_objects import get_raw_object
 
 
 @api_route(
     "/raw/<swhid:swhid>/",
     "api-1-raw-object",
     throttle_scope="swh_raw_object",
+    immutable_object=swhid_from_arg("swhid"),
 )
 @api_doc("/raw/", category="Archive")
 @format_docstring()
@@ -44,6 +34,8 @@ def api_raw_object(request: Request, swhid: str):
         so can be used to fetch a binary blob which hashes to the same
         identifier.
 
+        Large contents and snapshots are streamed.
+
         :param string swhid: the object's SWHID
 
         :resheader Content-Type: application/octet-stream
@@ -57,54 +49,16 @@ def api_raw_object(request: Request, swhid: str):
 
             :swh_web_api:`raw/swh:1:snp:6a3a2cf0b2b90ce7ae1cf0a221ed68035b686f5a`
     """
-    parsed_swhid = parse_core_swhid(swhid)
-    object_id = parsed_swhid.object_id
-    object_type = parsed_swhid.object_type
-
-    storage = config.storage()
-
-    def not_found():
-        return NotFoundExc(f"Object with id {swhid} not found.")
-
-    if object_type == ObjectType.CONTENT:
-        # fetching content metadata
-        try:
-            cnt_dict = archive.lookup_content(
-                f"sha1_git:{object_id.hex()}", json_convert=False, with_data=True
-            )
-        except NotFoundExc:
-            raise not_found()
-        cnt = model.Content.from_dict(cnt_dict)
-        result = content_git_object(cnt)
-
-    elif object_type == ObjectType.DIRECTORY:
-        dir_ = directory_get(storage, object_id)
-        if dir_ is None:
-            raise not_found()
-        result = directory_git_object(dir_)
-
-    elif object_type == ObjectType.REVISION:
-        rev = storage.revision_get([object_id])[0]
-        if rev is None:
-            raise not_found()
-        result = revision_git_object(rev)
-
-    elif object_type == ObjectType.RELEASE:
-        rel = storage.release_get([object_id])[0]
-        if rel is None:
-            raise not_found()
-        result = release_git_object(rel)
-
-    elif object_type == ObjectType.SNAPSHOT:
-        snp = snapshot_get_all_branches(storage, object_id)
-        if snp is None:
-            raise not_found()
-        result = snapshot_git_object(snp)
+    raw_object = get_raw_object(parse_core_swhid(swhid))
 
+    response: HttpResponseBase
+    if isinstance(raw_object, bytes):
+        response = HttpResponse(raw_object, content_type="application/octet-stream")
     else:
-        raise ValueError(f"Unexpected object type variant: {object_type}")
-
-    response = HttpResponse(result, content_type="application/octet-stream")
+        response = StreamingHttpResponse(
+            raw_object.chunks, content_type="application/octet-stream"
+        )
+        response["Content-Length"] = str(raw_object.length)
     filename = swhid.replace(":", "_") + "_raw"
     response["Content-disposition"] = f"attachment; filename={filename}"
 
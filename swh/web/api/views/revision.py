@@ -1,4 +1,4 @@
-# Copyright (C) 2015-2025  The Software Heritage developers
+# Copyright (C) 2015-2026  The Software Heritage developers
 # See the AUTHORS file at the top-level directory of this distribution
 # License: GNU Affero General Public License version 3, or any later version
 # See top-level LICENSE file for more information
@@ -9,12 +9,14 @@ from django.http import HttpResponse
 from rest_framework import serializers
 from rest_framework.request import Request
 
+from swh.model.swhids import ObjectType
 from swh.web.api import utils
 from swh.web.api.apidoc import api_doc, format_docstring
 from swh.web.api.apiurls import api_route
 from swh.web.api.serializers import SoftLimitsIntegerField
 from swh.web.api.views.utils import api_lookup
 from swh.web.utils import archive
+from swh.web.utils.immutable_objects import swhid_from_hash_arg
 
 DOC_RETURN_REVISION = """
         :>json object author: information about the author of the revision
@@ -42,7 +44,10 @@ DOC_RETURN_REVISION_ARRAY = DOC_RETURN_REVISION.replace(":>json", ":>jsonarr")
 
 
 @api_route(
-    r"/revision/(?P<sha1_git>[0-9a-f]+)/", "api-1-revision", checksum_args=["sha1_git"]
+    r"/revision/(?P<sha1_git>[0-9a-f]+)/",
+    "api-1-revision",
+    checksum_args=["sha1_git"],
+    immutable_object=swhid_from_hash_arg(ObjectType.REVISION, "sha1_git"),
 )
 @api_doc("/revision/", category="Archive")
 @format_docstring(return_revision=DOC_RETURN_REVISION)
@@ -86,6 +91,7 @@ def api_revision(request: Request, sha1_git: str):
     r"/revision/(?P<sha1_git>[0-9a-f]+)/raw/",
     "api-1-revision-raw-message",
     checksum_args=["sha1_git"],
+    immutable_object=swhid_from_hash_arg(ObjectType.REVISION, "sha1_git"),
 )
 @api_doc("/revision/raw/", category="Archive", tags=["hidden"])
 def api_revision_raw_message(request: Request, sha1_git: str):
@@ -100,11 +106,13 @@ def api_revision_raw_message(request: Request, sha1_git: str):
     r"/revision/(?P<sha1_git>[0-9a-f]+)/directory/",
     "api-1-revision-directory",
     checksum_args=["sha1_git"],
+    immutable_object=swhid_from_hash_arg(ObjectType.REVISION, "sha1_git"),
 )
 @api_route(
     r"/revision/(?P<sha1_git>[0-9a-f]+)/directory/(?P<dir_path>.+)/",
     "api-1-revision-directory",
     checksum_args=["sha1_git"],
+    immutable_object=swhid_from_hash_arg(ObjectType.REVISION, "sha1_git"),
 )
 @api_doc("/revision/directory/", category="Archive")
 @format_docstring()
@@ -1,4 +1,4 @@
-# Copyright (C) 2018-2025  The Software Heritage developers
+# Copyright (C) 2018-2026  The Software Heritage developers
 # See the AUTHORS file at the top-level directory of this distribution
 # License: GNU Affero General Public License version 3, or any later version
 # See top-level LICENSE file for more information
@@ -8,12 +8,14 @@ from rest_framework import serializers
 from rest_framework.request import Request
 
 from swh.model.model import TargetType
+from swh.model.swhids import ObjectType
 from swh.web.api.apidoc import api_doc, format_docstring
 from swh.web.api.apiurls import api_route
 from swh.web.api.utils import enrich_snapshot
 from swh.web.api.views.utils import api_lookup
 from swh.web.config import get_config
 from swh.web.utils import archive, reverse
+from swh.web.utils.immutable_objects import swhid_from_hash_arg
 
 snapshot_content_max_size = get_config()["snapshot_content_max_size"]
 
@@ -74,6 +76,7 @@ class SnapshotQuerySerializer(serializers.Serializer):
     "api-1-snapshot",
     checksum_args=["snapshot_id"],
     query_params_serializer=SnapshotQuerySerializer,
+    immutable_object=swhid_from_hash_arg(ObjectType.SNAPSHOT, "snapshot_id"),
 )
 @api_doc("/snapshot/", category="Archive")
 @format_docstring()
@@ -0,0 +1,34 @@
+# Copyright (C) 2026  The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU Affero General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from swh.web.archive_coverage.coverage import refresh_archive_coverage
+from swh.web.config import get_config
+
+
+class Command(BaseCommand):
+    help = "Compute the archive coverage dataset rendered by the coverage view"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-workers",
+            type=int,
+            default=get_config()["archive_coverage"]["max_workers"],
+            help="Maximum number of concurrent scheduler and search queries",
+        )
+
+    def handle(self, *args, **options):
+        start = time.monotonic()
+        archive_coverage = refresh_archive_coverage(options["max_workers"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Archive coverage dataset (version "
+                f"{archive_coverage['version']}) computed in "
+                f"{time.monotonic() - start:.1f}s."
+            )
+        )
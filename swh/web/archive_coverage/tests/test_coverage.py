@@ -13,6 +13,7 @@ import uuid
 import pytest
 
 from django.conf import settings
+from django.core.management import call_command
 from django.utils.html import escape
 
 from swh.scheduler.model import (
@@ -24,8 +25,10 @@ from swh.scheduler.model import (
     TaskType,
 )
 from swh.scheduler.utils import utcnow
-from swh.web.archive_coverage.views import (
+from swh.web.archive_coverage import coverage
+from swh.web.archive_coverage.coverage import (
     deposited_origins,
+    get_archive_coverage,
     legacy_origins,
     listed_origins,
 )
@@ -40,11 +43,17 @@ def count_origins_mocker(mocker):
     mocker.patch("swh.web.utils.archive.count_origins").return_value = randint(10, 100)
 
 
+def refresh_archive_coverage():
+    call_command("refresh_archive_coverage")
+    return get_archive_coverage()["origins"]
+
+
 def test_coverage_view_no_metrics(client, swh_scheduler):
     """
     Check coverage view can be rendered when scheduler metrics and deposits
     data are not available.
     """
+    refresh_archive_coverage()
     url = reverse("swh-coverage")
     check_html_get_response(
         client, url, status_code=200, template_used="archive-coverage.html"
@@ -113,6 +122,7 @@ def generate_archive_coverage_data(mocker, swh_scheduler):
 
 def test_coverage_view_with_metrics(client, mocker, swh_scheduler):
     generate_archive_coverage_data(mocker, swh_scheduler)
+    archive_coverage = refresh_archive_coverage()
 
     # check view gets rendered without errors
     url = reverse("swh-coverage")
@@ -121,10 +131,8 @@ def test_coverage_view_with_metrics(client, mocker, swh_scheduler):
     )
 
     # check logos and origins search links are present in the rendered page
-    for origins in chain(
-        listed_origins["origins"],
-        legacy_origins["origins"],
-        deposited_origins["origins"],
+    for origins in chain.from_iterable(
+        origins_data["origins"] for origins_data in archive_coverage.values()
     ):
         origin_type = origins["type"].lower()
         if static_path_exists(f"img/logos/{origin_type}.png"):
@@ -153,6 +161,7 @@ def test_coverage_view_with_metrics(client, mocker, swh_scheduler):
 
 def test_coverage_view_with_focus(client, mocker, swh_scheduler):
     generate_archive_coverage_data(mocker, swh_scheduler)
+    refresh_archive_coverage()
 
     origins = (
         listed_origins["origins"]
@@ -235,9 +244,8 @@ def test_coverage_view_filter_out_non_visited_origins(
 ):
     # remove display of legacy origins containing a bitbucket origin
     # type that can make this test flaky
-    from swh.web.archive_coverage import views
-
-    mocker.patch.object(views, "legacy_origins", {"origins": []})
+    mocker.patch.object(coverage, "legacy_origins", {"origins": []})
+    refresh_archive_coverage()
 
     origins = copy.copy(listed_origins)
 
@@ -284,6 +292,7 @@ def test_coverage_view_no_logo_for_origin_type(client, mocker, swh_scheduler):
     )
 
     generate_archive_coverage_data(mocker, swh_scheduler)
+    refresh_archive_coverage()
 
     url = reverse("swh-coverage")
     resp = check_html_get_response(
@@ -398,6 +407,8 @@ def test_coverage_view_urls(client, mocker, swh_scheduler):
         ]
     )
 
+    refresh_archive_coverage()
+
     # check view gets rendered without errors
     url = reverse("swh-coverage")
     resp = check_html_get_response(
@@ -418,3 +429,52 @@ def test_coverage_view_urls(client, mocker, swh_scheduler):
 
     # check gitlab API URL is adjusted
     assert_contains(resp, '<a href="https://gitlab.example.org/"')
+
+
+def test_coverage_view_without_dataset(client, mocker):
+    mock_scheduler = mocker.patch.object(coverage, "scheduler")
+    mock_refresh_in_background = mocker.patch(
+        "swh.web.archive_coverage.views.refresh_in_background"
+    )
+
+    url = reverse("swh-coverage")
+    resp = check_html_get_response(
+        client, url, status_code=200, template_used="archive-coverage.html"
+    )
+
+    # page is rendered without counts while the dataset is computed in background
+    for origins in deposited_origins["origins"]:
+        assert_contains(resp, f'id="{origins["type"]}"')
+    mock_scheduler.assert_not_called()
+    mock_refresh_in_background.assert_called_once()
+
+
+def test_coverage_view_outdated_dataset(client, mocker, config_updater):
+    mocker.patch.object(coverage, "scheduler")
+    mocker.patch.object(coverage, "get_listers_metrics").return_value = {}
+    mocker.patch.object(coverage, "get_instance_urls").return_value = {}
+    coverage.refresh_archive_coverage()
+    mock_refresh_in_background = mocker.patch(
+        "swh.web.archive_coverage.views.refresh_in_background"
+    )
+
+    url = reverse("swh-coverage")
+    check_html_get_response(
+        client, url, status_code=200, template_used="archive-coverage.html"
+    )
+    mock_refresh_in_background.assert_not_called()
+
+    config_updater(
+        {
+            "archive_coverage": {
+                "max_age": -1,
+                "max_workers": 8,
+                "refresh_lock_timeout": 600,
+            }
+        }
+    )
+    check_html_get_response(
+        client, url, status_code=200, template_used="archive-coverage.html"
+    )
+    mock_refresh_in_background.assert_called_once()
+    assert mock_refresh_in_background.call_args.kwargs["lock_timeout"] == 600
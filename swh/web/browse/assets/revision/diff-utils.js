@@ -659,6 +659,15 @@ export function computeAllDiffs(event) {
   event.stopPropagation();
 }
 
+function setNbChangedFiles(nbFiles) {
+  nbChangedFiles = nbFiles;
+  let changedFilesText = `${nbChangedFiles} changed file`;
+  if (nbChangedFiles !== 1) {
+    changedFilesText += 's';
+  }
+  $('#swh-revision-changed-files').text(changedFilesText);
+}
+
 export async function initRevisionDiff(revisionMessageBody, diffRevisionUrl) {
 
   await import(/* webpackChunkName: "highlightjs" */ 'utils/highlightjs');
@@ -681,12 +690,7 @@ export async function initRevisionDiff(revisionMessageBody, diffRevisionUrl) {
       const data = await response.json();
 
       changes = data.changes;
-      nbChangedFiles = data.total_nb_changes;
-      let changedFilesText = `${nbChangedFiles} changed file`;
-      if (nbChangedFiles !== 1) {
-        changedFilesText += 's';
-      }
-      $('#swh-revision-changed-files').text(changedFilesText);
+      setNbChangedFiles(data.total_nb_changes);
       $('#swh-total-nb-diffs').text(changes.length);
       $('#swh-revision-changes-list pre')[0].innerHTML = data.changes_msg;
 
@@ -713,6 +717,20 @@ export async function initRevisionDiff(revisionMessageBody, diffRevisionUrl) {
         scrollToDiffPanel(selectedDiffLinesInfo.diffPanelId, false);
       }
 
+      // file changes of large revisions are delivered by pages,
+      // only the first one gets diff panels
+      let nextChangesUrl = data.next_changes_url;
+      while (nextChangesUrl) {
+        const nextResponse = await fetch(nextChangesUrl);
+        const nextData = await nextResponse.json();
+        setNbChangedFiles(nextData.total_nb_changes);
+        $('#swh-too-large-revision-diff').css('display', 'block');
+        $('#swh-nb-loaded-diffs').text(changes.length);
+        $('#swh-revision-changes-list pre')[0].insertAdjacentHTML(
+          'beforeend', '\n' + nextData.changes_msg);
+        nextChangesUrl = nextData.next_changes_url;
+      }
+
     } else if (currentTabName === 'Files') {
       removeUrlFragment();
       $('#readme-panel').css('display', 'block');
@@ -1,10 +1,12 @@
-# Copyright (C) 2017-2022  The Software Heritage developers
+# Copyright (C) 2017-2026  The Software Heritage developers
 # See the AUTHORS file at the top-level directory of this distribution
 # License: GNU Affero General Public License version 3, or any later version
 # See top-level LICENSE file for more information
 
 from typing import List, Optional
 
+from swh.web.utils.immutable_objects import ObjectIdentifier, immutable_object_view
+
 # call this early to ensure all the 'swhid' url path converted is registered
 # so any url registration will work as intended
 import swh.web.utils.url_path_converters  # noqa: F401
@@ -17,6 +19,7 @@ def browse_route(
     *url_patterns: str,
     view_name: Optional[str] = None,
     checksum_args: Optional[List[str]] = None,
+    immutable_object: Optional[ObjectIdentifier] = None,
 ):
     """
     Decorator to ease the registration of a swh-web browse endpoint
@@ -26,14 +29,21 @@ def browse_route(
             browse routes
         view_name: the name of the Django view associated to the routes used
             to reverse the url
+        immutable_object: if the routes serve an immutable archived object,
+            function computing its identifier from the view arguments, see
+            :mod:`swh.web.utils.immutable_objects`
     """
     url_patterns = tuple("browse/" + url_pattern for url_pattern in url_patterns)
     view_name = view_name
 
     def decorator(f):
+        view = f
+        if immutable_object is not None:
+            view = immutable_object_view(f, immutable_object)
+
         # register the route and its view in the browse endpoints index
         for url_pattern in url_patterns:
-            browse_urls.add_url_pattern(url_pattern, f, view_name)
+            browse_urls.add_url_pattern(url_pattern, view, view_name)
 
         if checksum_args:
             browse_urls.add_redirect_for_checksum_args(
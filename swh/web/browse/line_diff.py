@@ -0,0 +1,277 @@
+# Copyright (C) 2026  The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU Affero General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+"""Unified diffs between the lines of two textual contents.
+
+Differences between lines are computed by a diff engine, the one to use is
+set in the ``engine`` value of the ``content_diff`` configuration entry.
+Two engines are available:
+
+- ``myers``: linear space variant of the O(ND) algorithm described by Eugene
+  W. Myers in "An O(ND) Difference Algorithm and Its Variations", its memory
+  usage is linear in the number of lines and it gives up once the ``timeout``
+  value of the configuration entry is exceeded
+
+- ``difflib``: :class:`difflib.SequenceMatcher` from the Python standard
+  library, whose running time can be quadratic in the number of lines and
+  which cannot be interrupted
+"""
+
+import difflib
+import functools
+import logging
+import time
+from typing import Callable, Dict, Iterator, List, Literal, Sequence, Tuple
+
+from swh.web.config import get_config
+
+logger = logging.getLogger(__name__)
+
+Opcode = Tuple[Literal["replace", "delete", "insert", "equal"], int, int, int, int]
+"""Edit operation as returned by :meth:`difflib.SequenceMatcher.get_opcodes`."""
+
+DiffEngine = Callable[[Sequence[int], Sequence[int], float], List[Opcode]]
+"""Function computing the edit operations transforming a sequence of line
+identifiers into another one, whose last parameter is the monotonic time at
+which the computation should be given up."""
+
+
+class DiffTooLarge(Exception):
+    """Diff could not be computed within the configured time budget."""
+
+
+_engines: Dict[str, DiffEngine] = {}
+
+
+def register_engine(name: str, engine: DiffEngine) -> None:
+    """Make a diff engine available for computing content diffs."""
+    _engines[name] = engine
+
+
+def available_engines() -> Dict[str, DiffEngine]:
+    """Return the available diff engines indexed by name."""
+    return dict(_engines)
+
+
+def _difflib_opcodes(
+    a: Sequence[int], b: Sequence[int], deadline: float
+) -> List[Opcode]:
+    return difflib.SequenceMatcher(None, a, b).get_opcodes()
+
+
+def _middle_snake(
+    a: Sequence[int],
+    a_lo: int,
+    a_hi: int,
+    b: Sequence[int],
+    b_lo: int,
+    b_hi: int,
+    deadline: float,
+) -> Tuple[int, int, int, int]:
+    """Find the middle snake of an optimal edit path between ``a[a_lo:a_hi]``
+    and ``b[b_lo:b_hi]`` by searching forward from the start and backward
+    from the end of both ranges until the two searches overlap.
+
+    Returns:
+        the absolute positions in ``a`` and ``b`` of the start and the end
+        of the snake
+    """
+    n = a_hi - a_lo
+    m = b_hi - b_lo
+    delta = n - m
+    odd = delta % 2 != 0
+    max_d = (n + m + 1) // 2
+    offset = max_d + 1
+    # furthest reaching x positions on each diagonal k = x - y, backward
+    # positions are counted from the end of the ranges
+    v_forward = [0] * (2 * offset + 1)
+    v_backward = [0] * (2 * offset + 1)
+    for d in range(max_d + 1):
+        if time.monotonic() > deadline:
+            raise DiffTooLarge()
+        for k in range(-d, d + 1, 2):
+            if k == -d or (
+                k != d and v_forward[offset + k - 1] < v_forward[offset + k + 1]
+            ):
+                x = v_forward[offset + k + 1]
+            else:
+                x = v_forward[offset + k - 1] + 1
+            y = x - k
+            x_start, y_start = x, y
+            while x < n and y < m and a[a_lo + x] == b[b_lo + y]:
+                x += 1
+                y += 1
+            v_forward[offset + k] = x
+            if (
+                odd
+                and -(d - 1) <= delta - k <= d - 1
+                and x + v_backward[offset + delta - k] >= n
+            ):
+                return a_lo + x_start, b_lo + y_start, a_lo + x, b_lo + y
+        for k in range(-d, d + 1, 2):
+            if k == -d or (
+                k != d and v_backward[offset + k - 1] < v_backward[offset + k + 1]
+            ):
+                x = v_backward[offset + k + 1]
+            else:
+                x = v_backward[offset + k - 1] + 1
+            y = x - k
+            x_start, y_start = x, y
+            while x < n and y < m and a[a_hi - 1 - x] == b[b_hi - 1 - y]:
+                x += 1
+                y += 1
+            v_backward[offset + k] = x
+            if (
+                not odd
+                and -d <= delta - k <= d
+                and x + v_forward[offset + delta - k] >= n
+            ):
+                return a_hi - x, b_hi - y, a_hi - x_start, b_hi - y_start
+    raise AssertionError("middle snake not found")
+
+
+def _myers_opcodes(a: Sequence[int], b: Sequence[int], deadline: float) -> List[Opcode]:
+    matching_blocks = []
+    ranges = [(0, len(a), 0, len(b))]
+    while ranges:
+        a_lo, a_hi, b_lo, b_hi = ranges.pop()
+        # common prefix and suffix
+        size = 0
+        while (
+            a_lo + size < a_hi
+            and b_lo + size < b_hi
+            and a[a_lo + size] == b[b_lo + size]
+        ):
+            size += 1
+        if size:
+            matching_blocks.append((a_lo, b_lo, size))
+            a_lo += size
+            b_lo += size
+        size = 0
+        while (
+            a_lo < a_hi - size
+            and b_lo < b_hi - size
+            and a[a_hi - 1 - size] == b[b_hi - 1 - size]
+        ):
+            size += 1
+        if size:
+            matching_blocks.append((a_hi - size, b_hi - size, size))
+            a_hi -= size
+            b_hi -= size
+        if a_lo == a_hi or b_lo == b_hi:
+            continue
+        x_start, y_start, x_end, y_end = _middle_snake(
+            a, a_lo, a_hi, b, b_lo, b_hi, deadline
+        )
+        if x_end > x_start:
+            matching_blocks.append((x_start, y_start, x_end - x_start))
+        ranges.append((a_lo, x_start, b_lo, y_start))
+        ranges.append((x_end, a_hi, y_end, b_hi))
+
+    opcodes: List[Opcode] = []
+    i = j = 0
+    for block_i, block_j, size in sorted(matching_blocks) + [(len(a), len(b), 0)]:
+        if i < block_i and j < block_j:
+            opcodes.append(("replace", i, block_i, j, block_j))
+        elif i < block_i:
+            opcodes.append(("delete", i, block_i, j, block_j))
+        elif j < block_j:
+            opcodes.append(("insert", i, block_i, j, block_j))
+        if size:
+            if opcodes and opcodes[-1][0] == "equal":
+                # merge adjacent matching blocks
+                _, equal_i, _, equal_j, _ = opcodes.pop()
+                opcodes.append(
+                    ("equal", equal_i, block_i + size, equal_j, block_j + size)
+                )
+            else:
+                opcodes.append(
+                    ("equal", block_i, block_i + size, block_j, block_j + size)
+                )
+        i, j = block_i + size, block_j + size
+    return opcodes
+
+
+register_engine("difflib", _difflib_opcodes)
+register_engine("myers", _myers_opcodes)
+
+
+@functools.lru_cache()
+def _configured_engine() -> DiffEngine:
+    engine_name = get_config()["content_diff"]["engine"]
+    if engine_name not in _engines:
+        logger.warning(
+            "Diff engine %s is not available, using myers instead", engine_name
+        )
+        engine_name = "myers"
+    return _engines[engine_name]
+
+
+class _GroupedOpcodes(difflib.SequenceMatcher):
+    # reuse the grouping of edit operations into hunks implemented by
+    # difflib, which only relies on the get_opcodes method
+    def __init__(self, opcodes: List[Opcode]):
+        self.opcodes = opcodes
+
+    def get_opcodes(self) -> List[Opcode]:
+        return self.opcodes
+
+
+def _format_range(start: int, stop: int) -> str:
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return str(beginning)
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def _unified_diff_lines(
+    a: List[str], b: List[str], opcodes: List[Opcode], context: int
+) -> Iterator[str]:
+    for group in _GroupedOpcodes(opcodes).get_grouped_opcodes(context):
+        first, last = group[0], group[-1]
+        yield "@@ -%s +%s @@\n" % (
+            _format_range(first[1], last[2]),
+            _format_range(first[3], last[4]),
+        )
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                for line in a[i1:i2]:
+                    yield " " + line
+                continue
+            if tag in ("replace", "delete"):
+                for line in a[i1:i2]:
+                    yield "-" + line
+            if tag in ("replace", "insert"):
+                for line in b[j1:j2]:
+                    yield "+" + line
+
+
+def unified_diff(from_lines: List[str], to_lines: List[str], context: int = 3) -> str:
+    """Compute the hunks of the unified diff between two lists of lines,
+    in the same format as :func:`difflib.unified_diff` without its file
+    headers, using the configured diff engine.
+
+    Args:
+        from_lines: lines of the first content, including line endings
+        to_lines: lines of the second content, including line endings
+        context: number of context lines around changes
+
+    Returns:
+        the diff hunks
+
+    Raises:
+        DiffTooLarge: the diff could not be computed within the configured
+            time budget
+    """
+    # engines compare integer identifiers of lines instead of strings
+    line_ids: Dict[str, int] = {}
+    a = [line_ids.setdefault(line, len(line_ids)) for line in from_lines]
+    b = [line_ids.setdefault(line, len(line_ids)) for line in to_lines]
+    deadline = time.monotonic() + get_config()["content_diff"]["timeout"]
+    opcodes = _configured_engine()(a, b, deadline)
+    return "".join(_unified_diff_lines(from_lines, to_lines, opcodes, context))
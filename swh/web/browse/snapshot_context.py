@@ -5,9 +5,11 @@
 
 # Utility module for browsing the archive in a snapshot context.
 
-from collections import defaultdict, deque
-import dataclasses
-from typing import Any, Dict, List, Optional, Tuple
+import bisect
+from collections import defaultdict
+import hashlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
 
 from looseversion import LooseVersion2
 
@@ -18,7 +20,6 @@ from django.utils.html import escape
 from swh.model.hashutil import hash_to_bytes
 from swh.model.model import Snapshot
 from swh.model.swhids import CoreSWHID, ObjectType
-from swh.storage.algos.revisions_walker import State
 from swh.web.browse.utils import (
     format_log_entries,
     gen_release_link,
@@ -43,6 +44,7 @@ from swh.web.utils import (
 from swh.web.utils.exc import BadInputExc, NotFoundExc, http_status_code_message
 from swh.web.utils.identifiers import get_swhids_info
 from swh.web.utils.origin_visits import get_origin_visit
+from swh.web.utils.revision_log import RevisionLogIndex
 from swh.web.utils.typing import (
     DirectoryMetadata,
     OriginInfo,
@@ -211,16 +213,14 @@ def process_snapshot_branches(
     revision_to_branch = defaultdict(set)
     revision_to_release = defaultdict(set)
     release_to_branch = defaultdict(set)
-    for branch_name, target in snapshot_branches.items():
-        if not target:
-            # FIXME: display branches with an unknown target anyway
-            continue
+
+    def _add_branch_target(branch_name, target, alias=False):
         target_id = target["target"]
         target_type = target["target_type"]
         if target_type in ("content", "directory", "revision"):
             branches[branch_name] = SnapshotBranchInfo(
                 name=branch_name,
-                alias=False,
+                alias=alias,
                 target_type=target_type,
                 target=target_id,
                 date=None,
@@ -232,14 +232,46 @@ def process_snapshot_branches(
                 revision_to_branch[target_id].add(branch_name)
         elif target_type == "release":
             release_to_branch[target_id].add(branch_name)
-        elif target_type == "alias":
-            branch_aliases[branch_name] = target_id
         # FIXME: handle pointers to other object types
 
-    def _add_release_info(branch, release, alias=False):
+    for branch_name, target in snapshot_branches.items():
+        if not target:
+            # FIXME: display branches with an unknown target anyway
+            continue
+        if target["target_type"] == "alias":
+            branch_aliases[branch_name] = target["target"]
+        else:
+            _add_branch_target(branch_name, target)
+
+    resolved_aliases = {}
+
+    for branch_alias in branch_aliases:
+        # most aliases target branches contained in the processed snapshot
+        # so try to resolve them locally before querying the archive
+        resolved_alias = None
+        alias_chain = {branch_alias}
+        target_name = branch_aliases[branch_alias]
+        while target_name in snapshot_branches and target_name not in alias_chain:
+            alias_chain.add(target_name)
+            resolved_alias = snapshot_branches[target_name]
+            if resolved_alias is None or resolved_alias["target_type"] != "alias":
+                break
+            target_name = resolved_alias["target"]
+            resolved_alias = None
+        else:
+            if target_name not in alias_chain:
+                resolved_alias = archive.lookup_snapshot_alias(
+                    snapshot["id"], branch_alias
+                )
+
+        resolved_aliases[branch_alias] = resolved_alias
+        if resolved_alias is not None:
+            _add_branch_target(branch_alias, resolved_alias, alias=True)
+
+    def _add_release_info(branch, release):
         releases[branch] = SnapshotReleaseInfo(
             name=release["name"],
-            alias=alias,
+            alias=branch in branch_aliases,
             branch_name=branch,
             date=format_utc_iso_date(release["date"]),
             directory=None,
@@ -250,10 +282,10 @@ def process_snapshot_branches(
             url=None,
         )
 
-    def _add_branch_info(branch, revision, alias=False):
+    def _add_branch_info(branch, revision):
         branches[branch] = SnapshotBranchInfo(
             name=branch,
-            alias=alias,
+            alias=branch in branch_aliases,
             target_type="revision",
             target=revision["id"],
             directory=revision["directory"],
@@ -262,12 +294,16 @@ def process_snapshot_branches(
             url=None,
         )
 
+    # releases and revisions targeted by branches and resolved aliases are
+    # fetched in a single batch per object type
     releases_info = archive.lookup_release_multiple(release_to_branch.keys())
     for release in releases_info:
         if release is None:
             continue
         branches_to_update = release_to_branch[release["id"]]
-        for branch in branches_to_update:
+        # aliases are added last so the releases list holds consecutive entries
+        # for branches and for aliases targeting a same release
+        for branch in sorted(branches_to_update, key=lambda b: b in branch_aliases):
             _add_release_info(branch, release)
         if release["target_type"] == "revision":
             revision_to_release[release["target"]].update(branches_to_update)
@@ -284,38 +320,6 @@ def process_snapshot_branches(
         for release_id in revision_to_release[revision["id"]]:
             releases[release_id]["directory"] = revision["directory"]
 
-    resolved_aliases = {}
-
-    for branch_alias, _ in branch_aliases.items():
-        resolved_alias = archive.lookup_snapshot_alias(snapshot["id"], branch_alias)
-        resolved_aliases[branch_alias] = resolved_alias
-        if resolved_alias is None:
-            continue
-
-        target_type = resolved_alias["target_type"]
-        target = resolved_alias["target"]
-
-        if target_type == "revision":
-            revision = archive.lookup_revision(target)
-            _add_branch_info(branch_alias, revision, alias=True)
-        elif target_type == "release":
-            release = archive.lookup_release(target)
-            _add_release_info(branch_alias, release, alias=True)
-        elif target_type in ("content", "directory"):
-            branches[branch_name] = SnapshotBranchInfo(
-                name=branch_alias,
-                alias=True,
-                target_type=target_type,
-                target=target,
-                date=None,
-                directory=None,
-                message=None,
-                url=None,
-            )
-
-        if branch_alias in branches:
-            branches[branch_alias]["name"] = branch_alias
-
     ret_branches = list(sorted(branches.values(), key=lambda b: b["name"]))
     ret_releases = list(
         reversed(sorted(releases.values(), key=lambda b: LooseVersion2(b["name"])))
@@ -324,7 +328,6 @@ def process_snapshot_branches(
     return ret_branches, ret_releases, resolved_aliases
 
 
-@django_cache()
 def get_snapshot_content(
     snapshot_id: str,
 ) -> Tuple[List[SnapshotBranchInfo], List[SnapshotReleaseInfo], Dict[str, Any]]:
@@ -334,7 +337,8 @@ def get_snapshot_content(
     in the swh-web/browse ui.
 
     .. warning:: At most 1000 branches contained in the snapshot
-        will be returned for performance reasons.
+        will be returned for performance reasons, they are those of the first
+        chunk returned by :func:`get_snapshot_branches_chunk`.
 
     Args:
         snapshot_id: hexadecimal representation of the snapshot identifier
@@ -353,19 +357,176 @@ def get_snapshot_content(
     releases: List[SnapshotReleaseInfo] = []
     aliases: Dict[str, Any] = {}
 
-    snapshot_content_max_size = get_config()["snapshot_content_max_size"]
-
     if snapshot_id:
-        snapshot = archive.lookup_snapshot(
-            snapshot_id, branches_count=snapshot_content_max_size
-        )
-        branches, releases, aliases = process_snapshot_branches(
-            snapshot, discard_messages=True
-        )
+        branches, releases, aliases, _ = get_snapshot_branches_chunk(snapshot_id)
+
+        # messages are only displayed in branches and releases lists
+        for branch in branches:
+            branch["message"] = None
+        for release in releases:
+            release["message"] = None
 
     return branches, releases, aliases
 
 
+@django_cache()
+def get_snapshot_branches_chunk(
+    snapshot_id: str,
+    branches_from: str = "",
+    branch_name_include: Optional[str] = None,
+    branch_name_exclude_prefix: Optional[str] = "refs/pull/",
+) -> Tuple[
+    List[SnapshotBranchInfo], List[SnapshotReleaseInfo], Dict[str, Any], Optional[str]
+]:
+    """Returns a chunk of processed branches and releases of a snapshot.
+
+    Chunks hold a fixed number of branches, given by the
+    ``snapshot_content_max_size`` configuration entry, and are aligned: the
+    first one starts at the first branch of the snapshot and each following
+    one starts at the branch name returned with the previous one. Each chunk
+    is put in cache so branches lists, pages and lookups share them, use
+    :func:`iter_snapshot_branches_chunks` to iterate on them.
+
+    Args:
+        snapshot_id: hexadecimal representation of the snapshot identifier
+        branches_from: name of the first branch of the chunk, must be an
+            empty string or a name returned with a previous chunk
+        branch_name_include: if provided, only process branches whose name
+            contains given substring
+        branch_name_exclude_prefix: if provided, do not process branches whose
+            name starts with given pattern
+
+    Returns:
+        A tuple with four members. The first one is a list of dict describing
+        the branches in the chunk sorted by name, the second one is a list of
+        dict describing the releases in the chunk, the third one is a dict
+        mapping resolved branch aliases to their real target and the fourth one
+        is the name of the first branch of the next chunk or :const:`None` if
+        it is the last one.
+
+    Raises:
+        NotFoundExc if the snapshot does not exist
+    """
+    snapshot = archive.lookup_snapshot(
+        snapshot_id,
+        branches_from,
+        get_config()["snapshot_content_max_size"],
+        branch_name_include_substring=branch_name_include,
+        branch_name_exclude_prefix=branch_name_exclude_prefix,
+    )
+    if not snapshot:
+        return [], [], {}, None
+    branches, releases, aliases = process_snapshot_branches(snapshot)
+    return branches, releases, aliases, snapshot["next_branch"]
+
+
+def iter_snapshot_branches_chunks(
+    snapshot_id: str,
+    branches_from: str = "",
+    branch_name_include: Optional[str] = None,
+    branch_name_exclude_prefix: Optional[str] = "refs/pull/",
+) -> Iterator[
+    Tuple[
+        List[SnapshotBranchInfo],
+        List[SnapshotReleaseInfo],
+        Dict[str, Any],
+        Optional[str],
+    ]
+]:
+    """Iterates on the chunks returned by :func:`get_snapshot_branches_chunk`,
+    starting from the one containing the branch named ``branches_from``.
+
+    The names of the first branches of the chunks are put in cache once the
+    chunks are fetched, the iteration then directly starts with the chunk
+    containing ``branches_from`` when its boundaries are known, or with the
+    last known chunk otherwise.
+
+    Args:
+        snapshot_id: hexadecimal representation of the snapshot identifier
+        branches_from: name of the branch whose chunk is the first one to return
+        branch_name_include: if provided, only process branches whose name
+            contains given substring
+        branch_name_exclude_prefix: if provided, do not process branches whose
+            name starts with given pattern
+
+    Raises:
+        NotFoundExc if the snapshot does not exist
+    """
+    cache_key = (
+        f"snapshot_{snapshot_id}_branches_chunks_"
+        + hashlib.sha1(
+            repr(
+                (
+                    get_config()["snapshot_content_max_size"],
+                    branch_name_include,
+                    branch_name_exclude_prefix,
+                )
+            ).encode()
+        ).hexdigest()
+    )
+    chunks_from: List[str] = cache_get(cache_key) or [""]
+    chunk_idx = bisect.bisect_right(chunks_from, branches_from) - 1
+    chunk_from: Optional[str] = chunks_from[chunk_idx]
+    while chunk_from is not None:
+        chunk = get_snapshot_branches_chunk(
+            snapshot_id,
+            chunk_from,
+            branch_name_include=branch_name_include,
+            branch_name_exclude_prefix=branch_name_exclude_prefix,
+        )
+        chunk_from = chunk[3]
+        chunk_idx += 1
+        if chunk_from is not None and chunk_idx == len(chunks_from):
+            chunks_from.append(chunk_from)
+            cache_set(cache_key, chunks_from)
+        if chunk_from is None or chunk_from > branches_from:
+            yield chunk
+
+
+def get_snapshot_branches_page(
+    snapshot_id: str,
+    branches_from: str,
+    branches_count: int,
+    releases: bool = False,
+    branch_name_include: Optional[str] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """Returns a page of the branches, or of the releases, of a snapshot sorted
+    by branch names, built from the chunks returned by
+    :func:`get_snapshot_branches_chunk`.
+
+    Args:
+        snapshot_id: hexadecimal representation of the snapshot identifier
+        branches_from: name of the first branch of the page
+        branches_count: maximum number of branches in the page
+        releases: if :const:`True`, return a page of releases instead of
+            a page of branches
+        branch_name_include: if provided, only return branches whose name
+            contains given substring
+
+    Returns:
+        A tuple whose first member is the list of dict describing the branches
+        or the releases in the page and second member is the name of the first
+        branch of the next page or :const:`None` if it is the last one.
+
+    Raises:
+        NotFoundExc if the snapshot does not exist
+    """
+    name_key = "branch_name" if releases else "name"
+    page: List[Any] = []
+    for chunk_branches, chunk_releases, _, _ in iter_snapshot_branches_chunks(
+        snapshot_id, branches_from, branch_name_include=branch_name_include
+    ):
+        entries: List[Any] = list(chunk_releases) if releases else list(chunk_branches)
+        page += sorted(
+            (e for e in entries if e[name_key] >= branches_from),
+            key=lambda e: e[name_key],
+        )
+        if len(page) > branches_count:
+            break
+    next_branch = page[branches_count][name_key] if len(page) > branches_count else None
+    return page[:branches_count], next_branch
+
+
 def get_origin_visit_snapshot(
     origin_info: OriginInfo,
     visit_ts: Optional[str] = None,
@@ -387,9 +548,6 @@ def get_origin_visit_snapshot(
     That list is put in  cache in order to speedup the navigation
     in the swh-web/browse ui.
 
-    .. warning:: At most 1000 branches contained in the snapshot
-        will be returned for performance reasons.
-
     Args:
         origin_info: a dict filled with origin information
         visit_ts: an ISO 8601 datetime string to parse
@@ -413,45 +571,21 @@ def get_origin_visit_snapshot(
     return get_snapshot_content(visit_info["snapshot"])
 
 
-def get_snapshot_context(
-    snapshot_id: Optional[str] = None,
-    origin_url: Optional[str] = None,
-    timestamp: Optional[str] = None,
-    visit_id: Optional[int] = None,
-    branch_name: Optional[str] = None,
-    release_name: Optional[str] = None,
-    revision_id: Optional[str] = None,
-    path: Optional[str] = None,
-    browse_context: str = "directory",
-    visit_type: Optional[str] = None,
+def _resolve_snapshot_context(
+    snapshot_id: Optional[str],
+    origin_url: Optional[str],
+    timestamp: Optional[str],
+    visit_id: Optional[int],
+    branch_name: Optional[str],
+    release_name: Optional[str],
+    revision_id: Optional[str],
+    visit_type: Optional[str],
 ) -> SnapshotContext:
-    """
-    Utility function to compute relevant information when navigating
-    the archive in a snapshot context. The snapshot is either
-    referenced by its id or it will be retrieved from an origin visit.
-
-    Args:
-        snapshot_id: hexadecimal representation of a snapshot identifier
-        origin_url: an origin_url
-        timestamp: a datetime string for retrieving the closest
-            visit of the origin
-        visit_id: optional visit id for disambiguation in case
-            of several visits with the same timestamp
-        branch_name: optional branch name set when browsing the snapshot in
-            that scope (will default to "HEAD" if not provided)
-        release_name: optional release name set when browsing the snapshot in
-            that scope
-        revision_id: optional revision identifier set when browsing the snapshot in
-            that scope
-        path: optional path of the object currently browsed in the snapshot
-        browse_context: indicates which type of object is currently browsed
-
-    Returns:
-        A dict filled with snapshot context information.
+    """Compute the parts of a snapshot context that do not depend on the object
+    browsed in it, see :func:`get_snapshot_context`.
 
-    Raises:
-        swh.web.utils.exc.NotFoundExc: if no snapshot is found for the visit
-            of an origin.
+    The URLs of the snapshot branches and releases and of the revision are
+    not set in the returned context.
     """
     assert origin_url is not None or snapshot_id is not None
     origin_info = None
@@ -561,17 +695,9 @@ def get_snapshot_context(
     if visit_info:
         timestamp = format_utc_iso_date(visit_info["date"])
 
-    if origin_info:
-        browse_view_name = f"browse-origin-{browse_context}"
-    else:
-        browse_view_name = f"browse-snapshot-{browse_context}"
-
     release_id = None
     root_directory = None
 
-    if path is not None:
-        query_params["path"] = path
-
     if snapshot_total_size and revision_id is not None:
         # browse specific revision for a snapshot requested
         revision = archive.lookup_revision(revision_id)
@@ -692,27 +818,6 @@ def get_snapshot_context(
             release_id = release["id"]
             release_name = release["name"]
 
-    for b in branches:
-        branch_query_params = dict(query_params)
-        branch_query_params.pop("release", None)
-        if b["name"] != b["target"]:
-            branch_query_params.pop("revision", None)
-            branch_query_params["branch"] = b["name"]
-        b["url"] = reverse(
-            browse_view_name, url_args=url_args, query_params=branch_query_params
-        )
-
-    for r in releases:
-        release_query_params = dict(query_params)
-        release_query_params.pop("branch", None)
-        release_query_params.pop("revision", None)
-        release_query_params["release"] = r["name"]
-        r["url"] = reverse(
-            browse_view_name,
-            url_args=url_args,
-            query_params=release_query_params,
-        )
-
     revision_info = None
     if revision_id:
         try:
@@ -729,6 +834,11 @@ def get_snapshot_context(
                 revision_info["message_header"] = message_lines[0]
             else:
                 revision_info["message_header"] = ""
+            # contexts fetched from cache hold lists instead of tuples
+            revision_info["parents"] = list(revision_info["parents"])
+            revision_info["extra_headers"] = [
+                list(header) for header in revision_info["extra_headers"]
+            ]
 
     snapshot_context = SnapshotContext(
         browse_url=browse_url,
@@ -755,6 +865,143 @@ def get_snapshot_context(
         visit_info=visit_info,
     )
 
+    return snapshot_context
+
+
+_url_placeholder = "0" * 40
+
+
+def _gen_url(url_parts: List[str], query_param_value: str) -> str:
+    prefix, suffix = url_parts
+    return prefix + quote(query_param_value, safe="/;:") + suffix
+
+
+def _snapshot_context_cache_key(*args: Any) -> str:
+    return "snapshot_context_" + hashlib.sha1(repr(args).encode()).hexdigest()
+
+
+def get_snapshot_context(
+    snapshot_id: Optional[str] = None,
+    origin_url: Optional[str] = None,
+    timestamp: Optional[str] = None,
+    visit_id: Optional[int] = None,
+    branch_name: Optional[str] = None,
+    release_name: Optional[str] = None,
+    revision_id: Optional[str] = None,
+    path: Optional[str] = None,
+    browse_context: str = "directory",
+    visit_type: Optional[str] = None,
+) -> SnapshotContext:
+    """
+    Utility function to compute relevant information when navigating
+    the archive in a snapshot context. The snapshot is either
+    referenced by its id or it will be retrieved from an origin visit.
+
+    Information resolved from the archive (origin, visit, snapshot branches,
+    root directory, revision, ...) is put in cache for the provided snapshot
+    or visit and branch, release or revision, only the URLs depending on the
+    path and type of the browsed object are computed for each call. When the
+    latest visit of an origin is browsed, that cache expires sooner in order
+    to take new visits into account.
+
+    Args:
+        snapshot_id: hexadecimal representation of a snapshot identifier
+        origin_url: an origin_url
+        timestamp: a datetime string for retrieving the closest
+            visit of the origin
+        visit_id: optional visit id for disambiguation in case
+            of several visits with the same timestamp
+        branch_name: optional branch name set when browsing the snapshot in
+            that scope (will default to "HEAD" if not provided)
+        release_name: optional release name set when browsing the snapshot in
+            that scope
+        revision_id: optional revision identifier set when browsing the snapshot in
+            that scope
+        path: optional path of the object currently browsed in the snapshot
+        browse_context: indicates which type of object is currently browsed
+
+    Returns:
+        A dict filled with snapshot context information.
+
+    Raises:
+        swh.web.utils.exc.NotFoundExc: if no snapshot is found for the visit
+            of an origin.
+    """
+    resolve_args = (
+        snapshot_id,
+        origin_url,
+        timestamp,
+        visit_id,
+        branch_name,
+        release_name,
+        revision_id,
+        visit_type,
+    )
+    cache_key = _snapshot_context_cache_key(*resolve_args)
+    snapshot_context = cache_get(cache_key)
+    if snapshot_context is None:
+        snapshot_context = _resolve_snapshot_context(*resolve_args)
+        cache_config = get_config()["snapshot_context_cache"]
+        latest_visit = (
+            origin_url is not None
+            and snapshot_id is None
+            and timestamp is None
+            and visit_id is None
+        )
+        cache_set(
+            cache_key,
+            snapshot_context,
+            timeout=(
+                cache_config["latest_visit_timeout"]
+                if latest_visit
+                else cache_config["timeout"]
+            ),
+        )
+
+    query_params = snapshot_context["query_params"]
+    url_args = snapshot_context["url_args"]
+    branches = snapshot_context["branches"]
+    releases = snapshot_context["releases"]
+    revision_info = snapshot_context["revision_info"]
+
+    if path is not None:
+        query_params["path"] = path
+
+    if snapshot_context["origin_info"]:
+        browse_view_name = f"browse-origin-{browse_context}"
+    else:
+        browse_view_name = f"browse-snapshot-{browse_context}"
+
+    # branches and releases URLs only differ by the value of a query parameter,
+    # reverse them once and insert the names of branches and releases
+    branch_query_params = dict(query_params)
+    branch_query_params.pop("release", None)
+    revision_branch_url = reverse(
+        browse_view_name, url_args=url_args, query_params=branch_query_params
+    )
+    branch_query_params.pop("revision", None)
+    branch_query_params["branch"] = _url_placeholder
+    branch_url_parts = reverse(
+        browse_view_name, url_args=url_args, query_params=branch_query_params
+    ).split(_url_placeholder)
+
+    release_query_params = dict(query_params)
+    release_query_params.pop("branch", None)
+    release_query_params.pop("revision", None)
+    release_query_params["release"] = _url_placeholder
+    release_url_parts = reverse(
+        browse_view_name, url_args=url_args, query_params=release_query_params
+    ).split(_url_placeholder)
+
+    for b in branches:
+        if b["name"] != b["target"]:
+            b["url"] = _gen_url(branch_url_parts, b["name"])
+        else:
+            b["url"] = revision_branch_url
+
+    for r in releases:
+        r["url"] = _gen_url(release_url_parts, r["name"])
+
     if revision_info:
         revision_info["revision_url"] = gen_revision_url(
             revision_info["id"], snapshot_context
@@ -1103,55 +1350,9 @@ def browse_snapshot_log(
     per_page = int(request.GET.get("per_page", PER_PAGE))
     offset = int(request.GET.get("offset", 0))
     revs_ordering = request.GET.get("revs_ordering", "committer_date")
-    cache_key = f"rev_{revision_id}_log_ordering_{revs_ordering}"
-    rev_log_session = cache_get(
-        cache_key,
-        extra_decoders={
-            "rev_walker_state": lambda d: State(
-                done=d["done"],
-                last_rev=d["last_rev"],
-                num_revs=d["num_revs"],
-                missing_revs=d["missing_revs"],
-                revs_to_visit=(
-                    list(map(tuple, d["revs_to_visit"]))
-                    if revs_ordering == "committer_date"
-                    else d["revs_to_visit"]
-                ),
-            ),
-            "set": set,
-            "deque": deque,
-        },
+    revs, has_more_revs = RevisionLogIndex(revision_id, revs_ordering).revisions(
+        offset, per_page
     )
-    rev_log = []
-    revs_walker_state = None
-    if rev_log_session:
-        rev_log = rev_log_session["rev_log"]
-        revs_walker_state = rev_log_session["revs_walker_state"]
-
-    if len(rev_log) < offset + per_page:
-        revs_walker = archive.get_revisions_walker(
-            revs_ordering,
-            revision_id,
-            max_revs=offset + per_page + 1,
-            state=revs_walker_state,
-        )
-        rev_log += [rev["id"] for rev in revs_walker]
-        revs_walker_state = revs_walker.export_state()
-        cache_set(
-            cache_key,
-            {
-                "rev_log": rev_log,
-                "revs_walker_state": revs_walker_state,
-            },
-            timeout=60 * 60,  # one hour
-            extra_encoders=[
-                (State, "rev_walker_state", dataclasses.asdict),
-                (set, "set", list),
-                (deque, "deque", list),
-            ],
-        )
-
-    revs = rev_log[offset : offset + per_page]
     revision_log = archive.lookup_revision_multiple(revs)
 
     origin_info = snapshot_context["origin_info"]
@@ -1171,7 +1372,7 @@ def browse_snapshot_log(
         browse_view_name = "browse-snapshot-log"
 
     prev_log_url = None
-    if len(rev_log) > offset + per_page:
+    if has_more_revs:
         query_params["offset"] = str(offset + per_page)
         prev_log_url = reverse(
             browse_view_name, url_args=url_args, query_params=query_params
@@ -1281,17 +1482,13 @@ def browse_snapshot_branches(
     else:
         browse_view_name = "browse-snapshot-directory"
 
-    snapshot = archive.lookup_snapshot(
+    branches, next_branch = get_snapshot_branches_page(
         snapshot_context["snapshot_id"],
         branches_from,
         PER_PAGE,
-        target_types=["content", "directory", "revision", "alias"],
-        branch_name_include_substring=branch_name_include,
+        branch_name_include=branch_name_include,
     )
-    displayed_branches: List[Dict[str, Any]] = []
-    if snapshot:
-        branches, _, _ = process_snapshot_branches(snapshot)
-        displayed_branches = [dict(branch) for branch in branches]
+    displayed_branches: List[Dict[str, Any]] = [dict(branch) for branch in branches]
 
     for branch in displayed_branches:
         query_params = {"snapshot": snapshot_id, "branch": branch["name"]}
@@ -1346,9 +1543,8 @@ def browse_snapshot_branches(
             browse_view_name, url_args=url_args, query_params=query_params
         )
 
-    if snapshot and snapshot["next_branch"] is not None:
+    if next_branch is not None:
         query_params_next = dict(query_params)
-        next_branch = snapshot["next_branch"]
         branches_bc.append(next_branch)
         query_params_next["branches_breadcrumbs"] = ",".join(branches_bc)
         next_branches_url = reverse(
@@ -1407,18 +1603,20 @@ def browse_snapshot_releases(
     origin_info = snapshot_context["origin_info"]
     url_args = snapshot_context["url_args"]
 
-    snapshot = archive.lookup_snapshot(
+    releases, next_rel = get_snapshot_branches_page(
         snapshot_context["snapshot_id"],
         rel_from,
         PER_PAGE,
-        target_types=["release", "alias"],
-        branch_name_include_substring=release_name_include,
+        releases=True,
+        branch_name_include=release_name_include,
     )
 
-    displayed_releases: List[Dict[str, Any]] = []
-    if snapshot:
-        _, releases, _ = process_snapshot_branches(snapshot)
-        displayed_releases = [dict(release) for release in releases]
+    displayed_releases: List[Dict[str, Any]] = [
+        dict(release)
+        for release in reversed(
+            sorted(releases, key=lambda r: LooseVersion2(r["name"]))
+        )
+    ]
 
     for release in displayed_releases:
         query_params_tgt = {"snapshot": snapshot_id, "release": release["name"]}
@@ -1493,9 +1691,8 @@ def browse_snapshot_releases(
             browse_view_name, url_args=url_args, query_params=query_params
         )
 
-    if snapshot and snapshot["next_branch"] is not None:
+    if next_rel is not None:
         query_params_next = dict(query_params)
-        next_rel = snapshot["next_branch"]
         rel_bc.append(next_rel)
         query_params_next["releases_breadcrumbs"] = ",".join(rel_bc)
         next_releases_url = reverse(
@@ -0,0 +1,92 @@
+# Copyright (C) 2026  The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU Affero General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+import difflib
+import random
+
+import pytest
+
+from swh.web.browse import line_diff
+from swh.web.browse.line_diff import DiffTooLarge, available_engines, unified_diff
+from swh.web.config import get_config
+
+
+@pytest.fixture
+def diff_engine(request):
+    content_diff_config = get_config()["content_diff"]
+    engine = content_diff_config["engine"]
+    content_diff_config["engine"] = request.param
+    line_diff._configured_engine.cache_clear()
+    yield request.param
+    content_diff_config["engine"] = engine
+    line_diff._configured_engine.cache_clear()
+
+
+def _lines(text):
+    return [line + "\n" for line in text.split()]
+
+
+@pytest.mark.parametrize("diff_engine", ["myers", "difflib"], indirect=True)
+@pytest.mark.parametrize(
+    "from_text,to_text",
+    [
+        ("", ""),
+        ("", "a b c"),
+        ("a b c", ""),
+        ("a b c", "a b c"),
+        ("a b c d e f g h i j k l m n", "a b x d e f g h i j k l y n z"),
+        (" ".join("abcdefghij" * 10), " ".join("abXdefghij" * 10)),
+    ],
+)
+def test_unified_diff_same_as_difflib(diff_engine, from_text, to_text):
+    from_lines = _lines(from_text)
+    to_lines = _lines(to_text)
+    expected = "".join(list(difflib.unified_diff(from_lines, to_lines))[2:])
+    assert unified_diff(from_lines, to_lines) == expected
+
+
+def _lcs_length(a, b):
+    lengths = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i, x in enumerate(a):
+        for j, y in enumerate(b):
+            if x == y:
+                lengths[i + 1][j + 1] = lengths[i][j] + 1
+            else:
+                lengths[i + 1][j + 1] = max(lengths[i][j + 1], lengths[i + 1][j])
+    return lengths[-1][-1]
+
+
+def test_myers_opcodes_minimal_edit_script():
+    myers_opcodes = available_engines()["myers"]
+    rng = random.Random(0)
+    for _ in range(200):
+        a = [rng.randrange(4) for _ in range(rng.randrange(30))]
+        b = [rng.randrange(4) for _ in range(rng.randrange(30))]
+        opcodes = myers_opcodes(a, b, float("inf"))
+        nb_equal = 0
+        i = j = 0
+        for tag, i1, i2, j1, j2 in opcodes:
+            assert (i1, j1) == (i, j)
+            if tag == "equal":
+                assert a[i1:i2] == b[j1:j2]
+                nb_equal += i2 - i1
+            i, j = i2, j2
+        assert (i, j) == (len(a), len(b))
+        assert nb_equal == _lcs_length(a, b)
+
+
+@pytest.mark.parametrize("diff_engine", ["myers"], indirect=True)
+def test_unified_diff_timeout(diff_engine, mocker):
+    mocker.patch.dict(get_config()["content_diff"], {"timeout": -1})
+    with pytest.raises(DiffTooLarge):
+        unified_diff(_lines("a b c d"), _lines("d c b a"))
+
+
+@pytest.mark.parametrize("diff_engine", ["unknown"], indirect=True)
+def test_unified_diff_unknown_engine(diff_engine, mocker):
+    mock_logger = mocker.patch.object(line_diff, "logger")
+    assert unified_diff(_lines("a b"), _lines("a c")) == "@@ -1,2 +1,2 @@\n a\n-b\n+c\n"
+    assert line_diff._configured_engine() is available_engines()["myers"]
+    mock_logger.warning.assert_called_once()
@@ -1,4 +1,4 @@
-# Copyright (C) 2020-2024  The Software Heritage developers
+# Copyright (C) 2020-2026  The Software Heritage developers
 # See the AUTHORS file at the top-level directory of this distribution
 # License: GNU Affero General Public License version 3, or any later version
 # See top-level LICENSE file for more information
@@ -16,14 +16,18 @@ from swh.model.model import (
     SnapshotTargetType,
 )
 from swh.model.swhids import ObjectType
+from swh.web.browse import snapshot_context
 from swh.web.browse.snapshot_context import (
     _get_release,
     get_origin_visit_snapshot,
+    get_snapshot_branches_chunk,
+    get_snapshot_branches_page,
     get_snapshot_content,
     get_snapshot_context,
+    process_snapshot_branches,
 )
 from swh.web.browse.utils import gen_revision_url
-from swh.web.utils import format_utc_iso_date, reverse
+from swh.web.utils import archive, format_utc_iso_date, reverse
 from swh.web.utils.identifiers import gen_swhid
 from swh.web.utils.origin_visits import get_origin_visit, get_origin_visits
 from swh.web.utils.typing import (
@@ -440,6 +444,89 @@ def test_get_release_large_snapshot(archive_data, origin_with_releases):
         assert release_data["id"] == release["id"]
 
 
+def test_get_snapshot_branches_chunk(
+    archive_data, origin_with_releases, config_updater, mocker
+):
+    config_updater({"snapshot_content_max_size": 2})
+    snapshot = archive_data.snapshot_get_latest(origin_with_releases["url"])
+    lookup_snapshot = mocker.spy(archive, "lookup_snapshot")
+
+    all_branches, all_releases, _ = process_snapshot_branches(snapshot)
+
+    branches, releases = [], []
+    branches_from = ""
+    while branches_from is not None:
+        chunk_branches, chunk_releases, _, branches_from = get_snapshot_branches_chunk(
+            snapshot["id"], branches_from
+        )
+        assert len(chunk_branches) + len(chunk_releases) <= 2
+        branches += chunk_branches
+        releases += chunk_releases
+
+    assert branches == all_branches
+    # releases are sorted by version in each chunk
+    assert sorted(releases, key=lambda r: r["branch_name"]) == sorted(
+        all_releases, key=lambda r: r["branch_name"]
+    )
+
+    # chunks are cached
+    call_count = lookup_snapshot.call_count
+    get_snapshot_branches_chunk(snapshot["id"], "")
+    assert lookup_snapshot.call_count == call_count
+
+
+def test_get_snapshot_content_first_chunk(
+    archive_data, origin_with_releases, config_updater
+):
+    config_updater({"snapshot_content_max_size": 2})
+    snapshot = archive_data.snapshot_get_latest(origin_with_releases["url"])
+
+    branches, releases, _ = get_snapshot_content(snapshot["id"])
+
+    # the snapshot content is truncated to the first chunk
+    chunk_branches, chunk_releases, _, _ = get_snapshot_branches_chunk(snapshot["id"])
+    assert len(branches) + len(releases) <= 2
+    assert [b["name"] for b in branches] == [b["name"] for b in chunk_branches]
+    assert [r["branch_name"] for r in releases] == [
+        r["branch_name"] for r in chunk_releases
+    ]
+    assert all(b["message"] is None for b in branches)
+    assert all(r["message"] is None for r in releases)
+
+
+def test_get_snapshot_branches_page(
+    archive_data, origin_with_releases, config_updater, mocker
+):
+    config_updater({"snapshot_content_max_size": 2})
+    snapshot = archive_data.snapshot_get_latest(origin_with_releases["url"])
+    _, all_releases, _ = process_snapshot_branches(snapshot)
+    get_chunk = mocker.spy(snapshot_context, "get_snapshot_branches_chunk")
+
+    # pages whose size differs from the chunks one are built from chunks
+    releases = []
+    branches_from = ""
+    while branches_from is not None:
+        page, branches_from = get_snapshot_branches_page(
+            snapshot["id"], branches_from, 3, releases=True
+        )
+        assert len(page) <= 3
+        releases += page
+
+    assert releases == sorted(all_releases, key=lambda r: r["branch_name"])
+
+    # chunks boundaries are cached so a page starts with the chunk containing
+    # its first branch
+    last_release = releases[-1]
+    get_chunk.reset_mock()
+    page, next_branch = get_snapshot_branches_page(
+        snapshot["id"], last_release["branch_name"], 3, releases=True
+    )
+    assert page == [last_release]
+    assert next_branch is None
+    assert get_chunk.call_count == 1
+    assert get_chunk.call_args[0][1] != ""
+
+
 def _get_revision_info(archive_data, revision_id):
     revision_info = None
     if revision_id:
@@ -449,6 +536,11 @@ def _get_revision_info(archive_data, revision_id):
         revision_info["committer_date"] = format_utc_iso_date(
             revision_info["committer_date"]
         )
+        # snapshot contexts are serialized to cache
+        revision_info["parents"] = list(revision_info["parents"])
+        revision_info["extra_headers"] = [
+            list(header) for header in revision_info["extra_headers"]
+        ]
     return revision_info
 
 
@@ -546,3 +638,143 @@ def test_get_snapshot_context_directory_release(archive_data, directory):
         assert snapshot_context["release_id"] == release.id.hex()
         assert snapshot_context["revision_id"] is None
         assert snapshot_context["root_directory"] == directory
+
+
+def test_process_snapshot_branches_alias_heavy_snapshot(
+    archive_data, revisions_list, release, mocker
+):
+    nb_aliases = 50
+    revisions = revisions_list(nb_aliases)
+    branches = {}
+    for i, revision in enumerate(revisions):
+        branches[f"refs/heads/branch{i}".encode()] = SnapshotBranch(
+            target=hash_to_bytes(revision), target_type=SnapshotTargetType.REVISION
+        )
+        # chain of two aliases for each branch
+        branches[f"refs/aliases/alias{i}".encode()] = SnapshotBranch(
+            target=f"refs/heads/branch{i}".encode(),
+            target_type=SnapshotTargetType.ALIAS,
+        )
+        branches[f"refs/aliases/alias-of-alias{i}".encode()] = SnapshotBranch(
+            target=f"refs/aliases/alias{i}".encode(),
+            target_type=SnapshotTargetType.ALIAS,
+        )
+    branches[b"refs/tags/v1.0"] = SnapshotBranch(
+        target=hash_to_bytes(release), target_type=SnapshotTargetType.RELEASE
+    )
+    branches[b"latest-release"] = SnapshotBranch(
+        target=b"refs/tags/v1.0", target_type=SnapshotTargetType.ALIAS
+    )
+    branches[b"cycle1"] = SnapshotBranch(
+        target=b"cycle2", target_type=SnapshotTargetType.ALIAS
+    )
+    branches[b"cycle2"] = SnapshotBranch(
+        target=b"cycle1", target_type=SnapshotTargetType.ALIAS
+    )
+    branches[b"dangling"] = SnapshotBranch(
+        target=b"refs/heads/unknown", target_type=SnapshotTargetType.ALIAS
+    )
+    snapshot = Snapshot(branches=branches)
+    archive_data.snapshot_add([snapshot])
+
+    snapshot_data = archive.lookup_snapshot(snapshot.id.hex())
+
+    spy_lookup_snapshot_alias = mocker.spy(archive, "lookup_snapshot_alias")
+    spy_lookup_revision = mocker.spy(archive, "lookup_revision")
+    spy_lookup_release = mocker.spy(archive, "lookup_release")
+    spy_lookup_revision_multiple = mocker.spy(archive, "lookup_revision_multiple")
+    spy_lookup_release_multiple = mocker.spy(archive, "lookup_release_multiple")
+
+    branches_info, releases_info, aliases = process_snapshot_branches(snapshot_data)
+
+    # aliases are resolved without extra storage calls except for the one
+    # targeting a branch not found in the snapshot
+    assert spy_lookup_snapshot_alias.call_count == 1
+    assert spy_lookup_revision.call_count == 0
+    assert spy_lookup_release.call_count == 0
+    assert spy_lookup_revision_multiple.call_count == 1
+    assert spy_lookup_release_multiple.call_count == 1
+
+    assert aliases["cycle1"] is None
+    assert aliases["cycle2"] is None
+    assert aliases["dangling"] is None
+    assert aliases["latest-release"] == {"target": release, "target_type": "release"}
+
+    branches_by_name = {branch["name"]: branch for branch in branches_info}
+    for i, revision in enumerate(revisions):
+        for alias in (f"refs/aliases/alias{i}", f"refs/aliases/alias-of-alias{i}"):
+            assert aliases[alias] == {"target": revision, "target_type": "revision"}
+            assert branches_by_name[alias]["alias"]
+            assert branches_by_name[alias]["target"] == revision
+            assert (
+                branches_by_name[alias]["directory"]
+                == branches_by_name[f"refs/heads/branch{i}"]["directory"]
+            )
+
+    release_data = archive_data.release_get(release)
+    releases_by_branch = {release["branch_name"]: release for release in releases_info}
+    assert releases_by_branch["latest-release"]["alias"]
+    assert releases_by_branch["latest-release"]["id"] == release
+    assert releases_by_branch["latest-release"]["name"] == release_data["name"]
+
+
+def test_get_snapshot_context_cached(archive_data, origin_with_multiple_visits, mocker):
+    origin_url = origin_with_multiple_visits["url"]
+    visit = get_origin_visits(origin_url)[-1]
+    spy_lookup_origin = mocker.spy(archive, "lookup_origin")
+    spy_lookup_revision = mocker.spy(archive, "lookup_revision")
+
+    directory_context = get_snapshot_context(
+        origin_url=origin_url, snapshot_id=visit["snapshot"]
+    )
+    lookup_origin_count = spy_lookup_origin.call_count
+    lookup_revision_count = spy_lookup_revision.call_count
+
+    content_context = get_snapshot_context(
+        origin_url=origin_url,
+        snapshot_id=visit["snapshot"],
+        path="/some/path",
+        browse_context="content",
+    )
+
+    # information resolved from the archive is fetched from cache
+    assert spy_lookup_origin.call_count == lookup_origin_count
+    assert spy_lookup_revision.call_count == lookup_revision_count
+    for key in ("origin_info", "visit_info", "root_directory", "snapshot_sizes"):
+        assert content_context[key] == directory_context[key]
+
+    # while URLs depend on the browsed object
+    assert content_context["query_params"] == {
+        **directory_context["query_params"],
+        "path": "/some/path",
+    }
+    for branch in content_context["branches"]:
+        assert branch["url"].startswith(reverse("browse-origin-content"))
+        assert "path=/some/path" in branch["url"]
+
+
+def test_get_snapshot_context_branches_urls_quoting(archive_data, revision):
+    branch_names = ["refs/heads/a b", "refs/heads/c&d=e", "refs/heads/été+1"]
+    snapshot = Snapshot(
+        branches={
+            name.encode(): SnapshotBranch(
+                target=hash_to_bytes(revision),
+                target_type=SnapshotTargetType.REVISION,
+            )
+            for name in branch_names
+        }
+    )
+    archive_data.snapshot_add([snapshot])
+    snapshot_id = snapshot.id.hex()
+
+    snapshot_context = get_snapshot_context(
+        snapshot_id=snapshot_id, branch_name=branch_names[0], path="/a path"
+    )
+
+    assert [b["name"] for b in snapshot_context["branches"]] == branch_names
+    for branch in snapshot_context["branches"]:
+        assert branch["url"] == reverse(
+            "browse-snapshot-directory",
+            url_args={"snapshot_id": snapshot_id},
+            query_params={"branch": branch["name"], "path": "/a path"},
+        )
@@ -5,7 +5,10 @@
 
 import os
 import re
+import threading
 
+import charset_normalizer
+import magic
 import pytest
 
 from swh.model.model import Content
@@ -17,6 +20,7 @@ from swh.web.browse.utils import (
     get_readme_to_display,
     prepare_content_for_display,
     re_encode_content,
+    request_content,
 )
 from swh.web.tests.data import get_tests_data
 from swh.web.utils import reverse
@@ -30,6 +34,85 @@ def test_get_mimetype_and_encoding_for_content():
     )
 
 
+def test_get_mimetype_and_encoding_for_content_reuses_magic_handles(mocker):
+    get_mimetype_and_encoding_for_content(b"Hello world!")
+    spy_magic = mocker.spy(magic, "Magic")
+
+    def detect():
+        for _ in range(10):
+            assert get_mimetype_and_encoding_for_content(b"Hello world!") == (
+                "text/plain",
+                "us-ascii",
+            )
+
+    threads = [threading.Thread(target=detect) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # handles are only created when all pooled ones are in use
+    assert spy_magic.call_count <= 3
+
+
+def test_request_content_encoding_cached(archive_data, content_text_non_utf8, mocker):
+    mocker.patch(
+        "swh.web.browse.utils.archive.lookup_content_filetype"
+    ).return_value = None
+    spy_magic = mocker.patch(
+        "swh.web.browse.utils.get_mimetype_and_encoding_for_content",
+        wraps=get_mimetype_and_encoding_for_content,
+    )
+    spy_detect = mocker.spy(charset_normalizer, "detect")
+
+    query_string = f"sha1:{content_text_non_utf8['sha1']}"
+    content_data = request_content(query_string)
+    assert spy_magic.call_count == 1
+    detect_count = spy_detect.call_count
+    assert detect_count > 0
+
+    assert request_content(query_string) == content_data
+    assert spy_magic.call_count == 1
+    assert spy_detect.call_count == detect_count
+
+    raw_content_data = request_content(query_string, re_encode=False)
+    assert (
+        raw_content_data["raw_data"]
+        == archive_data.content_get_data(content_text_non_utf8["sha1"])["data"]
+    )
+    assert spy_magic.call_count == 1
+
+
+def test_request_content_raw_no_encoding_detection(
+    archive_data, content_text_non_utf8, mocker
+):
+    mocker.patch(
+        "swh.web.browse.utils.archive.lookup_content_filetype"
+    ).return_value = None
+    spy_magic = mocker.patch(
+        "swh.web.browse.utils.get_mimetype_and_encoding_for_content",
+        wraps=get_mimetype_and_encoding_for_content,
+    )
+    spy_detect = mocker.spy(charset_normalizer, "detect")
+
+    query_string = f"sha1:{content_text_non_utf8['sha1']}"
+    raw_content_data = request_content(query_string, re_encode=False)
+    assert (
+        raw_content_data["raw_data"]
+        == archive_data.content_get_data(content_text_non_utf8["sha1"])["data"]
+    )
+    assert spy_magic.call_count == 1
+    assert spy_detect.call_count == 0
+
+    request_content(query_string)
+    assert spy_magic.call_count == 1
+    detect_count = spy_detect.call_count
+    assert detect_count > 0
+
+    request_content(query_string)
+    assert spy_detect.call_count == detect_count
+
+
 def test_gen_link():
     assert (
         gen_link("https://www.softwareheritage.org/", "swh")
@@ -30,6 +30,7 @@ from swh.model.model import (
 )
 from swh.model.swhids import ObjectType
 from swh.storage.utils import now
+from swh.web.browse.line_diff import DiffTooLarge
 from swh.web.browse.snapshot_context import process_snapshot_branches
 from swh.web.browse.utils import (
     get_mimetype_and_encoding_for_content,
@@ -364,6 +365,36 @@ def test_content_raw_image_with_content_type(client, archive_data, content_image
     )
 
 
+def test_content_raw_immutable(client, mocker, content_text):
+    url = reverse(
+        "browse-content-raw",
+        url_args={"query_string": f"sha1_git:{content_text['sha1_git']}"},
+    )
+    re_encode_url = reverse(
+        "browse-content-raw",
+        url_args={"query_string": f"sha1_git:{content_text['sha1_git']}"},
+        query_params={"re_encode": "true"},
+    )
+    etags = []
+    for content_url in (url, re_encode_url):
+        resp = check_http_get_response(
+            client, content_url, status_code=200, content_type="text/plain"
+        )
+        etags.append(resp["ETag"])
+        assert resp["ETag"].startswith(f'"swh:1:cnt:{content_text["sha1_git"]}-')
+        assert "immutable" in resp["Cache-Control"]
+    assert etags[0] != etags[1]
+
+    # conditional requests are answered without looking up the archive
+    mocker.patch("swh.web.config.storage", side_effect=AssertionError)
+    for content_url, etag in zip((url, re_encode_url), etags):
+        resp = client.get(
+            content_url, HTTP_ACCEPT="text/plain", HTTP_IF_NONE_MATCH=etag
+        )
+        assert resp.status_code == 304
+        assert resp["ETag"] == etag
+
+
 def test_content_raw_re_encode_invalid_param(client, content_text):
     url = reverse(
         "browse-content-raw",
@@ -1572,3 +1603,62 @@ def test_browse_contents_diff_for_added_content(client, archive_data):
 @@ -0,0 +1 @@
 +foo
 """
+
+
+def test_browse_contents_diff_cached(client, archive_data, mocker):
+    content_from = Content.from_data(b"foo\nbar\n")
+    content_to = Content.from_data(b"foo\nbaz\n")
+
+    archive_data.content_add([content_from, content_to])
+
+    url = reverse(
+        "diff-contents",
+        url_args={
+            "from_query_string": f"sha1_git:{content_from.sha1_git.hex()}",
+            "to_query_string": f"sha1_git:{content_to.sha1_git.hex()}",
+        },
+        query_params={"path": "foo.py"},
+    )
+
+    resp = check_http_get_response(client, url, status_code=200)
+    assert resp.json() == {
+        "diff_str": "@@ -1,2 +1,2 @@\n foo\n-bar\n+baz\n",
+        "language": "python",
+    }
+
+    mock_unified_diff = mocker.patch("swh.web.browse.views.content.unified_diff")
+    resp = check_http_get_response(client, url, status_code=200)
+    assert resp.json()["diff_str"] == "@@ -1,2 +1,2 @@\n foo\n-bar\n+baz\n"
+    mock_unified_diff.assert_not_called()
+
+
+def test_browse_contents_diff_too_large(client, archive_data, mocker):
+    content_from = Content.from_data(b"foo\nbar\n")
+    content_to = Content.from_data(b"bar\nfoo\n")
+
+    archive_data.content_add([content_from, content_to])
+
+    mock_unified_diff = mocker.patch(
+        "swh.web.browse.views.content.unified_diff", side_effect=DiffTooLarge
+    )
+
+    url = reverse(
+        "diff-contents",
+        url_args={
+            "from_query_string": f"sha1_git:{content_from.sha1_git.hex()}",
+            "to_query_string": f"sha1_git:{content_to.sha1_git.hex()}",
+        },
+    )
+
+    resp = check_http_get_response(client, url, status_code=200)
+    assert resp.json() == {
+        "diff_str": "Diff is too large to be computed",
+        "language": "plaintext",
+    }
+
+    # diff computation timeouts are not cached
+    mock_unified_diff.side_effect = None
+    mock_unified_diff.return_value = "@@ -1,2 +1,2 @@\n-foo\n bar\n+foo\n"
+    resp = check_http_get_response(client, url, status_code=200)
+    assert resp.json()["diff_str"] == "@@ -1,2 +1,2 @@\n-foo\n bar\n+foo\n"
+    assert mock_unified_diff.call_count == 2
@@ -1,19 +1,40 @@
-# Copyright (C) 2017-2025  The Software Heritage developers
+# Copyright (C) 2017-2026  The Software Heritage developers
 # See the AUTHORS file at the top-level directory of this distribution
 # License: GNU Affero General Public License version 3, or any later version
 # See top-level LICENSE file for more information
 
+from datetime import datetime, timezone
 import random
 
 from hypothesis import given
 
 from django.utils.html import escape
 
+from swh.model.from_disk import DentryPerms
+from swh.model.hashutil import hash_to_hex
+from swh.model.model import (
+    Content,
+    Directory,
+    DirectoryEntry,
+    Person,
+    Revision,
+    RevisionType,
+    TimestampWithTimezone,
+)
 from swh.model.swhids import ObjectType
+from swh.web.browse.views.revision import _revision_changes_page_key
 from swh.web.tests.django_asserts import assert_contains, assert_not_contains
 from swh.web.tests.helpers import check_html_get_response, check_http_get_response
 from swh.web.tests.strategies import new_origin
-from swh.web.utils import format_utc_iso_date, parse_iso8601_date_to_utc, reverse
+from swh.web.utils import (
+    _compute_final_cache_key,
+    archive,
+    cache,
+    cache_get,
+    format_utc_iso_date,
+    parse_iso8601_date_to_utc,
+    reverse,
+)
 from swh.web.utils.identifiers import gen_swhid
 
 
@@ -301,6 +322,172 @@ def test_revision_uppercase(client, revision):
     assert resp["location"] == redirect_url
 
 
+def test_revision_diff_pagination(client, archive_data, ancestor_revisions, mocker):
+    revision = ancestor_revisions["sha1_git_root"]
+    revision, changes = max(
+        (
+            (rev["id"], archive.diff_revision(rev["id"]))
+            for rev in archive_data.revision_log(revision)
+        ),
+        key=lambda rev_changes: len(rev_changes[1]),
+    )
+    mocker.patch(
+        "swh.web.browse.views.revision._max_displayed_file_diffs",
+        len(changes) - 1,
+    )
+    spy_diff_revision = mocker.spy(archive, "diff_revision")
+
+    url = reverse("diff-revision", url_args={"sha1_git": revision})
+    for _ in range(2):
+        resp = check_http_get_response(
+            client, url, status_code=200, content_type="application/json"
+        )
+        diff_data = resp.json()
+        assert diff_data["total_nb_changes"] == len(changes)
+        assert len(diff_data["changes"]) == len(changes) - 1
+        assert diff_data["next_changes_url"] is not None
+
+    resp = check_http_get_response(
+        client,
+        diff_data["next_changes_url"],
+        status_code=200,
+        content_type="application/json",
+    )
+    diff_data = resp.json()
+    assert diff_data["total_nb_changes"] == len(changes)
+    assert len(diff_data["changes"]) == 1
+    assert diff_data["next_changes_url"] is None
+
+    # diff is computed once then pages are read from cache
+    assert spy_diff_revision.call_count == 1
+
+
+def test_revision_diff_pagination_evicted_page(
+    client, archive_data, ancestor_revisions, mocker
+):
+    revision = ancestor_revisions["sha1_git_root"]
+    revision, changes = max(
+        (
+            (rev["id"], archive.diff_revision(rev["id"]))
+            for rev in archive_data.revision_log(revision)
+        ),
+        key=lambda rev_changes: len(rev_changes[1]),
+    )
+    page_size = len(changes) - 1
+    mocker.patch("swh.web.browse.views.revision._max_displayed_file_diffs", page_size)
+    spy_diff_revision = mocker.spy(archive, "diff_revision")
+
+    url = reverse("diff-revision", url_args={"sha1_git": revision})
+    check_http_get_response(
+        client, url, status_code=200, content_type="application/json"
+    )
+    assert spy_diff_revision.call_count == 1
+
+    # file changes are put in cache by pages
+    for page in range(2):
+        assert cache_get(_revision_changes_page_key(revision, page_size, page))
+
+    # an evicted page is computed again
+    cache.delete(
+        _compute_final_cache_key(_revision_changes_page_key(revision, page_size, 1))
+    )
+    resp = check_http_get_response(
+        client,
+        reverse(
+            "diff-revision",
+            url_args={"sha1_git": revision},
+            query_params={"offset": str(page_size)},
+        ),
+        status_code=200,
+        content_type="application/json",
+    )
+    diff_data = resp.json()
+    assert diff_data["total_nb_changes"] == len(changes)
+    assert len(diff_data["changes"]) == 1
+    assert spy_diff_revision.call_count == 2
+
+
+def test_revision_diff_pagination_rename(client, archive_data, mocker):
+    contents = [Content.from_data(f"content {i}".encode()) for i in range(5)]
+    archive_data.content_add(contents)
+
+    def _directory(files):
+        return Directory(
+            entries=tuple(
+                DirectoryEntry(
+                    name=name,
+                    type="file",
+                    target=content.sha1_git,
+                    perms=DentryPerms.content,
+                )
+                for name, content in files.items()
+            )
+        )
+
+    # a.txt is renamed to z.txt, the deletion and the insertion are
+    # separated by modifications of other files in the directories walk
+    parent_dir = _directory(
+        {b"a.txt": contents[0], b"b.txt": contents[1], b"c.txt": contents[2]}
+    )
+    dir_ = _directory(
+        {b"b.txt": contents[3], b"c.txt": contents[4], b"z.txt": contents[0]}
+    )
+    archive_data.directory_add([parent_dir, dir_])
+
+    person = Person.from_fullname(b"John Doe <john.doe@example.org>")
+    date = TimestampWithTimezone.from_datetime(
+        datetime(2026, 1, 1, tzinfo=timezone.utc)
+    )
+    parent_revision = Revision(
+        directory=parent_dir.id,
+        author=person,
+        committer=person,
+        message=b"parent commit",
+        date=date,
+        committer_date=date,
+        synthetic=False,
+        type=RevisionType.GIT,
+    )
+    revision = Revision(
+        directory=dir_.id,
+        author=person,
+        committer=person,
+        message=b"rename commit",
+        date=date,
+        committer_date=date,
+        synthetic=False,
+        type=RevisionType.GIT,
+        parents=(parent_revision.id,),
+    )
+    archive_data.revision_add([parent_revision, revision])
+
+    mocker.patch("swh.web.browse.views.revision._max_displayed_file_diffs", 1)
+    spy_diff_revision = mocker.spy(archive, "diff_revision")
+
+    changes = []
+    next_changes_url = reverse(
+        "diff-revision", url_args={"sha1_git": hash_to_hex(revision.id)}
+    )
+    while next_changes_url:
+        resp = check_http_get_response(
+            client, next_changes_url, status_code=200, content_type="application/json"
+        )
+        diff_data = resp.json()
+        assert diff_data["total_nb_changes"] == 3
+        assert len(diff_data["changes"]) == 1
+        changes += diff_data["changes"]
+        next_changes_url = diff_data["next_changes_url"]
+
+    assert sorted(
+        (change["type"], change["from_path"], change["to_path"]) for change in changes
+    ) == [
+        ("modify", "b.txt", "b.txt"),
+        ("modify", "c.txt", "c.txt"),
+        ("rename", "a.txt", "z.txt"),
+    ]
+    assert spy_diff_revision.call_count == 1
+
+
 def _revision_browse_checks(
     client,
     archive_data,
@@ -4,6 +4,8 @@
 # See top-level LICENSE file for more information
 
 import base64
+import operator
+import queue
 import stat
 import textwrap
 from typing import Any, Dict, Iterator, List, Optional, Tuple, Union, cast
@@ -19,6 +21,8 @@ from swh.web.config import get_config
 from swh.web.utils import (
     archive,
     browsers_supported_image_mimes,
+    cache_get,
+    cache_set,
     django_cache,
     format_utc_iso_date,
     highlightjs,
@@ -36,8 +40,8 @@ def get_directory_entries(
     """Function that retrieves the content of a directory
     from the archive.
 
-    The directories entries are first sorted in lexicographical order.
-    Sub-directories and regular files are then extracted.
+    Sub-directories and regular files are extracted from the directory
+    entries then sorted in lexicographical order.
 
     Args:
         sha1_git: sha1_git identifier of the directory
@@ -49,29 +53,39 @@ def get_directory_entries(
     Raises:
         NotFoundExc if the directory is not found
     """
-    entries: List[Dict[str, Any]] = list(archive.lookup_directory(sha1_git))
-    for e in entries:
+    dirs: List[Dict[str, Any]] = []
+    files: List[Dict[str, Any]] = []
+    for e in archive.lookup_directory(sha1_git):
         e["perms"] = stat.filemode(e["perms"])
         if e["type"] == "rev":
             # modify dir entry name to explicitly show it points to a revision
             e["name"] = "%s @ %s" % (e["name"], e["target"][:7])
+            dirs.append(e)
+        elif e["type"] == "dir":
+            dirs.append(e)
         elif e["type"] == "file":
             # remove unused checksums dict to reduce cache size
             e.pop("checksums", None)
+            files.append(e)
 
-    dirs = [e for e in entries if e["type"] in ("dir", "rev")]
-    files = [e for e in entries if e["type"] == "file"]
-
-    dirs = sorted(dirs, key=lambda d: d["name"])
-    files = sorted(files, key=lambda f: f["name"])
+    dirs.sort(key=operator.itemgetter("name"))
+    files.sort(key=operator.itemgetter("name"))
 
     return dirs, files
 
 
+# libmagic handles are costly to create as the magic database is loaded
+# each time, they are kept in that pool once created to be reused
+_magic_handles: "queue.SimpleQueue[magic.Magic]" = queue.SimpleQueue()
+
+
 def get_mimetype_and_encoding_for_content(content: bytes) -> Tuple[str, str]:
     """Function that returns the mime type and the encoding associated to
     a content buffer using the magic module under the hood.
 
+    A libmagic handle is taken from a pool for the duration of the call so
+    that a handle is never used by multiple threads at the same time.
+
     Args:
         content: a content buffer
 
@@ -80,8 +94,14 @@ def get_mimetype_and_encoding_for_content(content: bytes) -> Tuple[str, str]:
         associated to the provided content.
 
     """
-    m = magic.Magic(mime=True, mime_encoding=True)
-    mime_encoding = m.from_buffer(content)
+    try:
+        m = _magic_handles.get_nowait()
+    except queue.Empty:
+        m = magic.Magic(mime=True, mime_encoding=True)
+    try:
+        mime_encoding = m.from_buffer(content)
+    finally:
+        _magic_handles.put(m)
     mime_type, encoding = mime_encoding.split(";")
     encoding = encoding.replace(" charset=", "")
     return mime_type, encoding
@@ -92,37 +112,32 @@ def get_mimetype_and_encoding_for_content(content: bytes) -> Tuple[str, str]:
 content_display_max_size = get_config()["content_display_max_size"]
 
 
-def re_encode_content(
+def _detect_re_encoding(
     mimetype: str, encoding: str, content_data: bytes
-) -> Tuple[str, str, bytes]:
-    """Try to re-encode textual content if it is not encoded to UTF-8
-    for proper display in the browse Web UI.
-
-    Args:
-        mimetype: content mimetype as detected by python-magic
-        encoding: content encoding as detected by python-magic
-        content_data: raw content bytes
+) -> Tuple[str, str, Optional[str]]:
+    """Detect how a textual content should be re-encoded to UTF-8.
 
     Returns:
         A tuple with 3 members: content mimetype, content encoding (possibly updated
-        after processing), content raw bytes (possibly reencoded to UTF-8)
+        after processing) and the encoding to use to decode the content before
+        encoding it to UTF-8, or :const:`None` if it must be kept as is
     """
     if mimetype.startswith("text/") and encoding not in ("us-ascii", "utf-8"):
         # first check if charset_normalizer detects an encoding with confidence
         result = charset_normalizer.detect(content_data)
         if result.get("confidence") and cast(float, result["confidence"]) >= 0.9:
             encoding = cast(str, result["encoding"])
-            content_data = content_data.decode(encoding, "replace").encode("utf-8")
+            return mimetype, encoding, encoding
         # then try to detect encoding with chardet if the above failed
         elif (cresult := chardet.detect(content_data)).get("confidence", 0) >= 0.9:
             encoding = cast(str, cresult["encoding"])
-            content_data = content_data.decode(encoding, "replace").encode("utf-8")
+            return mimetype, encoding, encoding
         elif encoding == "unknown-8bit":
             # probably a malformed UTF-8 content, re-encode it
             # by replacing invalid chars with a substitution one
-            content_data = content_data.decode("utf-8", "replace").encode("utf-8")
+            return mimetype, encoding, "utf-8"
         elif encoding not in {"utf-8", "binary", "ebcdic"}:
-            content_data = content_data.decode(encoding, "replace").encode("utf-8")
+            return mimetype, encoding, encoding
     elif mimetype.startswith("application/octet-stream"):
         # file may detect a text content as binary
         # so try to decode it for display
@@ -130,17 +145,80 @@ def re_encode_content(
         encodings += ["iso-8859-%s" % i for i in range(1, 17)]
         for enc in encodings:
             try:
-                content_data = content_data.decode(enc).encode("utf-8")
+                content_data.decode(enc)
             except Exception:
                 pass
             else:
                 # ensure display in content view
-                encoding = enc
-                mimetype = "text/plain"
-                break
+                return "text/plain", enc, enc
+    return mimetype, encoding, None
+
+
+def re_encode_content(
+    mimetype: str, encoding: str, content_data: bytes
+) -> Tuple[str, str, bytes]:
+    """Try to re-encode textual content if it is not encoded to UTF-8
+    for proper display in the browse Web UI.
+
+    Args:
+        mimetype: content mimetype as detected by python-magic
+        encoding: content encoding as detected by python-magic
+        content_data: raw content bytes
+
+    Returns:
+        A tuple with 3 members: content mimetype, content encoding (possibly updated
+        after processing), content raw bytes (possibly reencoded to UTF-8)
+    """
+    mimetype, encoding, decode_encoding = _detect_re_encoding(
+        mimetype, encoding, content_data
+    )
+    if decode_encoding is not None:
+        content_data = content_data.decode(decode_encoding, "replace").encode("utf-8")
     return mimetype, encoding, content_data
 
 
+def _get_content_encoding(
+    sha1: str,
+    content_data: bytes,
+    filetype: Optional[Tuple[str, str]],
+    re_encode: bool,
+) -> Tuple[str, str, bytes]:
+    """Return mimetype, encoding and possibly re-encoded bytes of a content.
+
+    Results of libmagic and encoding detections are put in cache using the
+    content sha1 so that repeated views of a content do not perform them
+    again, only the cheap decoding to UTF-8 is. Encoding detection is only
+    performed when the content is requested to be re-encoded.
+    """
+    cache_key = f"content_encoding_{sha1}"
+    cached = cache_get(cache_key)
+    if filetype is not None and cached is not None and tuple(cached[:2]) != filetype:
+        # indexed filetype differs from the one used to fill the cache
+        cached = None
+    cache_updated = False
+    if cached is None:
+        if filetype is not None:
+            mimetype, encoding = filetype
+        else:
+            mimetype, encoding = get_mimetype_and_encoding_for_content(content_data)
+        cached = [mimetype, encoding]
+        cache_updated = True
+    if re_encode and len(cached) == 2:
+        cached = [
+            *cached,
+            *_detect_re_encoding(cached[0], cached[1], content_data),
+        ]
+        cache_updated = True
+    if cache_updated:
+        cache_set(cache_key, cached)
+    if not re_encode:
+        return cached[0], cached[1], content_data
+    mimetype, encoding, re_mimetype, re_encoding, decode_encoding = cached
+    if decode_encoding is not None:
+        content_data = content_data.decode(decode_encoding, "replace").encode("utf-8")
+    return re_mimetype, re_encoding, content_data
+
+
 def request_content(
     query_string: str,
     max_size: Optional[int] = content_display_max_size,
@@ -192,18 +270,12 @@ def request_content(
                 "in the archive."
             )
         else:
-            content_data["raw_data"] = content["data"]
-
-            if not filetype:
-                mimetype, encoding = get_mimetype_and_encoding_for_content(
-                    content_data["raw_data"]
-                )
-
-            if re_encode:
-                mimetype, encoding, raw_data = re_encode_content(
-                    mimetype, encoding, content_data["raw_data"]
-                )
-                content_data["raw_data"] = raw_data
+            mimetype, encoding, content_data["raw_data"] = _get_content_encoding(
+                content_data["checksums"]["sha1"],
+                content["data"],
+                (mimetype, encoding) if filetype else None,
+                re_encode,
+            )
 
     else:
         content_data["raw_data"] = None
@@ -219,6 +291,30 @@ def request_content(
     return content_data
 
 
+def get_content_language(mime_type: str, path: Optional[str]) -> str:
+    """Return the highlightjs language class of a content, determined using
+    either its filename or its mime type.
+
+    Args:
+        mime_type: mime type of the content
+        path: path of the content including filename
+
+    Returns:
+        the highlightjs language class, ``plaintext`` if none could be found
+    """
+    language = None
+    if path:
+        language = highlightjs.get_hljs_language_from_filename(path.split("/")[-1])
+
+    if language is None:
+        language = highlightjs.get_hljs_language_from_mime_type(mime_type)
+
+    if language is None:
+        language = "plaintext"
+
+    return language
+
+
 def prepare_content_for_display(
     content_data: bytes, mime_type: str, encoding: str, path: Optional[str]
 ) -> Dict[str, Any]:
@@ -245,15 +341,7 @@ def prepare_content_for_display(
         key 'language'.
     """
 
-    language = None
-    if path:
-        language = highlightjs.get_hljs_language_from_filename(path.split("/")[-1])
-
-    if language is None:
-        language = highlightjs.get_hljs_language_from_mime_type(mime_type)
-
-    if language is None:
-        language = "plaintext"
+    language = get_content_language(mime_type, path)
 
     processed_content: Union[bytes, str] = content_data
 
@@ -3,7 +3,6 @@
 # License: GNU Affero General Public License version 3, or any later version
 # See top-level LICENSE file for more information
 
-import difflib
 import io
 import os
 import re
@@ -12,6 +11,7 @@ from typing import Any, Dict, List, Optional, Tuple
 from django_ratelimit.decorators import ratelimit
 
 from django.http import FileResponse, HttpRequest, HttpResponse, JsonResponse
+from django.http.response import HttpResponseBase
 from django.shortcuts import redirect, render
 from django.template.defaultfilters import filesizeformat
 from django.utils.html import format_html
@@ -20,9 +20,11 @@ from django.views.decorators.clickjacking import xframe_options_exempt
 from swh.model.hashutil import hash_to_hex
 from swh.model.swhids import ObjectType
 from swh.web.browse.browseurls import browse_route
+from swh.web.browse.line_diff import DiffTooLarge, unified_diff
 from swh.web.browse.snapshot_context import get_snapshot_context
 from swh.web.browse.utils import (
     content_display_max_size,
+    get_content_language,
     is_textual_content,
     prepare_content_for_display,
     pygments_iframe_height_for_content,
@@ -32,6 +34,7 @@ from swh.web.config import get_config
 from swh.web.utils import (
     archive,
     browsers_supported_image_mimes,
+    django_cache,
     gen_path_info,
     highlightjs,
     query,
@@ -46,6 +49,8 @@ from swh.web.utils.exc import (
     sentry_capture_exception,
 )
 from swh.web.utils.identifiers import get_swhids_info
+from swh.web.utils.immutable_objects import content_from_checksum_arg
+from swh.web.utils.raw_content import raw_content_response
 from swh.web.utils.typing import ContentMetadata, SWHObjectInfo
 
 browse_content_rate_limit = get_config().get("browse_content_rate_limit", {})
@@ -55,9 +60,10 @@ browse_content_rate_limit = get_config().get("browse_content_rate_limit", {})
     r"content/(?P<query_string>[0-9a-z_:]*[0-9a-f]+)/raw/",
     view_name="browse-content-raw",
     checksum_args=["query_string"],
+    immutable_object=content_from_checksum_arg("query_string"),
 )
 @ratelimit(key="user_or_ip", rate=browse_content_rate_limit.get("rate", "60/m"))
-def content_raw(request: HttpRequest, query_string: str) -> FileResponse:
+def content_raw(request: HttpRequest, query_string: str) -> HttpResponseBase:
     """Django view that produces a raw display of a content identified
     by its hash value.
 
@@ -88,6 +94,15 @@ def content_raw(request: HttpRequest, query_string: str) -> FileResponse:
             content_type = "image/svg+xml"
         as_attachment = False
 
+    if not re_encode:
+        return raw_content_response(
+            request,
+            content_data,
+            filename=os.path.basename(filename),
+            content_type=content_type,
+            as_attachment=as_attachment,
+        )
+
     response = FileResponse(
         io.BytesIO(content_data["raw_data"]),  # not copied, as this is never modified
         filename=os.path.basename(filename),
@@ -160,22 +175,14 @@ _auto_diff_size_limit = 20000
 
 
 def _fetch_content_for_diff(
-    query_string: str, path: Optional[str]
-) -> Tuple[bytes, int, str, bool]:
+    query_string: str, max_size: int
+) -> Tuple[Optional[bytes], int, str, bool]:
     if query_string:
         text_diff = True
-        content_from = request_content(query_string, max_size=None)
-        content_from_display_data = prepare_content_for_display(
-            content_from["raw_data"],
-            content_from["mimetype"],
-            content_from["encoding"],
-            path,
-        )
-        language = content_from_display_data["language"]
-        content_from_size = content_from["length"]
-        if not is_textual_content(content_from["mimetype"], content_from["encoding"]):
+        content = request_content(query_string, max_size=max_size)
+        if not is_textual_content(content["mimetype"], content["encoding"]):
             text_diff = False
-        return content_from["raw_data"], content_from_size, language, text_diff
+        return content["raw_data"], content["length"], content["mimetype"], text_diff
     return b"", 0, "", False
 
 
@@ -191,6 +198,49 @@ def _split_content_lines_for_diff(content: bytes) -> List[str]:
     return content_lines
 
 
+@django_cache()
+def _get_contents_diff(
+    from_query_string: str, to_query_string: str, force: bool
+) -> Dict[str, Any]:
+    """
+    Compute the unified diff between two contents.
+
+    Returns:
+        a dict containing the diff under the ``diff_str`` key and, when
+        a diff could be computed, the mime type of the contents used to
+        determine the language to highlight under the ``mimetype`` key
+
+    Raises:
+        DiffTooLarge: the diff could not be computed in time, this is not
+            cached as it depends on the load of the server
+    """
+    max_size = get_config()["content_diff"]["max_size"]
+    content_from, content_from_size, mimetype, text_diff_from = _fetch_content_for_diff(
+        from_query_string, max_size
+    )
+    content_to: Optional[bytes] = b""
+    content_to_size, text_diff_to = 0, False
+    if to_query_string:
+        content_to, content_to_size, mimetype, text_diff_to = _fetch_content_for_diff(
+            to_query_string, max_size
+        )
+
+    diff_size = abs(content_to_size - content_from_size)
+
+    if not text_diff_from and not text_diff_to:
+        return {"diff_str": "Diffs are not generated for non textual content"}
+    elif not force and diff_size > _auto_diff_size_limit:
+        return {"diff_str": "Large diffs are not automatically computed"}
+    elif content_from is None or content_to is None:
+        return {"diff_str": "Contents are too large to compute their diff"}
+
+    diff_str = unified_diff(
+        _split_content_lines_for_diff(content_from),
+        _split_content_lines_for_diff(content_to),
+    )
+    return {"diff_str": diff_str, "mimetype": mimetype}
+
+
 @browse_route(
     r"content/(?P<from_query_string>.*)/diff/(?P<to_query_string>.*)/",
     view_name="diff-contents",
@@ -206,6 +256,10 @@ def _contents_diff(
     not be generated. To force the generation of large diffs,
     the 'force' boolean query parameter must be used.
 
+    Diffs are computed with the engine set in the ``content_diff``
+    configuration entry, see :mod:`swh.web.browse.line_diff`, and cached
+    for each pair of contents.
+
     Args:
         request: input django http request
         from_query_string: a string of the form "[ALGO_HASH:]HASH" where
@@ -219,12 +273,6 @@ def _contents_diff(
         A JSON object containing the unified diff.
 
     """
-    content_from = None
-    content_to = None
-    content_from_size = 0
-    content_to_size = 0
-    content_from_lines = []
-    content_to_lines = []
     force = strtobool(request.GET.get("force", "false"))
     path = request.GET.get("path", None)
     language = "plaintext"
@@ -232,31 +280,12 @@ def _contents_diff(
         diff_str = "File renamed without changes"
     else:
         try:
-            content_from, content_from_size, language, text_diff_from = (
-                _fetch_content_for_diff(from_query_string, path)
-            )
-
-            if to_query_string:
-                content_to, content_to_size, language, text_diff_to = (
-                    _fetch_content_for_diff(to_query_string, path)
-                )
-
-            diff_size = abs(content_to_size - content_from_size)
-
-            if not text_diff_from and not text_diff_to:
-                diff_str = "Diffs are not generated for non textual content"
-                language = "plaintext"
-            elif not force and diff_size > _auto_diff_size_limit:
-                diff_str = "Large diffs are not automatically computed"
-                language = "plaintext"
-            else:
-
-                content_from_lines = _split_content_lines_for_diff(content_from)
-                if content_to:
-                    content_to_lines = _split_content_lines_for_diff(content_to)
-
-                diff_lines = difflib.unified_diff(content_from_lines, content_to_lines)
-                diff_str = "".join(list(diff_lines)[2:])
+            diff_data = _get_contents_diff(from_query_string, to_query_string, force)
+            diff_str = diff_data["diff_str"]
+            if "mimetype" in diff_data:
+                language = get_content_language(diff_data["mimetype"], path)
+        except DiffTooLarge:
+            diff_str = "Diff is too large to be computed"
         except Exception as exc:
             sentry_capture_exception(exc)
             diff_str = str(exc)
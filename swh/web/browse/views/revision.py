@@ -3,12 +3,10 @@
 # License: GNU Affero General Public License version 3, or any later version
 # See top-level LICENSE file for more information
 
-from collections import deque
-import dataclasses
 import hashlib
 import json
 import textwrap
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import render
@@ -17,7 +15,6 @@ from django.utils.safestring import mark_safe
 
 from swh.model.hashutil import hash_to_bytes
 from swh.model.swhids import CoreSWHID, ObjectType
-from swh.storage.algos.revisions_walker import State
 from swh.web.browse.browseurls import browse_route
 from swh.web.browse.snapshot_context import get_snapshot_context
 from swh.web.browse.utils import (
@@ -38,6 +35,7 @@ from swh.web.utils import (
     archive,
     cache_get,
     cache_set,
+    django_cache,
     format_utc_iso_date,
     gen_path_info,
     highlightjs,
@@ -46,6 +44,7 @@ from swh.web.utils import (
 )
 from swh.web.utils.exc import NotFoundExc, http_status_code_message
 from swh.web.utils.identifiers import get_swhids_info
+from swh.web.utils.revision_log import RevisionLogIndex
 from swh.web.utils.typing import RevisionMetadata, SnapshotContext, SWHObjectInfo
 
 
@@ -85,6 +84,7 @@ def _gen_revision_changes_list(
     revision: Dict[str, Any],
     changes: List[Dict[str, Any]],
     snapshot_context: Optional[SnapshotContext],
+    offset: int = 0,
 ) -> str:
     """
     Returns a HTML string describing the file changes
@@ -97,13 +97,16 @@ def _gen_revision_changes_list(
         changes (list): list of file changes in the revision
         snapshot_context (dict): optional origin context used to reverse
             the content urls
+        offset (int): position of the first change in the whole list of
+            file changes of the revision
 
     Returns:
         A string to insert in a revision HTML view.
 
     """
     changes_msg = []
-    for i, change in enumerate(changes):
+    parent = None
+    for i, change in enumerate(changes, start=offset):
         hasher = hashlib.sha1()
         from_query_string = ""
         to_query_string = ""
@@ -145,7 +148,8 @@ def _gen_revision_changes_list(
                 "new file:  %s" % _gen_diff_link(i, diff_link, change["to_path"])
             )
         elif change["type"] == "delete":
-            parent = archive.lookup_revision(revision["parents"][0])
+            if parent is None:
+                parent = archive.lookup_revision(revision["parents"][0])
             change["content_url"] = _gen_content_url(
                 parent, from_query_string, change["from_path"], snapshot_context
             )
@@ -165,7 +169,7 @@ def _gen_revision_changes_list(
                     "&rarr;",
                 )
             )
-    if not changes:
+    if not changes and not offset:
         changes_msg.append("No changes")
     return mark_safe("\n".join(changes_msg))
 
@@ -178,6 +182,11 @@ def _gen_revision_changes_list(
 def _revision_diff(request: HttpRequest, sha1_git: str) -> HttpResponse:
     """
     Browse internal endpoint to compute revision diff
+
+    File changes are returned by pages of :data:`_max_displayed_file_diffs`
+    changes, the ``offset`` query parameter selects the page to return and
+    the URL of the next page is provided in the ``next_changes_url`` field
+    of the response.
     """
     revision = archive.lookup_revision(sha1_git)
     snapshot_context = None
@@ -195,17 +204,84 @@ def _revision_diff(request: HttpRequest, sha1_git: str) -> HttpResponse:
             visit_type=request.GET.get("visit_type"),
         )
 
-    changes = archive.diff_revision(sha1_git)
-    changes_msg = _gen_revision_changes_list(revision, changes, snapshot_context)
+    offset = max(0, int(request.GET.get("offset", 0)))
+    changes, total_nb_changes = _get_revision_changes(
+        sha1_git, offset, _max_displayed_file_diffs
+    )
+    changes_msg = _gen_revision_changes_list(
+        revision, changes, snapshot_context, offset
+    )
+
+    next_changes_url = None
+    if offset + len(changes) < total_nb_changes:
+        query_params = request.GET.dict()
+        query_params["offset"] = str(offset + len(changes))
+        next_changes_url = reverse(
+            "diff-revision",
+            url_args={"sha1_git": sha1_git},
+            query_params=query_params,
+        )
 
     diff_data = {
-        "total_nb_changes": len(changes),
-        "changes": changes[:_max_displayed_file_diffs],
+        "total_nb_changes": total_nb_changes,
+        "changes": changes,
         "changes_msg": changes_msg,
+        "next_changes_url": next_changes_url,
     }
     return JsonResponse(diff_data)
 
 
+def _revision_changes_page_key(sha1_git: str, page_size: int, page: int) -> str:
+    return f"revision_{sha1_git}_changes_{page_size}_{page}"
+
+
+def _cache_revision_changes(sha1_git: str, page_size: int) -> List[Dict[str, Any]]:
+    """
+    Compute the whole list of file changes introduced by a revision, so renames
+    are reported whatever the pages their deleted and inserted files fall on,
+    and put it in cache by pages of ``page_size`` changes, as the whole list
+    of a large revision can exceed the maximum size of a cache entry.
+    """
+    changes = archive.diff_revision(sha1_git)
+    for page, start in enumerate(range(0, len(changes), page_size)):
+        cache_set(
+            _revision_changes_page_key(sha1_git, page_size, page),
+            changes[start : start + page_size],
+        )
+    return changes
+
+
+@django_cache(single_flight=True)
+def _get_revision_nb_changes(sha1_git: str, page_size: int) -> int:
+    """
+    Put the pages of file changes introduced by a revision in cache and
+    return the number of changes.
+    """
+    return len(_cache_revision_changes(sha1_git, page_size))
+
+
+def _get_revision_changes(
+    sha1_git: str, offset: int, limit: int
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Return ``limit`` file changes introduced by a revision starting at
+    ``offset`` and the total number of changes, read from the cached pages
+    of changes. The changes are computed again if a page is missing from
+    cache, for instance when it was evicted.
+    """
+    nb_changes = _get_revision_nb_changes(sha1_git, limit)
+    changes: List[Dict[str, Any]] = []
+    end = min(offset + limit, nb_changes)
+    for page in range(offset // limit, (end - 1) // limit + 1):
+        page_changes = cache_get(_revision_changes_page_key(sha1_git, limit, page))
+        if page_changes is None:
+            all_changes = _cache_revision_changes(sha1_git, limit)
+            return all_changes[offset : offset + limit], len(all_changes)
+        changes += page_changes
+    start = offset - (offset // limit) * limit
+    return changes[start : start + limit], nb_changes
+
+
 NB_LOG_ENTRIES = 100
 
 
@@ -239,63 +315,15 @@ def revision_log_browse(request: HttpRequest, sha1_git: str) -> HttpResponse:
     per_page = int(request.GET.get("per_page", NB_LOG_ENTRIES))
     offset = int(request.GET.get("offset", 0))
     revs_ordering = request.GET.get("revs_ordering", "committer_date")
-    cache_key = f"rev_{sha1_git}_log_ordering_{revs_ordering}"
-    rev_log_session = cache_get(
-        cache_key,
-        extra_decoders={
-            "rev_walker_state": lambda d: State(
-                done=d["done"],
-                last_rev=d["last_rev"],
-                num_revs=d["num_revs"],
-                missing_revs=d["missing_revs"],
-                revs_to_visit=(
-                    list(map(tuple, d["revs_to_visit"]))
-                    if revs_ordering == "committer_date"
-                    else d["revs_to_visit"]
-                ),
-            ),
-            "set": set,
-            "deque": deque,
-        },
+    revs, has_more_revs = RevisionLogIndex(sha1_git, revs_ordering).revisions(
+        offset, per_page
     )
-
-    rev_log = []
-    revs_walker_state = None
-    if rev_log_session:
-        rev_log = rev_log_session["rev_log"]
-        revs_walker_state = rev_log_session["revs_walker_state"]
-
-    if len(rev_log) < offset + per_page:
-        revs_walker = archive.get_revisions_walker(
-            revs_ordering,
-            sha1_git,
-            max_revs=offset + per_page + 1,
-            state=revs_walker_state,
-        )
-
-        rev_log += [rev["id"] for rev in revs_walker]
-        revs_walker_state = revs_walker.export_state()
-        cache_set(
-            cache_key,
-            {
-                "rev_log": rev_log,
-                "revs_walker_state": revs_walker_state,
-            },
-            timeout=60 * 60,  # one hour
-            extra_encoders=[
-                (State, "rev_walker_state", dataclasses.asdict),
-                (set, "set", list),
-                (deque, "deque", list),
-            ],
-        )
-
-    revs = rev_log[offset : offset + per_page]
     revision_log = archive.lookup_revision_multiple(revs)
 
     revs_ordering = request.GET.get("revs_ordering", "")
 
     prev_log_url = None
-    if len(rev_log) > offset + per_page:
+    if has_more_revs:
         prev_log_url = reverse(
             "browse-revision-log",
             url_args={"sha1_git": sha1_git},
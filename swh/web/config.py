@@ -175,6 +175,75 @@ DEFAULT_CONFIG = {
         },
     ),
     "browse_max_visits": ("int", 10000),
+    # codec used to compress values put in django cache (gzip, zstd, lz4),
+    # values smaller than min_size bytes are not compressed
+    "cache_compression": ("dict", {"codec": "gzip", "min_size": 256}),
+    # number of seconds after which cached origin visits are refreshed in
+    # background while still being served, 0 means they are checked for
+    # new visits on each request
+    "origin_visits_stale_timeout": ("int", 0),
+    # bounded thread pool used to refresh stale cache entries
+    "background_refresh": (
+        "dict",
+        {"max_workers": 4, "max_pending": 64, "lock_timeout": 60},
+    ),
+    # engine computing diffs between contents, the maximum size in bytes of
+    # diffed contents and the number of seconds after which a diff is
+    # reported as too large, see swh.web.browse.line_diff
+    "content_diff": (
+        "dict",
+        {"engine": "myers", "max_size": 5 * 1024 * 1024, "timeout": 5},
+    ),
+    # durations in seconds the archived origin matching an URL, or the absence
+    # of such origin, are kept in cache when looking up origins
+    "origin_lookup_cache": ("dict", {"timeout": 24 * 60 * 60, "not_found_timeout": 60}),
+    # maximum age in seconds of the archive coverage dataset before it gets
+    # recomputed in background, maximum number of concurrent queries to
+    # compute it and number of seconds after which the lock preventing
+    # concurrent computations by web workers expires
+    "archive_coverage": (
+        "dict",
+        {"max_age": 24 * 60 * 60, "max_workers": 8, "refresh_lock_timeout": 60 * 60},
+    ),
+    # timeout in seconds of the HTTP requests checking the existence of an origin,
+    # duration in seconds of the caching of their results and maximum number of
+    # concurrent checks and of pooled connections per host
+    "origin_existence_check": (
+        "dict",
+        {"timeout": 10, "cache_timeout": 5 * 60, "max_workers": 16},
+    ),
+    # number of save requests whose status is refreshed together and maximum
+    # number of origins whose visits are concurrently looked up in the archive
+    "save_requests_refresh": ("dict", {"chunk_size": 500, "max_workers": 8}),
+    # duration in seconds of the caching of the snapshot contexts used when
+    # browsing the archive, those targeting the latest visit of an origin
+    # expire sooner to take new visits into account
+    "snapshot_context_cache": (
+        "dict",
+        {"timeout": 24 * 60 * 60, "latest_visit_timeout": 5 * 60},
+    ),
+    # max-age in seconds of the Cache-Control header of the responses
+    # serving immutable archived objects
+    "immutable_objects_cache": ("dict", {"max_age": 365 * 24 * 60 * 60}),
+    # caching of the raw objects served by /api/1/raw/: objects up to
+    # max_memory_size bytes are put in django cache, larger ones in a local
+    # disk cache directory whose total size is bounded by max_disk_size bytes
+    # (disk caching is disabled when disk_cache_dir is None, the directory must
+    # be owned by the user running swh-web and not writable by other users)
+    "raw_objects_cache": (
+        "dict",
+        {
+            "timeout": 24 * 60 * 60,
+            "max_memory_size": 1024 * 1024,
+            "disk_cache_dir": None,
+            "max_disk_size": 10 * 1024 * 1024 * 1024,
+        },
+    ),
+    # per worker in-process cache of decoded values in front of django cache
+    "inprocess_cache": (
+        "dict",
+        {"enabled": False, "max_size": 64 * 1024 * 1024, "max_timeout": 60},
+    ),
 }
 
 swhweb_config: SWHWebConfig = SWHWebConfig()
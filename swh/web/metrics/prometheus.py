@@ -1,4 +1,4 @@
-# Copyright (C) 2022  The Software Heritage developers
+# Copyright (C) 2022-2026  The Software Heritage developers
 # See the AUTHORS file at the top-level directory of this distribution
 # License: GNU Affero General Public License version 3, or any later version
 # See top-level LICENSE file for more information
@@ -24,6 +24,9 @@ from swh.web.save_code_now.models import (
 )
 from swh.web.save_code_now.origin_save import get_savable_visit_types
 from swh.web.save_origin_webhooks.generic_receiver import SUPPORTED_FORGE_TYPES
+from swh.web.utils import inprocess_cache, single_flight_stats
+from swh.web.utils.archive import origin_lookup_stats
+from swh.web.utils.cache_codecs import codec_timings
 
 SWH_WEB_METRICS_REGISTRY = CollectorRegistry(auto_describe=True)
 
@@ -70,6 +73,43 @@ _accepted_save_requests_delay_gauge = Gauge(
 )
 
 
+INPROCESS_CACHE_METRIC = "swh_web_inprocess_cache"
+
+_inprocess_cache_gauge = Gauge(
+    name=INPROCESS_CACHE_METRIC,
+    documentation="Statistics of the in-process cache of the web worker",
+    labelnames=["stat"],
+    registry=SWH_WEB_METRICS_REGISTRY,
+)
+
+CACHE_CODECS_METRIC = "swh_web_cache_codecs"
+
+_cache_codecs_gauge = Gauge(
+    name=CACHE_CODECS_METRIC,
+    documentation="Statistics of cache payloads compression by codec",
+    labelnames=["codec", "stat"],
+    registry=SWH_WEB_METRICS_REGISTRY,
+)
+
+CACHE_SINGLE_FLIGHT_METRIC = "swh_web_cache_single_flight"
+
+_cache_single_flight_gauge = Gauge(
+    name=CACHE_SINGLE_FLIGHT_METRIC,
+    documentation="Computations performed or avoided by single-flight cached functions",
+    labelnames=["stat"],
+    registry=SWH_WEB_METRICS_REGISTRY,
+)
+
+ORIGIN_LOOKUP_CACHE_METRIC = "swh_web_origin_lookup_cache"
+
+_origin_lookup_cache_gauge = Gauge(
+    name=ORIGIN_LOOKUP_CACHE_METRIC,
+    documentation="Origin URLs resolved from cache or by querying the archive",
+    labelnames=["stat"],
+    registry=SWH_WEB_METRICS_REGISTRY,
+)
+
+
 def compute_save_requests_metrics() -> None:
     """Compute Prometheus metrics related to origin save requests:
 
@@ -165,3 +205,30 @@ def compute_save_requests_metrics() -> None:
             load_task_status=accepted_save_requests_delay["loading_task_status"],
             visit_type=accepted_save_requests_delay["visit_type"],
         ).inc(accepted_save_requests_delay["delay"].total_seconds())
+
+
+def compute_cache_metrics() -> None:
+    """Compute Prometheus metrics related to the caching layer of the web
+    worker serving the metrics request:
+
+    - in-process cache hits, misses, evictions, ...
+    - number of calls, time spent and processed bytes by cache codecs
+    - number of computations performed or avoided in single-flight mode
+    - number of origin URLs resolved from cache or by querying the archive
+
+    """
+    for stat, count in single_flight_stats().items():
+        _cache_single_flight_gauge.labels(stat=stat).set(count)
+
+    for stat, count in origin_lookup_stats().items():
+        _origin_lookup_cache_gauge.labels(stat=stat).set(count)
+
+    for codec, stats in codec_timings().items():
+        for stat, value in stats.items():
+            _cache_codecs_gauge.labels(codec=codec, stat=stat).set(value)
+
+    l1_cache = inprocess_cache()
+    if l1_cache is None:
+        return
+    for stat, value in l1_cache.stats().items():
+        _inprocess_cache_gauge.labels(stat=stat).set(value)
@@ -9,12 +9,14 @@ from django.http import HttpResponse
 
 from swh.web.metrics.prometheus import (
     SWH_WEB_METRICS_REGISTRY,
+    compute_cache_metrics,
     compute_save_requests_metrics,
 )
 
 
 def prometheus_metrics(request):
     compute_save_requests_metrics()
+    compute_cache_metrics()
 
     return HttpResponse(
         content=generate_latest(registry=SWH_WEB_METRICS_REGISTRY),
@@ -1,4 +1,4 @@
-# Copyright (C) 2022  The Software Heritage developers
+# Copyright (C) 2022-2026  The Software Heritage developers
 # See the AUTHORS file at the top-level directory of this distribution
 # License: GNU Affero General Public License version 3, or any later version
 # See top-level LICENSE file for more information
@@ -9,3 +9,13 @@ from django.apps import AppConfig
 class SaveCodeNowConfig(AppConfig):
     name = "swh.web.save_code_now"
     label = "swh_web_save_code_now"
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from .models import SaveAuthorizedOrigin, SaveUnauthorizedOrigin
+        from .url_prefixes import url_prefixes_changed
+
+        for model in (SaveAuthorizedOrigin, SaveUnauthorizedOrigin):
+            post_save.connect(url_prefixes_changed, sender=model)
+            post_delete.connect(url_prefixes_changed, sender=model)
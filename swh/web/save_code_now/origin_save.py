@@ -3,13 +3,17 @@
 # License: GNU Affero General Public License version 3, or any later version
 # See top-level LICENSE file for more information
 
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from functools import lru_cache
+import hashlib
 import logging
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 from urllib.parse import quote, urlparse
 
 import requests
+import requests.adapters
 
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.core.validators import URLValidator
@@ -38,7 +42,8 @@ from swh.web.save_code_now.models import (
     SaveOriginRequest,
     SaveUnauthorizedOrigin,
 )
-from swh.web.utils import archive, parse_iso8601_date_to_utc
+from swh.web.save_code_now.url_prefixes import get_url_prefix_indexes
+from swh.web.utils import archive, cache_get, cache_set, parse_iso8601_date_to_utc
 from swh.web.utils.exc import BadInputExc, ForbiddenExc, NotFoundExc
 from swh.web.utils.typing import OriginExistenceCheckInfo, SaveOriginRequestInfo
 
@@ -91,6 +96,10 @@ def can_save_origin(origin_url: str, bypass_pending_review: bool = False) -> str
       * rejected if the url is not allowed to be archived
       * put in pending state for manual review otherwise
 
+    Authorized and unauthorized origin url prefixes are looked up in
+    indexes shared by the requests processed by the web worker, see
+    :mod:`swh.web.save_code_now.url_prefixes`.
+
     Args:
         origin_url (str): the software origin url to check
 
@@ -98,15 +107,15 @@ def can_save_origin(origin_url: str, bypass_pending_review: bool = False) -> str
         str: the origin save request status, either **accepted**,
         **rejected** or **pending**
     """
+    authorized_urls, unauthorized_urls = get_url_prefix_indexes()
+
     # origin url may be blocked
-    for url_prefix in get_origin_save_unauthorized_urls():
-        if origin_url.startswith(url_prefix):
-            return SAVE_REQUEST_REJECTED
+    if unauthorized_urls.match(origin_url):
+        return SAVE_REQUEST_REJECTED
 
     # if the origin url is in the white list, it can be immediately saved
-    for url_prefix in get_origin_save_authorized_urls():
-        if origin_url.startswith(url_prefix):
-            return SAVE_REQUEST_ACCEPTED
+    if authorized_urls.match(origin_url):
+        return SAVE_REQUEST_ACCEPTED
 
     # otherwise, the origin url needs to be manually verified if the user
     # that submitted it does not have special permission
@@ -245,15 +254,67 @@ def validate_origin_url(origin_url: str) -> None:
         )
 
 
+def _origin_existence_check_config() -> Dict[str, Any]:
+    return get_config()["origin_existence_check"]
+
+
+@lru_cache()
+def _http_session() -> requests.Session:
+    """Return the HTTP session shared by origin existence checks, connections
+    to remote hosts are kept alive and reused between checks."""
+    pool_size = _origin_existence_check_config()["max_workers"]
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@lru_cache()
+def _origin_existence_check_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=_origin_existence_check_config()["max_workers"],
+        thread_name_prefix="origin_exists",
+    )
+
+
+def _origin_exists_cache_key(origin_url: str) -> str:
+    return "origin_exists_" + hashlib.sha1(origin_url.encode()).hexdigest()
+
+
 def origin_exists(origin_url: str) -> OriginExistenceCheckInfo:
     """Check the origin url for existence. If it exists, extract some more useful
     information on the origin.
 
+    The check is performed by sending a HEAD request with the timeout set in
+    the ``origin_existence_check`` configuration entry, an origin whose host
+    cannot be reached within that delay is considered as not existing. Check
+    results are cached for a short period of time, except those of failed
+    checks (timeout, connection error or server error) as the host may
+    recover before the cache expires.
+
     """
-    resp = requests.head(origin_url, allow_redirects=True)
-    exists = resp.ok
+    cache_key = _origin_exists_cache_key(origin_url)
+    cached_result = cache_get(cache_key)
+    if cached_result is not None:
+        return cached_result
+
+    check_config = _origin_existence_check_config()
+    exists = False
+    check_failed = True
     content_length: Optional[int] = None
     last_modified: Optional[str] = None
+    try:
+        resp = _http_session().head(
+            origin_url, allow_redirects=True, timeout=check_config["timeout"]
+        )
+    except requests.RequestException as exc:
+        logger.info("Could not check existence of %s: %s", origin_url, exc)
+    else:
+        exists = resp.ok
+        check_failed = resp.status_code >= 500
     if exists:
         # Also process X-Archive-Orig-* headers in case the URL targets the
         # Internet Archive.
@@ -271,26 +332,69 @@ def origin_exists(origin_url: str) -> OriginExistenceCheckInfo:
             # if not provided or not parsable as per the expected format, keep it None
             pass
 
-    return OriginExistenceCheckInfo(
+    result = OriginExistenceCheckInfo(
         origin_url=origin_url,
         exists=exists,
         last_modified=last_modified,
         content_length=content_length,
     )
+    if not check_failed:
+        cache_set(cache_key, result, timeout=check_config["cache_timeout"])
+    return result
+
+
+def origin_exists_async(origin_url: str) -> "Future[OriginExistenceCheckInfo]":
+    """Check the origin url for existence in a background thread.
+
+    Args:
+        origin_url: the URL to check
+
+    Returns:
+        a future whose result is the one of :func:`origin_exists`
+    """
+    return _origin_existence_check_executor().submit(origin_exists, origin_url)
+
+
+def origins_exist(origin_urls: Iterable[str]) -> Dict[str, OriginExistenceCheckInfo]:
+    """Check multiple origin urls for existence concurrently.
+
+    Args:
+        origin_urls: the URLs to check
+
+    Returns:
+        a dict mapping each URL to the result of :func:`origin_exists`
+    """
+    futures = {url: origin_exists_async(url) for url in dict.fromkeys(origin_urls)}
+    return {url: future.result() for url, future in futures.items()}
 
 
 def _check_origin_exists(url: str) -> OriginExistenceCheckInfo:
     """Ensure an URL exists, if not raise an explicit message."""
-    metadata = origin_exists(url)
-    if not metadata["exists"]:
-        raise BadInputExc(f"The provided url ({escape(url)}) does not exist!")
+    return _check_origins_exist([url])[url]
+
+
+def _check_origins_exist(urls: List[str]) -> Dict[str, OriginExistenceCheckInfo]:
+    """Ensure URLs exist, if one does not raise an explicit message."""
+    if len(urls) == 1:
+        # no need to involve a background thread for a single check
+        metadata = {urls[0]: origin_exists(urls[0])}
+    else:
+        metadata = origins_exist(urls)
+    for url in urls:
+        if not metadata[url]["exists"]:
+            raise BadInputExc(f"The provided url ({escape(url)}) does not exist!")
 
     return metadata
 
 
+VisitInfo = Tuple[Optional[datetime], Optional[str], Optional[str]]
+"""Tuple of (visit date, optional visit status, optional snapshot id) for a
+save origin request"""
+
+
 def _get_visit_info_for_save_request(
     save_request: SaveOriginRequest,
-) -> Tuple[Optional[datetime], Optional[str], Optional[str]]:
+) -> VisitInfo:
     """Retrieve visit information out of a save request
 
     Args:
@@ -312,20 +416,73 @@ def _get_visit_info_for_save_request(
     return visit_date, visit_status, snapshot_id
 
 
+def _get_visits_info_for_save_requests(
+    save_requests: List[SaveOriginRequest], max_workers: int
+) -> Dict[int, VisitInfo]:
+    """Retrieve visit information out of multiple save requests.
+
+    The visit of a save request is the first one performed after its submission,
+    so the visit found for a request is also the one of the requests for the same
+    origin submitted between that request and the visit. Requests are thus processed
+    per origin in chronological order and the archive is usually queried once per
+    origin. Distinct origins are processed concurrently.
+
+    Args:
+        save_requests: Input save origin requests to retrieve information for.
+        max_workers: Maximum number of origins processed concurrently.
+
+    Returns:
+        Dict mapping save request ids to tuples of (visit date, optional visit
+        status, optional snapshot id)
+    """
+    requests_by_origin: Dict[str, List[SaveOriginRequest]] = defaultdict(list)
+    for save_request in save_requests:
+        requests_by_origin[save_request.origin_url].append(save_request)
+
+    def origin_visits_info(
+        origin_requests: List[SaveOriginRequest],
+    ) -> Dict[int, VisitInfo]:
+        visits_info = {}
+        visit_info: Optional[VisitInfo] = None
+        for save_request in sorted(origin_requests, key=lambda sor: sor.request_date):
+            if visit_info is None or (
+                visit_info[0] is not None and visit_info[0] < save_request.request_date
+            ):
+                visit_info = _get_visit_info_for_save_request(save_request)
+            visits_info[save_request.id] = visit_info
+        return visits_info
+
+    visits_info: Dict[int, VisitInfo] = {}
+    if len(requests_by_origin) <= 1 or max_workers <= 1:
+        for origin_requests in requests_by_origin.values():
+            visits_info.update(origin_visits_info(origin_requests))
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for origin_visits in executor.map(
+                origin_visits_info, requests_by_origin.values()
+            ):
+                visits_info.update(origin_visits)
+    return visits_info
+
+
 def _check_visit_update_status(
     save_request: SaveOriginRequest,
+    visit_info: Optional[VisitInfo] = None,
 ) -> Tuple[Optional[datetime], Optional[str], Optional[str]]:
     """Given a save request, determine whether a save request was successful or failed.
 
     Args:
         save_request: Input save origin request to retrieve information for.
+        visit_info: Visit information of the save request if already retrieved.
 
     Returns:
         Tuple of (optional visit date, optional visit status, optional save task status)
         for such save request origin
 
     """
-    visit_date, visit_status, _ = _get_visit_info_for_save_request(save_request)
+    if visit_info is None:
+        visit_info = _get_visit_info_for_save_request(save_request)
+    visit_date, visit_status, _ = visit_info
     loading_task_status = None
     if visit_date and visit_status in ("full", "partial"):
         # visit has been performed, mark the saving task as succeeded
@@ -359,24 +516,32 @@ def _compute_task_loading_status(
     return loading_task_status
 
 
-def _update_save_request_info(
+def _refresh_save_request(
     save_request: SaveOriginRequest,
     task: Optional[Task] = None,
     task_run: Optional[TaskRun] = None,
-) -> SaveOriginRequestInfo:
+    visit_info: Optional[VisitInfo] = None,
+) -> bool:
     """Update save request information out of the visit status and fallback to the task and
-    task_run information if the visit status is missing.
+    task_run information if the visit status is missing, without saving it to database.
 
     Args:
         save_request: Save request
         task: Associated scheduler task information about the save request
         task_run: Most recent run occurrence of the associated task
+        visit_info: Visit information of the save request if already retrieved
 
     Returns:
-        Summary of the save request information updated.
+        Whether the save request information was modified.
 
     """
-    must_save = False
+    modified = False
+
+    def get_visit_info() -> VisitInfo:
+        nonlocal visit_info
+        if visit_info is None:
+            visit_info = _get_visit_info_for_save_request(save_request)
+        return visit_info
 
     # To determine the save code now request's final status, the visit date must be set
     # and the visit status must be a final one. Once they do, the save code now is
@@ -387,7 +552,7 @@ def _update_save_request_info(
         or save_request.visit_status in NON_TERMINAL_STATUSES
     ):
         visit_date, visit_status, loading_task_status = _check_visit_update_status(
-            save_request
+            save_request, get_visit_info()
         )
 
         if not loading_task_status or loading_task_status == SAVE_TASK_RUNNING:
@@ -398,18 +563,18 @@ def _update_save_request_info(
             loading_task_status = _compute_task_loading_status(task, task_run)
 
         if visit_date != save_request.visit_date:
-            must_save = True
+            modified = True
             save_request.visit_date = visit_date
 
         if visit_status != save_request.visit_status:
-            must_save = True
+            modified = True
             save_request.visit_status = visit_status
 
         if (
             loading_task_status is not None
             and loading_task_status != save_request.loading_task_status
         ):
-            must_save = True
+            modified = True
             save_request.loading_task_status = loading_task_status
 
     # Try to get snapshot identifier associated to the save request
@@ -417,7 +582,7 @@ def _update_save_request_info(
         save_request.visit_status in (VISIT_STATUS_PARTIAL, VISIT_STATUS_FULL)
         and not save_request.snapshot_swhid
     ):
-        _, _, snapshot_id = _get_visit_info_for_save_request(save_request)
+        _, _, snapshot_id = get_visit_info()
 
         save_request.snapshot_swhid = (
             str(
@@ -430,20 +595,47 @@ def _update_save_request_info(
             # snapshot not found, set its id to empty in database to avoid querying it again
             else ""
         )
-        must_save = True
+        modified = True
+
+    return modified
 
-    if must_save:
-        save_request.save()
 
+def _save_request_info(
+    save_request: SaveOriginRequest,
+    task: Optional[Task] = None,
+    task_run: Optional[TaskRun] = None,
+) -> SaveOriginRequestInfo:
     sr_dict = save_request.to_dict()
     if task:
         sr_dict["next_run"] = task.next_run
     if task_run:
         sr_dict["metadata"] = task_run.metadata
-
     return sr_dict
 
 
+def _update_save_request_info(
+    save_request: SaveOriginRequest,
+    task: Optional[Task] = None,
+    task_run: Optional[TaskRun] = None,
+) -> SaveOriginRequestInfo:
+    """Update save request information out of the visit status and fallback to the task and
+    task_run information if the visit status is missing.
+
+    Args:
+        save_request: Save request
+        task: Associated scheduler task information about the save request
+        task_run: Most recent run occurrence of the associated task
+
+    Returns:
+        Summary of the save request information updated.
+
+    """
+    if _refresh_save_request(save_request, task, task_run):
+        save_request.save()
+
+    return _save_request_info(save_request, task, task_run)
+
+
 def create_save_origin_request(
     visit_type: str,
     origin_url: str,
@@ -518,21 +710,24 @@ def create_save_origin_request(
                 raise BadInputExc(
                     "Artifacts data are missing for the archives visit type."
                 )
-            artifacts = []
             for artifact in archives_data:
-                artifact_url = artifact.get("artifact_url")
-                artifact_version = artifact.get("artifact_version")
-                if not artifact_url or not artifact_version:
+                if not artifact.get("artifact_url") or not artifact.get(
+                    "artifact_version"
+                ):
                     raise BadInputExc("Missing url or version for an artifact to load.")
-                metadata = _check_origin_exists(artifact_url)
-                artifacts.append(
-                    {
-                        "url": artifact_url,
-                        "version": artifact_version,
-                        "time": metadata["last_modified"],
-                        "length": metadata["content_length"],
-                    }
-                )
+            # check all artifacts concurrently
+            metadata = _check_origins_exist(
+                [artifact["artifact_url"] for artifact in archives_data]
+            )
+            artifacts = [
+                {
+                    "url": artifact["artifact_url"],
+                    "version": artifact["artifact_version"],
+                    "time": metadata[artifact["artifact_url"]]["last_modified"],
+                    "length": metadata[artifact["artifact_url"]]["content_length"],
+                }
+                for artifact in archives_data
+            ]
             task_kwargs = dict(**task_kwargs, artifacts=artifacts, snapshot_append=True)
         elif visit_type == "tarball":
             task_kwargs["checksums"] = {}
@@ -666,12 +861,78 @@ def create_save_origin_request(
     return _update_save_request_info(sor, task)
 
 
+_SAVE_REQUEST_REFRESHED_FIELDS = [
+    "visit_date",
+    "visit_status",
+    "loading_task_status",
+    "snapshot_swhid",
+]
+
+
+def _update_save_origin_requests(
+    save_requests: List[SaveOriginRequest], max_workers: int
+) -> List[SaveOriginRequestInfo]:
+    """Update a batch of save requests and their status in db."""
+    task_ids = [sor.loading_task_id for sor in save_requests]
+    try:
+        tasks_list = scheduler().get_tasks(task_ids)
+        tasks = {task.id: task for task in tasks_list if task.id is not None}
+        task_runs_list = scheduler().get_task_runs(list(tasks.keys()))
+        task_runs = {
+            task_run.task: task_run
+            for task_run in task_runs_list
+            if task_run.task is not None
+        }
+    except Exception:
+        # allow to avoid mocking api GET responses for /origin/save endpoint when
+        # running cypress tests as scheduler is not available
+        tasks = {}
+        task_runs = {}
+
+    # save requests whose visit information is needed to update them
+    save_requests_to_check = [
+        sor
+        for sor in save_requests
+        if not sor.visit_date
+        or not sor.visit_status
+        or sor.visit_status in NON_TERMINAL_STATUSES
+        or (
+            sor.visit_status in (VISIT_STATUS_PARTIAL, VISIT_STATUS_FULL)
+            and not sor.snapshot_swhid
+        )
+    ]
+    visits_info = _get_visits_info_for_save_requests(
+        save_requests_to_check, max_workers
+    )
+
+    save_requests_info = []
+    modified_save_requests = []
+    for sor in save_requests:
+        task = tasks.get(sor.loading_task_id)
+        task_run = task_runs.get(sor.loading_task_id)
+        if _refresh_save_request(sor, task, task_run, visits_info.get(sor.id)):
+            modified_save_requests.append(sor)
+        save_requests_info.append(_save_request_info(sor, task, task_run))
+
+    if modified_save_requests:
+        SaveOriginRequest.objects.bulk_update(
+            modified_save_requests, _SAVE_REQUEST_REFRESHED_FIELDS
+        )
+
+    return save_requests_info
+
+
 def update_save_origin_requests_from_queryset(
     requests_queryset: QuerySet,
 ) -> List[SaveOriginRequestInfo]:
     """Update all save requests from a SaveOriginRequest queryset, update their status in db
     and return the list of impacted save_requests.
 
+    Save requests are processed in chunks whose size is set in the
+    ``save_requests_refresh`` configuration entry: scheduler tasks and archive
+    visits of a chunk are retrieved in bulk and its modified save requests are
+    updated in a single query.
+
     Args:
         requests_queryset: input SaveOriginRequest queryset
 
@@ -680,32 +941,14 @@ def update_save_origin_requests_from_queryset(
         :func:`swh.web.save_code_now.origin_save.create_save_origin_request`
 
     """
-    task_ids = []
-    for sor in requests_queryset:
-        task_ids.append(sor.loading_task_id)
-    save_requests = []
-    if task_ids:
-        try:
-            tasks_list = scheduler().get_tasks(task_ids)
-            tasks = {task.id: task for task in tasks_list if task.id is not None}
-            task_runs_list = scheduler().get_task_runs(list(tasks.keys()))
-            task_runs = {
-                task_run.task: task_run
-                for task_run in task_runs_list
-                if task_run.task is not None
-            }
-        except Exception:
-            # allow to avoid mocking api GET responses for /origin/save endpoint when
-            # running cypress tests as scheduler is not available
-            tasks = {}
-            task_runs = {}
-        for sor in requests_queryset:
-            sr_dict = _update_save_request_info(
-                sor,
-                tasks.get(sor.loading_task_id),
-                task_runs.get(sor.loading_task_id),
-            )
-            save_requests.append(sr_dict)
+    refresh_config = get_config()["save_requests_refresh"]
+    chunk_size = refresh_config["chunk_size"]
+    sors = list(requests_queryset)
+    save_requests: List[SaveOriginRequestInfo] = []
+    for i in range(0, len(sors), chunk_size):
+        save_requests += _update_save_origin_requests(
+            sors[i : i + chunk_size], refresh_config["max_workers"]
+        )
     return save_requests
 
 
@@ -4,11 +4,16 @@
 # See top-level LICENSE file for more information
 
 from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
 from typing import Optional
+from urllib.parse import urlparse
 import uuid
 
 import iso8601
 import pytest
+import requests
 
 from swh.scheduler.utils import create_oneshot_task
 from swh.web.save_code_now.models import (
@@ -25,12 +30,15 @@ from swh.web.save_code_now.models import (
 from swh.web.save_code_now.origin_save import (
     _check_origin_exists,
     _check_visit_type_savable,
+    _get_visits_info_for_save_requests,
     _visit_type_task,
     _visit_type_task_privileged,
     get_savable_visit_types,
     get_save_origin_requests,
     get_save_origin_task_info,
     origin_exists,
+    origin_exists_async,
+    origins_exist,
     refresh_save_origin_request_statuses,
 )
 from swh.web.utils.exc import BadInputExc
@@ -411,6 +419,109 @@ def test_origin_exists_200_with_data_unexpected_date_format(requests_mock):
     )
 
 
+def test_origin_exists_cached(requests_mock):
+    url = "https://example.org/cached-url"
+    requests_mock.head(url, status_code=200)
+
+    assert origin_exists(url)["exists"]
+    assert origin_exists(url)["exists"]
+    assert requests_mock.call_count == 1
+
+
+def test_origin_exists_connection_error(requests_mock):
+    url = "https://unreachable.example.org/url"
+    requests_mock.head(url, exc=requests.exceptions.ConnectionError)
+
+    assert origin_exists(url) == OriginExistenceCheckInfo(
+        origin_url=url,
+        exists=False,
+        content_length=None,
+        last_modified=None,
+    )
+
+
+def test_origin_exists_failed_check_not_cached(requests_mock):
+    url = "https://recovering.example.org/url"
+    requests_mock.head(
+        url,
+        [
+            {"exc": requests.exceptions.ConnectTimeout},
+            {"status_code": 503},
+            {"status_code": 200},
+        ],
+    )
+
+    assert not origin_exists(url)["exists"]
+    assert not origin_exists(url)["exists"]
+    assert origin_exists(url)["exists"]
+    assert origin_exists(url)["exists"]
+    assert requests_mock.call_count == 3
+
+
+def test_origin_exists_404_cached(requests_mock):
+    url = "https://example.org/missing-url"
+    requests_mock.head(url, status_code=404)
+
+    assert not origin_exists(url)["exists"]
+    assert not origin_exists(url)["exists"]
+    assert requests_mock.call_count == 1
+
+
+class _SlowHeadHandler(BaseHTTPRequestHandler):
+    """Reply to HEAD requests after a delay in seconds set in the URL path."""
+
+    def do_HEAD(self):
+        time.sleep(float(urlparse(self.path).path.strip("/")))
+        self.send_response(200)
+        self.send_header("Content-Length", "10")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def slow_http_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHeadHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_origin_exists_timeout(slow_http_server, config_updater):
+    config_updater(
+        {
+            "origin_existence_check": {
+                "timeout": 0.2,
+                "cache_timeout": 60,
+                "max_workers": 4,
+            }
+        }
+    )
+
+    assert origin_exists(f"{slow_http_server}/0")["content_length"] == 10
+
+    start = time.monotonic()
+    assert not origin_exists(f"{slow_http_server}/2")["exists"]
+    assert time.monotonic() - start < 1
+
+
+def test_origins_exist_concurrently(slow_http_server):
+    urls = [f"{slow_http_server}/0.5?{i}" for i in range(16)]
+
+    start = time.monotonic()
+    results = origins_exist(urls + urls)
+    assert time.monotonic() - start < 0.5 * len(urls) / 2
+
+    assert list(results) == urls
+    assert all(results[url]["exists"] for url in urls)
+
+    assert origin_exists_async(urls[0]).result() == results[urls[0]]
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize(
     "visit_status",
@@ -614,7 +725,7 @@ def test_refresh_in_progress_save_request_statuses(mocker, swh_scheduler):
 
     assert (
         mock_archive.origin_visit_find_by_date.called
-        and mock_archive.origin_visit_find_by_date.call_count == 3
+        and mock_archive.origin_visit_find_by_date.call_count == 2
     )
 
     for sor in sors:
@@ -781,3 +892,96 @@ def test_refresh_save_request_when_worker_lost(mocker, swh_scheduler):
     # save task should be marked as failed
     sors = refresh_save_origin_request_statuses()
     assert sors[0]["save_task_status"] == SAVE_TASK_FAILED
+
+
+def test_get_visits_info_for_save_requests(mocker):
+    date_now = datetime.now(tz=timezone.utc)
+    visit_date = date_now - timedelta(hours=1)
+
+    def get_visit_info(save_request):
+        if save_request.request_date <= visit_date:
+            return visit_date, VISIT_STATUS_FULL, "snapshot"
+        return None, None, None
+
+    mock_get_visit_info = mocker.patch(
+        "swh.web.save_code_now.origin_save._get_visit_info_for_save_request",
+        side_effect=get_visit_info,
+    )
+
+    save_requests = [
+        SaveOriginRequest(
+            id=i,
+            origin_url=origin_url,
+            request_date=date_now - timedelta(hours=hours_ago),
+        )
+        for i, (origin_url, hours_ago) in enumerate(
+            [
+                (_origin_url, 2),
+                (_origin_url, 0.5),
+                (_origin_url, 3),
+                ("https://git.example.org/project", 0.5),
+                ("https://git.example.org/project", 0.2),
+            ]
+        )
+    ]
+
+    visits_info = _get_visits_info_for_save_requests(save_requests, max_workers=4)
+
+    assert visits_info == {
+        0: (visit_date, VISIT_STATUS_FULL, "snapshot"),
+        1: (None, None, None),
+        2: (visit_date, VISIT_STATUS_FULL, "snapshot"),
+        3: (None, None, None),
+        4: (None, None, None),
+    }
+    # the visit found for the oldest request of the first origin also holds
+    # for its second oldest one
+    assert mock_get_visit_info.call_count == 3
+
+
+@pytest.mark.django_db
+def test_refresh_save_request_statuses_batched(mocker, swh_scheduler, config_updater):
+    config_updater({"save_requests_refresh": {"chunk_size": 2, "max_workers": 2}})
+
+    task, _ = _fill_scheduler_db(
+        swh_scheduler,
+        task_status="next_run_scheduled",
+        task_run_status="started",
+    )
+    assert task is not None
+
+    date_now = datetime.now(tz=timezone.utc)
+    for minutes_ago in range(4):
+        SaveOriginRequest.objects.create(
+            request_date=date_now - timedelta(minutes=minutes_ago + 1),
+            visit_type=_visit_type,
+            origin_url=_origin_url,
+            status=SAVE_REQUEST_ACCEPTED,
+            loading_task_id=task.id,
+        )
+
+    mock_archive = mocker.patch("swh.web.save_code_now.origin_save.archive")
+    mock_archive.origin_visit_find_by_date.return_value = OriginVisitInfo(
+        date=date_now.isoformat(),
+        formatted_date="",
+        metadata={},
+        origin=_origin_url,
+        snapshot="",
+        status=VISIT_STATUS_CREATED,
+        type=_visit_type,
+        url="",
+        visit=34,
+    )
+    spy_bulk_update = mocker.spy(SaveOriginRequest.objects, "bulk_update")
+
+    sors = refresh_save_origin_request_statuses()
+
+    assert len(sors) == 4
+    for sor in sors:
+        assert sor["save_task_status"] == SAVE_TASK_RUNNING
+        assert sor["visit_status"] == VISIT_STATUS_CREATED
+    for sor in SaveOriginRequest.objects.all():
+        assert sor.visit_status == VISIT_STATUS_CREATED
+    # one archive query per chunk and one database update per chunk
+    assert mock_archive.origin_visit_find_by_date.call_count == 2
+    assert spy_bulk_update.call_count == 2
@@ -77,6 +77,30 @@ def test_remove_authorized_origin_url(client, staff_user):
     assert can_save_origin(_authorized_origin_url) == SAVE_REQUEST_PENDING
 
 
+def test_can_save_origin(mocker):
+    pending_url = "https://git.example.org/project"
+    accepted_url = f"{_authorized_origin_url}project"
+    rejected_url = f"{_unauthorized_origin_url}project"
+    assert can_save_origin(pending_url) == SAVE_REQUEST_PENDING
+    assert can_save_origin(accepted_url) == SAVE_REQUEST_ACCEPTED
+    assert can_save_origin(rejected_url) == SAVE_REQUEST_REJECTED
+
+    # URL prefixes are not read from the database while their indexes are valid
+    values_list = mocker.spy(SaveAuthorizedOrigin.objects, "values_list")
+    assert can_save_origin(accepted_url) == SAVE_REQUEST_ACCEPTED
+    assert can_save_origin(rejected_url) == SAVE_REQUEST_REJECTED
+    values_list.assert_not_called()
+
+    assert (
+        can_save_origin(pending_url, bypass_pending_review=True)
+        == SAVE_REQUEST_ACCEPTED
+    )
+
+    # pending URL was marked as trusted
+    assert SaveAuthorizedOrigin.objects.filter(url=pending_url).count() == 1
+    assert can_save_origin(pending_url) == SAVE_REQUEST_ACCEPTED
+
+
 def test_add_unauthorized_origin_url(client, staff_user):
     unauthorized_url = "https://www.yahoo./"
     assert can_save_origin(unauthorized_url) == SAVE_REQUEST_PENDING
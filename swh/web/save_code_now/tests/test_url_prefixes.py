@@ -0,0 +1,44 @@
+# Copyright (C) 2026  The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU Affero General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+import random
+
+from swh.web.save_code_now.url_prefixes import UrlPrefixIndex
+
+
+def test_url_prefix_index():
+    index = UrlPrefixIndex(
+        [
+            "https://gitlab.com/",
+            "https://gitlab.com/inkscape/",
+            "https://github.com/python",
+            "https://git.example.org/a",
+            "https://git.example.org/b",
+        ]
+    )
+    assert index.prefixes == [
+        "https://git.example.org/a",
+        "https://git.example.org/b",
+        "https://github.com/python",
+        "https://gitlab.com/",
+    ]
+    assert index.match("https://gitlab.com/inkscape/inkscape")
+    assert index.match("https://github.com/python/cpython")
+    assert index.match("https://github.com/python")
+    assert index.match("https://git.example.org/b/c")
+    assert not index.match("https://github.com/")
+    assert not index.match("https://git.example.org/c")
+    assert not index.match("https://bitbucket.org/project")
+    assert not UrlPrefixIndex([]).match("https://gitlab.com/")
+
+
+def test_url_prefix_index_same_as_linear_scan():
+    rng = random.Random(0)
+    alphabet = "ab/"
+    prefixes = ["".join(rng.choices(alphabet, k=rng.randint(1, 5))) for _ in range(20)]
+    index = UrlPrefixIndex(prefixes)
+    for _ in range(1000):
+        url = "".join(rng.choices(alphabet, k=rng.randint(0, 8)))
+        assert index.match(url) == any(url.startswith(p) for p in prefixes)
@@ -0,0 +1,99 @@
+# Copyright (C) 2026  The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU Affero General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+"""In-memory indexes of the origin URL prefixes authorized or not to be saved.
+
+Indexes are built from the :class:`swh.web.save_code_now.models.SaveAuthorizedOrigin`
+and :class:`swh.web.save_code_now.models.SaveUnauthorizedOrigin` tables and shared
+by the requests processed by a web worker. A version token stored in django cache
+is changed each time an entry of those tables is saved or deleted, workers rebuild
+their indexes when it differs from the one they were built for.
+"""
+
+import bisect
+import threading
+from typing import Iterable, List, Optional, Tuple
+import uuid
+
+from django.db import transaction
+
+from swh.web.save_code_now.models import SaveAuthorizedOrigin, SaveUnauthorizedOrigin
+from swh.web.utils import _compute_final_cache_key, cache
+
+
+class UrlPrefixIndex:
+    """Sorted index of URL prefixes.
+
+    Prefixes having a shorter prefix in the index are discarded, any URL is
+    then matched by at most one indexed prefix: the greatest one lower than
+    or equal to the URL, which is found by bisection.
+
+    Args:
+        prefixes: URL prefixes to index
+    """
+
+    def __init__(self, prefixes: Iterable[str]):
+        self.prefixes: List[str] = []
+        for prefix in sorted(set(prefixes)):
+            if not self.prefixes or not prefix.startswith(self.prefixes[-1]):
+                self.prefixes.append(prefix)
+
+    def match(self, url: str) -> bool:
+        """Check if an URL starts with one of the indexed prefixes."""
+        i = bisect.bisect_right(self.prefixes, url)
+        return i > 0 and url.startswith(self.prefixes[i - 1])
+
+
+_VERSION_CACHE_KEY = "save_code_now_url_prefixes_version"
+
+_indexes_lock = threading.Lock()
+_indexes: Optional[Tuple[str, UrlPrefixIndex, UrlPrefixIndex]] = None
+
+
+def _version_cache_key() -> str:
+    return _compute_final_cache_key(_VERSION_CACHE_KEY)
+
+
+def invalidate_url_prefix_indexes() -> None:
+    """Make workers rebuild their URL prefix indexes."""
+    # django cache is used directly, values put in the in-process cache
+    # would delay the invalidation in other workers
+    cache.set(_version_cache_key(), uuid.uuid4().hex, timeout=None)
+
+
+def get_url_prefix_indexes() -> Tuple[UrlPrefixIndex, UrlPrefixIndex]:
+    """Return the URL prefix indexes of the current worker, rebuilt from the
+    database if they are outdated.
+
+    Returns:
+        a tuple whose first member indexes the authorized URL prefixes and
+        second member the unauthorized ones
+    """
+    global _indexes
+    version = cache.get(_version_cache_key())
+    if version is None:
+        invalidate_url_prefix_indexes()
+        version = cache.get(_version_cache_key())
+    with _indexes_lock:
+        # indexes are rebuilt for each call when the cache is not reachable
+        if version is None or _indexes is None or _indexes[0] != version:
+            _indexes = (
+                version,
+                UrlPrefixIndex(
+                    SaveAuthorizedOrigin.objects.values_list("url", flat=True)
+                ),
+                UrlPrefixIndex(
+                    SaveUnauthorizedOrigin.objects.values_list("url", flat=True)
+                ),
+            )
+        return _indexes[1], _indexes[2]
+
+
+def url_prefixes_changed(sender, **kwargs) -> None:
+    """Receiver of the signals sent when an URL prefix is saved or deleted."""
+    # invalidate indexes right away for the current transaction and once it
+    # is committed as other workers might have rebuilt them in between
+    invalidate_url_prefix_indexes()
+    transaction.on_commit(invalidate_url_prefix_indexes)
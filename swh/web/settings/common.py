@@ -240,7 +240,7 @@ for limiter_scope, limiter_conf in throttling["scopes"].items():
 
 REST_FRAMEWORK: Dict[str, Any] = {
     "DEFAULT_RENDERER_CLASSES": (
-        "rest_framework.renderers.JSONRenderer",
+        "swh.web.api.renderers.FastJSONRenderer",
         "swh.web.api.renderers.YAMLRenderer",
         "rest_framework.renderers.TemplateHTMLRenderer",
     ),
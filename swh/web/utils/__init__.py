@@ -3,15 +3,17 @@
 # License: GNU Affero General Public License version 3, or any later version
 # See top-level LICENSE file for more information
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 import functools
-import gzip
 import hashlib
 from importlib.metadata import version
 import json
 import os
 import re
-from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+import threading
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple
 import urllib.parse
 
 from docutils.core import publish_parts
@@ -40,7 +42,9 @@ from swh.web.auth.utils import (
     SWH_AMBASSADOR_PERMISSION,
 )
 from swh.web.config import get_config, oidc_enabled, search
+from swh.web.utils import cache_codecs
 from swh.web.utils.exc import BadInputExc, sentry_capture_exception
+from swh.web.utils.inprocess_cache import InProcessCache, copy_decoded
 
 DATATABLES_MAX_PAGE_SIZE = get_config().get("datatables_max_page_size", 1000)
 
@@ -415,63 +419,258 @@ def rst_to_html(rst: str, raw_enabled: bool = False) -> str:
 
 def _compute_final_cache_key(cache_key: str) -> str:
     key_prefix = get_config().get("instance_name", "localhost")
-    return f"swh.web.cache.internal.{key_prefix}.{cache_key}"
+    return (
+        f"swh.web.cache.internal.v{cache_codecs.CACHE_FORMAT_VERSION}"
+        f".{key_prefix}.{cache_key}"
+    )
+
+
+@functools.lru_cache()
+def inprocess_cache() -> Optional[InProcessCache]:
+    """Return the in-process cache of the current worker if it is enabled
+    in the ``inprocess_cache`` configuration entry, :const:`None` otherwise.
+
+    When enabled, values handled by :func:`cache_get`, :func:`cache_set` and
+    :func:`django_cache` are also stored decoded in a per-process LRU cache
+    bounded by memory size, which is looked up before the Django cache.
+    """
+    config = get_config().get("inprocess_cache", {})
+    if not config.get("enabled", False):
+        return None
+    return InProcessCache(
+        max_size=config.get("max_size", 64 * 1024 * 1024),
+        max_timeout=config.get("max_timeout", 60),
+    )
+
+
+def _cache_timeout(timeout: Optional[float]) -> Optional[float]:
+    return cache.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
 
 
 def cache_set(
     cache_key: str,
     obj: Any,
-    timeout: int = DEFAULT_TIMEOUT,
+    timeout: Optional[int] = DEFAULT_TIMEOUT,
     extra_encoders: Optional[List[Tuple[type, str, Callable]]] = None,
+    extra_decoders: Optional[Dict[str, Callable]] = None,
 ) -> None:
     """Set a value in django cache.
 
     For optimizing cache size, the value to cache is serialized to binary
-    using msgpack and then compressed with gzip.
+    using msgpack and then compressed with the codec set in configuration,
+    see :mod:`swh.web.utils.cache_codecs`.
 
     Args:
         cache_key: string key for the value to set in cache
         obj: value to store in cache
-        timeout: the duration in seconds after which the cache expires
+        timeout: the duration in seconds after which the cache expires,
+            :const:`None` means the value never expires
         extra_encoders: optional encoders for serializing types that are
             not default supported by msgpack, see :mod:`swh.core.api.serializers`
+        extra_decoders: optional decoders for deserializing types that are
+            not default supported by msgpack, used to decode the value put in
+            the in-process cache, if enabled
     """
-    payload = gzip.compress(msgpack_dumps(obj, extra_encoders=extra_encoders))
+    serialized = msgpack_dumps(obj, extra_encoders=extra_encoders)
+    payload = cache_codecs.compress(serialized)
+    final_cache_key = _compute_final_cache_key(cache_key)
+
+    if (l1_cache := inprocess_cache()) is not None:
+        # store the decoded value so in-process cache hits return the same
+        # types as django cache hits (lists instead of tuples for instance)
+        l1_cache.set(
+            final_cache_key,
+            msgpack_loads(serialized, extra_decoders=extra_decoders),
+            size=len(serialized),
+            timeout=_cache_timeout(timeout),
+        )
 
     try:
-        cache.set(_compute_final_cache_key(cache_key), payload, timeout=timeout)
+        cache.set(final_cache_key, payload, timeout=timeout)
     except Exception as exc:
         sentry_sdk.capture_exception(exc)
 
 
 def cache_get(
-    cache_key: str, extra_decoders: Optional[Dict[str, Callable]] = None
+    cache_key: str,
+    extra_decoders: Optional[Dict[str, Callable]] = None,
+    timeout: int = DEFAULT_TIMEOUT,
 ) -> Optional[Any]:
     """Get a value from the django cache.
 
     For optimizing cache size, values to cache are serialized to binary using
-    msgpack and then compressed with gzip.
+    msgpack and then compressed, see :mod:`swh.web.utils.cache_codecs`.
 
     Args:
         cache_key: string key for the value to get from cache
         extra_decoders: optional decoders for deserializing types that are
             not default supported by msgpack, see :mod:`swh.core.api.serializers`
+        timeout: the duration in seconds the value fetched from django cache
+            is kept in the in-process cache, if enabled
 
     Returns:
         the cached value or :const:`None` if it does not exist
     """
+    final_cache_key = _compute_final_cache_key(cache_key)
+    l1_cache = inprocess_cache()
+    if l1_cache is not None:
+        found, value = l1_cache.get(final_cache_key)
+        if found:
+            return copy_decoded(value)
+
     try:
-        payload = cache.get(_compute_final_cache_key(cache_key))
+        payload = cache.get(final_cache_key)
+        serialized = cache_codecs.decompress(payload) if payload else None
     except Exception as exc:
         sentry_sdk.capture_exception(exc)
-        payload = None
-    return (
-        msgpack_loads(gzip.decompress(payload), extra_decoders=extra_decoders)
-        if payload
-        else None
+        serialized = None
+    if not serialized:
+        return None
+
+    value = msgpack_loads(serialized, extra_decoders=extra_decoders)
+    if l1_cache is not None:
+        l1_cache.set(
+            final_cache_key,
+            copy_decoded(value),
+            size=len(serialized),
+            timeout=_cache_timeout(timeout),
+        )
+    return value
+
+
+_single_flight_stats_lock = threading.Lock()
+_single_flight_stats = {
+    "computations": 0,
+    "avoided_computations": 0,
+    "wait_timeouts": 0,
+}
+
+
+def _incr_single_flight_stat(stat: str) -> None:
+    with _single_flight_stats_lock:
+        _single_flight_stats[stat] += 1
+
+
+def single_flight_stats() -> Dict[str, int]:
+    """Return counters for the single-flight mode of :func:`django_cache`
+    in the current process: number of computations performed while holding
+    the lock, number of computations avoided by waiting for another worker
+    and number of waits that timed out."""
+    with _single_flight_stats_lock:
+        return dict(_single_flight_stats)
+
+
+def _single_flight_acquire(lock_key: str, lock_timeout: int) -> bool:
+    try:
+        return cache.add(lock_key, os.getpid(), timeout=lock_timeout)
+    except Exception as exc:
+        sentry_sdk.capture_exception(exc)
+        # compute the value if the cache is not reachable
+        return True
+
+
+def _single_flight_release(lock_key: str) -> None:
+    try:
+        cache.delete(lock_key)
+    except Exception as exc:
+        sentry_sdk.capture_exception(exc)
+
+
+def _single_flight_wait(
+    cache_key: str,
+    lock_key: str,
+    wait_timeout: int,
+    extra_decoders: Optional[Dict[str, Callable]],
+    timeout: int,
+) -> Optional[Any]:
+    deadline = time.monotonic() + wait_timeout
+    poll_interval = 0.02
+    while time.monotonic() < deadline:
+        time.sleep(poll_interval)
+        poll_interval = min(poll_interval * 2, 0.5)
+        ret = cache_get(cache_key, extra_decoders=extra_decoders, timeout=timeout)
+        if ret is not None:
+            _incr_single_flight_stat("avoided_computations")
+            return ret
+        try:
+            if cache.get(lock_key) is None:
+                # computation failed in the other worker
+                return None
+        except Exception:
+            return None
+    _incr_single_flight_stat("wait_timeouts")
+    return None
+
+
+_background_refresh_lock = threading.Lock()
+_background_refresh_pending: Set[str] = set()
+
+
+@functools.lru_cache()
+def _background_refresh_executor() -> ThreadPoolExecutor:
+    config = get_config().get("background_refresh", {})
+    return ThreadPoolExecutor(
+        max_workers=config.get("max_workers", 4),
+        thread_name_prefix="swh-web-background-refresh",
     )
 
 
+def refresh_in_background(
+    refresh_key: str, refresh: Callable[[], Any], lock_timeout: Optional[int] = None
+) -> bool:
+    """Execute a cache refresh function in a bounded pool of background threads.
+
+    Refreshes are deduplicated across workers using a short-lived lock key in
+    Django cache and the number of refreshes waiting for execution in the
+    current process is bounded by the ``max_pending`` value of the
+    ``background_refresh`` configuration entry, extra refreshes are dropped.
+
+    Args:
+        refresh_key: key identifying the cache entry to refresh
+        refresh: function computing the new value and putting it in cache
+        lock_timeout: number of seconds after which the lock deduplicating
+            the refresh expires, it must exceed the refresh duration and
+            defaults to the ``lock_timeout`` value of the
+            ``background_refresh`` configuration entry
+
+    Returns:
+        whether the refresh was submitted for execution
+    """
+    config = get_config().get("background_refresh", {})
+    with _background_refresh_lock:
+        if refresh_key in _background_refresh_pending or len(
+            _background_refresh_pending
+        ) >= config.get("max_pending", 64):
+            return False
+        _background_refresh_pending.add(refresh_key)
+
+    lock_key = _compute_final_cache_key(f"{refresh_key}_refresh_lock")
+    if lock_timeout is None:
+        lock_timeout = config.get("lock_timeout", 60)
+
+    def _refresh() -> None:
+        try:
+            if _single_flight_acquire(lock_key, lock_timeout):
+                try:
+                    refresh()
+                finally:
+                    _single_flight_release(lock_key)
+        except Exception as exc:
+            sentry_capture_exception(exc)
+        finally:
+            with _background_refresh_lock:
+                _background_refresh_pending.discard(refresh_key)
+
+    try:
+        _background_refresh_executor().submit(_refresh)
+    except RuntimeError:
+        # executor has been shut down
+        with _background_refresh_lock:
+            _background_refresh_pending.discard(refresh_key)
+        return False
+    return True
+
+
 def django_cache(
     timeout: int = DEFAULT_TIMEOUT,
     catch_exception: bool = False,
@@ -479,12 +678,15 @@ def django_cache(
     invalidate_cache_pred: Callable[[Any], bool] = lambda val: False,
     extra_encoders: Optional[List[Tuple[type, str, Callable]]] = None,
     extra_decoders: Optional[Dict[str, Callable]] = None,
+    single_flight: bool = False,
+    single_flight_timeout: int = 10,
+    stale_timeout: Optional[int] = None,
 ):
     """Decorator to put the result of a function call in Django cache,
     subsequent calls will directly return the cached value.
 
     For optimizing cache size, values to cache are serialized to binary using
-    msgpack and then compressed with gzip.
+    msgpack and then compressed, see :mod:`swh.web.utils.cache_codecs`.
 
     Args:
         timeout: The number of seconds value will be hold in cache
@@ -499,6 +701,18 @@ def django_cache(
             not default supported by msgpack, see :mod:`swh.core.api.serializers`
         extra_decoders: optional decoders for deserializing types that are
             not default supported by msgpack, see :mod:`swh.core.api.serializers`
+        single_flight: If :const:`True`, on a cache miss only one caller
+            computes the value at a time for a given set of parameters, using a
+            short-lived lock key in Django cache, while other callers, possibly
+            in other workers, wait for the value to be put in cache
+        single_flight_timeout: maximum number of seconds to wait for a value
+            computed by another caller in single-flight mode, the decorated
+            function is called once it is exceeded
+        stale_timeout: If provided, number of seconds after which a cached
+            value is considered stale: it is still returned (until ``timeout``
+            is reached) but the decorated function is called again in a
+            background thread to refresh it, see :func:`refresh_in_background`.
+            This also applies when ``invalidate_cache_pred`` fires.
 
     Returns:
         The returned value of the decorated function for the specified
@@ -518,7 +732,44 @@ def django_cache(
             func_args = args + (0,) + tuple(sorted(kwargs.items()))
             cache_key = hash_object((func.__module__, func.__name__))
             cache_key += hash_object(func_args)
-            ret = cache_get(cache_key, extra_decoders=extra_decoders)
+
+            def set_cache(value: Any) -> None:
+                cache_set(
+                    cache_key,
+                    (
+                        value
+                        if stale_timeout is None
+                        else [time.time() + stale_timeout, value]
+                    ),
+                    timeout=timeout,
+                    extra_encoders=extra_encoders,
+                    extra_decoders=extra_decoders,
+                )
+
+            ret = cache_get(cache_key, extra_decoders=extra_decoders, timeout=timeout)
+            if ret is not None and stale_timeout is not None:
+                fresh_until, ret = ret
+                if time.time() >= fresh_until or invalidate_cache_pred(ret):
+                    refresh_in_background(
+                        cache_key, lambda: set_cache(func(*args, **kwargs))
+                    )
+                return ret
+            lock_key = None
+            if ret is None and single_flight:
+                lock_key = _compute_final_cache_key(f"{cache_key}_lock")
+                if _single_flight_acquire(lock_key, single_flight_timeout):
+                    _incr_single_flight_stat("computations")
+                else:
+                    ret = _single_flight_wait(
+                        cache_key,
+                        lock_key,
+                        single_flight_timeout,
+                        extra_decoders,
+                        timeout,
+                    )
+                    if ret is not None and stale_timeout is not None:
+                        ret = ret[1]
+                    lock_key = None
             if ret is None or invalidate_cache_pred(ret):
                 try:
                     ret = func(*args, **kwargs)
@@ -529,12 +780,10 @@ def django_cache(
                     else:
                         raise
                 else:
-                    cache_set(
-                        cache_key,
-                        ret,
-                        timeout=timeout,
-                        extra_encoders=extra_encoders,
-                    )
+                    set_cache(ret)
+                finally:
+                    if lock_key is not None:
+                        _single_flight_release(lock_key)
             return ret
 
         return wrapper
@@ -4,14 +4,29 @@
 # See top-level LICENSE file for more information
 
 import base64
+import bisect
 from collections import defaultdict
 import datetime
+import hashlib
 import itertools
 import json
 from json import JSONDecodeError
+import operator
 import os
 import re
-from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+import threading
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 import attr
 import yaml
@@ -21,7 +36,7 @@ from swh.core.api.classes import _stream_results
 from swh.model import hashutil
 from swh.model.exceptions import ValidationError
 from swh.model.hashutil import hash_to_bytes, hash_to_hex
-from swh.model.model import ExtID, MetadataAuthority, Origin, Revision
+from swh.model.model import DirectoryEntry, ExtID, MetadataAuthority, Origin, Revision
 from swh.model.swhids import CoreSWHID, ExtendedSWHID, ObjectType, QualifiedSWHID
 from swh.objstorage.interface import objid_from_dict
 from swh.storage.algos import diff, revisions_walker
@@ -30,7 +45,14 @@ from swh.storage.algos.swhid import known_swhids
 from swh.storage.interface import ListOrder, OriginVisitWithStatuses
 from swh.vault.exc import NotFoundExc as VaultNotFoundExc
 from swh.web import config
-from swh.web.utils import converters, demangle_url, django_cache, query
+from swh.web.utils import (
+    cache_get,
+    cache_set,
+    converters,
+    demangle_url,
+    django_cache,
+    query,
+)
 from swh.web.utils.exc import BadInputExc, NotFoundExc
 from swh.web.utils.typing import (
     IntrinsicMetadataFile,
@@ -205,18 +227,25 @@ def _origin_info(origin: Origin, with_visit_types: bool = True) -> OriginInfo:
     return converters.from_origin(origin_dict)
 
 
-def lookup_origin(origin_url: str, lookup_similar_urls: bool = True) -> OriginInfo:
-    """Return information about the origin matching dict origin.
+_origin_lookup_stats_lock = threading.Lock()
+_origin_lookup_stats = {"hits": 0, "not_found_hits": 0, "misses": 0}
 
-    Args:
-        origin_url: URL of origin
-        lookup_similar_urls: if :const:`True`, lookup origin with and
-            without trailing slash in its URL
 
-    Returns:
-        origin information as dict.
+def _incr_origin_lookup_stat(stat: str) -> None:
+    with _origin_lookup_stats_lock:
+        _origin_lookup_stats[stat] += 1
 
-    """
+
+def origin_lookup_stats() -> Dict[str, int]:
+    """Return counters for the resolution of origin URLs by :func:`lookup_origin`
+    in the current process: number of URLs resolved from cache, number of URLs
+    known from cache to match no origin and number of URLs resolved by querying
+    the archive."""
+    with _origin_lookup_stats_lock:
+        return dict(_origin_lookup_stats)
+
+
+def _origin_url_variants(origin_url: str, lookup_similar_urls: bool) -> List[str]:
     origin_urls = [origin_url]
     if origin_url and lookup_similar_urls:
         # handle case when user provided an origin url with a trailing
@@ -239,12 +268,58 @@ def lookup_origin(origin_url: str, lookup_similar_urls: bool = True) -> OriginIn
         # of origin URLs to ensure origin can be found in the storage
         origin_urls.extend([url.replace(" ", "%20") for url in origin_urls])
 
-    for url in origin_urls:
-        origins = config.storage().origin_get([url])
-        if origins and origins[0]:
-            return _origin_info(origins[0])
-    else:
+    return list(dict.fromkeys(origin_urls))
+
+
+def _origin_lookup_cache_key(origin_url: str, lookup_similar_urls: bool) -> str:
+    # origin URLs can contain characters not allowed in cache keys
+    url_hash = hashlib.sha1(origin_url.encode(), usedforsecurity=False).hexdigest()
+    return f"origin_lookup_{url_hash}_{int(lookup_similar_urls)}"
+
+
+def lookup_origin(origin_url: str, lookup_similar_urls: bool = True) -> OriginInfo:
+    """Return information about the origin matching dict origin.
+
+    The URL of the archived origin matching the provided one is kept in cache,
+    as well as the absence of matching origin for a shorter time, whose
+    durations are set in the ``origin_lookup_cache`` configuration entry.
+
+    Args:
+        origin_url: URL of origin
+        lookup_similar_urls: if :const:`True`, lookup origin with and
+            without trailing slash in its URL
+
+    Returns:
+        origin information as dict.
+
+    """
+    cache_key = _origin_lookup_cache_key(origin_url, lookup_similar_urls)
+    cached = cache_get(cache_key)
+    if cached is not None:
+        if cached["url"] is None:
+            _incr_origin_lookup_stat("not_found_hits")
+            raise NotFoundExc(f"Origin with url {origin_url} not found!")
+        _incr_origin_lookup_stat("hits")
+        return _origin_info(Origin(url=cached["url"]))
+
+    _incr_origin_lookup_stat("misses")
+    cache_config = config.get_config()["origin_lookup_cache"]
+    # all URL variants are looked up in a single query, the first one in
+    # order of preference matching an archived origin is selected
+    origin = next(
+        filter(
+            None,
+            config.storage().origin_get(
+                _origin_url_variants(origin_url, lookup_similar_urls)
+            ),
+        ),
+        None,
+    )
+    if origin is None:
+        cache_set(cache_key, {"url": None}, timeout=cache_config["not_found_timeout"])
         raise NotFoundExc(f"Origin with url {origin_url} not found!")
+    cache_set(cache_key, {"url": origin.url}, timeout=cache_config["timeout"])
+    return _origin_info(origin)
 
 
 def lookup_origins(
@@ -572,6 +647,86 @@ def lookup_origin_intrinsic_metadata(
     return result
 
 
+_intrinsic_citation_metadata_file_names = [
+    "codemeta.json",
+    "CODEMETA.json",
+    "citation.cff",
+    "CITATION.cff",
+]
+
+
+@django_cache()
+def _get_directory_intrinsic_citation_metadata_files(
+    directory_id: str,
+    max_top_level_dir_recurse: int,
+) -> Optional[List[Dict[str, Any]]]:
+    """Find the intrinsic metadata files of a directory, from a single listing
+    of each traversed directory, and fetch their bytes.
+
+    As directories are immutable, the result is cached for each directory and
+    only the raw bytes of the files are put in cache as the parsed metadata
+    could contain values the cache serializer does not handle (e.g. dates).
+
+    Returns:
+        None if the directory is missing, otherwise the list of metadata files,
+        with their names, sha1_git and bytes, in the order of
+        :data:`_intrinsic_citation_metadata_file_names`
+    """
+    storage = config.storage()
+    directory_entries: List[DirectoryEntry] = []
+    page_token: Optional[bytes] = None
+    while True:
+        entries_page = storage.directory_get_entries(
+            hash_to_bytes(directory_id), page_token=page_token
+        )
+        if entries_page is None:
+            return None
+        directory_entries += entries_page.results
+        # directory entries are paginated by name
+        page_token = cast(Optional[bytes], entries_page.next_page_token)
+        if page_token is None:
+            break
+
+    entries = {entry.name: entry for entry in directory_entries}
+    metadata_entries = [
+        entries[name.encode()]
+        for name in _intrinsic_citation_metadata_file_names
+        if name.encode() in entries and entries[name.encode()].type == "file"
+    ]
+
+    if not metadata_entries:
+        if (
+            max_top_level_dir_recurse > 0
+            and len(directory_entries) == 1
+            and directory_entries[0].type == "dir"
+        ):
+            # handle top level directory edge case
+            return _get_directory_intrinsic_citation_metadata_files(
+                hash_to_hex(directory_entries[0].target),
+                max_top_level_dir_recurse - 1,
+            )
+        return []
+
+    contents = storage.content_get(
+        [entry.target for entry in metadata_entries], algo="sha1_git"
+    )
+    metadata_files = []
+    for entry, content in zip(metadata_entries, contents):
+        metadata_file_id = hash_to_hex(entry.target)
+        data = None
+        if content is not None:
+            data = storage.content_get_data(objid_from_dict(content.hashes()))
+        if data is None:
+            raise NotFoundExc(
+                "Bytes of content with sha1_git checksum equals "
+                f"to {metadata_file_id} are not available!"
+            )
+        metadata_files.append(
+            {"name": entry.name.decode(), "id": metadata_file_id, "data": data}
+        )
+    return metadata_files
+
+
 def _lookup_directory_intrinsic_citation_metadata(
     directory_id: str,
     max_top_level_dir_recurse: int = 3,
@@ -594,41 +749,23 @@ def _lookup_directory_intrinsic_citation_metadata(
             or no metadata could be found
         BadInputExc: when the metadata files could not be decoded
     """
-    metadata_files_info = []
-    metadata_file_paths = [
-        "codemeta.json",
-        "CODEMETA.json",
-        "citation.cff",
-        "CITATION.cff",
-    ]
-    for path in metadata_file_paths:
-        try:
-            metadata_file_info = lookup_directory_with_path(directory_id, path)
-            metadata_files_info.append(metadata_file_info)
-        except NotFoundExc:
-            pass
-
-    if not metadata_files_info:
-        if max_top_level_dir_recurse > 0:
-            dir_entries = list(lookup_directory(directory_id))
-            if len(dir_entries) == 1 and dir_entries[0]["type"] == "dir":
-                # handle top level directory edge case
-                return _lookup_directory_intrinsic_citation_metadata(
-                    dir_entries[0]["target"], max_top_level_dir_recurse - 1
-                )
+    metadata_files_data = _get_directory_intrinsic_citation_metadata_files(
+        directory_id, max_top_level_dir_recurse
+    )
+    if metadata_files_data is None:
+        raise NotFoundExc("Directory with sha1_git %s not found" % directory_id)
+    if not metadata_files_data:
         raise NotFoundExc(
-            f"No metadata file ({', '.join(metadata_file_paths)}) in directory"
+            "No metadata file "
+            f"({', '.join(_intrinsic_citation_metadata_file_names)}) in directory"
             f" with sha1_git {directory_id} found."
         )
 
     metadata_files = []
-    for metadata_file_info in metadata_files_info:
-        metadata_file_id = metadata_file_info["target"]
-        metadata_file_name = metadata_file_info["name"]
+    for metadata_file_data in metadata_files_data:
+        metadata_file_id = metadata_file_data["id"]
+        metadata_file_name = metadata_file_data["name"]
         metadata_file_type = metadata_file_name.lower()
-        metadata_file_content = lookup_content(
-            f"sha1_git:{metadata_file_id}", with_data=True
-        )
         metadata_file_object = IntrinsicMetadataFile(
             type=metadata_file_type,
             name=metadata_file_name,
@@ -639,12 +776,10 @@ def _lookup_directory_intrinsic_citation_metadata(
 
         try:
             if metadata_file_type == IntrinsicMetadataFiletype.CODEMETA.value:
-                metadata_file_object["content"] = json.loads(
-                    metadata_file_content["data"]
-                )
+                metadata_file_object["content"] = json.loads(metadata_file_data["data"])
             elif metadata_file_type == IntrinsicMetadataFiletype.CFF.value:
                 metadata_file_object["content"] = yaml.safe_load(
-                    metadata_file_content["data"]
+                    metadata_file_data["data"]
                 )
         except (JSONDecodeError, YAMLError) as e:
             metadata_file_object["parsing_error"] = (
@@ -805,6 +940,91 @@ def lookup_directory(sha1_git: str) -> Iterable[Dict[str, Any]]:
     return map(converters.from_directory_entry, directory_entries)
 
 
+DIRECTORY_ENTRIES_PAGE_SIZE = 1000
+
+
+def _directory_entries_page_key(sha1_git: str, page_size: int, page: int) -> str:
+    return f"directory_{sha1_git}_entries_{page_size}_{page}"
+
+
+def _cache_directory_entries(sha1_git: str, page_size: int) -> List[Dict[str, Any]]:
+    """
+    List the entries of a directory sorted by name and put them in cache by
+    pages of ``page_size`` entries, as the whole listing of a large directory
+    can exceed the maximum size of a cache entry.
+    """
+    sha1_git_bin = _to_sha1_bin(sha1_git)
+    _check_directory_exists(sha1_git, sha1_git_bin)
+    entries = sorted(
+        config.storage().directory_ls(sha1_git_bin), key=operator.itemgetter("name")
+    )
+    for page, start in enumerate(range(0, len(entries), page_size)):
+        cache_set(
+            _directory_entries_page_key(sha1_git, page_size, page),
+            entries[start : start + page_size],
+        )
+    return entries
+
+
+@django_cache(single_flight=True)
+def _get_directory_entries_index(sha1_git: str, page_size: int) -> List[bytes]:
+    """
+    Put the pages of sorted entries of a directory in cache and return
+    the name of the first entry of each page.
+    """
+    entries = _cache_directory_entries(sha1_git, page_size)
+    return [entry["name"] for entry in entries[::page_size]]
+
+
+def lookup_directory_entries(
+    sha1_git: str, entries_from: bytes = b"", entries_count: int = 1000
+) -> Tuple[List[Dict[str, Any]], Optional[bytes]]:
+    """Return a page of the entries of a directory, sorted by name.
+
+    The directory entries are sorted once and put in cache by pages along
+    with the name of the first entry of each page, so that walking a large
+    directory page after page does not list it again for each page.
+
+    Args:
+        sha1_git: sha1_git identifier of the directory
+        entries_from: optional parameter used to skip entries whose name
+            is lesser than it before returning them
+        entries_count: maximum number of entries to return
+
+    Raises:
+        swh.web.utils.exc.NotFoundExc: if the directory is not found
+
+    Returns:
+        A tuple whose first member is the list of directory entries and second
+        member the raw name of the first entry of the next page, or
+        :const:`None` if there is no next page.
+    """
+    empty_dir_sha1 = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+    if sha1_git == empty_dir_sha1:
+        return [], None
+
+    page_size = DIRECTORY_ENTRIES_PAGE_SIZE
+    index = _get_directory_entries_index(sha1_git, page_size)
+    entries: List[Dict[str, Any]] = []
+    page = max(bisect.bisect_right(index, entries_from) - 1, 0)
+    while page < len(index) and len(entries) <= entries_count:
+        page_entries = cache_get(_directory_entries_page_key(sha1_git, page_size, page))
+        if page_entries is None:
+            # page evicted from cache, list the directory again
+            page_entries = _cache_directory_entries(sha1_git, page_size)
+            entries = []
+            page = len(index)
+        else:
+            page += 1
+        entries += (entry for entry in page_entries if entry["name"] >= entries_from)
+    entries = entries[: entries_count + 1]
+    next_entry = None
+    if len(entries) > entries_count:
+        next_entry = entries.pop()["name"]
+    return list(map(converters.from_directory_entry, entries)), next_entry
+
+
 def lookup_directory_with_path(sha1_git: str, path: str) -> Dict[str, Any]:
     """Return directory information for entry with specified path w.r.t.
     root directory pointed by sha1_git
@@ -1870,9 +2090,15 @@ def vault_progress(bundle_type: str, swhid: CoreSWHID):
     return _vault_request(config.vault().progress, bundle_type, swhid)
 
 
-def diff_revision(rev_id):
+def diff_revision(rev_id: str) -> List[Dict[str, Any]]:
     """Get the list of file changes (insertion / deletion / modification /
     renaming) for a particular revision.
+
+    Args:
+        rev_id: hexadecimal representation of a revision identifier
+
+    Returns:
+        the list of file changes sorted by path
     """
     rev_sha1_git_bin = _to_sha1_bin(rev_id)
 
@@ -1897,7 +2123,8 @@ class _RevisionsWalkerProxy(object):
     swh-storage and performing needed conversions.
     """
 
-    def __init__(self, rev_walker_type, rev_start, *args, **kwargs):
+    def __init__(self, rev_walker_type, rev_start, *args, ids_only=False, **kwargs):
+        self.ids_only = ids_only
         rev_start_bin = hashutil.hash_to_bytes(rev_start)
         self.revisions_walker = revisions_walker.get_revisions_walker(
             rev_walker_type, config.storage(), rev_start_bin, *args, **kwargs
@@ -1907,13 +2134,16 @@ class _RevisionsWalkerProxy(object):
         return self.revisions_walker.export_state()
 
     def __next__(self):
-        return converters.from_revision(next(self.revisions_walker))
+        rev = next(self.revisions_walker)
+        if self.ids_only:
+            return rev["id"]
+        return converters.from_revision(rev)
 
     def __iter__(self):
         return self
 
 
-def get_revisions_walker(rev_walker_type, rev_start, *args, **kwargs):
+def get_revisions_walker(rev_walker_type, rev_start, *args, ids_only=False, **kwargs):
     """
     Utility function to instantiate a revisions walker of a given type,
     see :mod:`swh.storage.algos.revisions_walker`.
@@ -1925,13 +2155,17 @@ def get_revisions_walker(rev_walker_type, rev_start, *args, **kwargs):
         rev_start (str): hexadecimal representation of a revision identifier
         args (list): position arguments to pass to the revisions walker
             constructor
+        ids_only (bool): if :const:`True`, the walker yields binary revision
+            identifiers instead of revision data
         kwargs (dict): keyword arguments to pass to the revisions walker
             constructor
 
     """
     # first check if the provided revision is valid
     lookup_revision(rev_start)
-    return _RevisionsWalkerProxy(rev_walker_type, rev_start, *args, **kwargs)
+    return _RevisionsWalkerProxy(
+        rev_walker_type, rev_start, *args, ids_only=ids_only, **kwargs
+    )
 
 
 def lookup_object(object_type: ObjectType, object_id: str) -> Dict[str, Any]:
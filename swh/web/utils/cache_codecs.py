@@ -0,0 +1,187 @@
+# Copyright (C) 2026  The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU Affero General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+"""Compression codecs for values stored in django cache.
+
+Cache payloads are prefixed by a header byte identifying the codec used to
+compress them. Payloads produced before codecs were introduced are plain
+gzip streams that cannot be read by the codecs, and workers of previous
+swh-web versions cannot read payloads with a header byte. Both are thus
+stored under different cache keys, see :const:`CACHE_FORMAT_VERSION`.
+"""
+
+from collections import defaultdict
+import functools
+import gzip
+import logging
+import threading
+import time
+from typing import Callable, Dict
+
+from swh.web.config import get_config
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 2
+"""Version of the format of cache payloads, part of the cache keys so workers
+using different formats, for instance during a rolling deployment, do not
+read each other payloads. It must be incremented when the format changes."""
+
+
+class UnknownCodecError(ValueError):
+    """Cache payload was compressed with a codec that is not available."""
+
+
+class CacheCodec:
+    """A compression codec for cache payloads.
+
+    Args:
+        name: name of the codec as used in configuration
+        header: byte value prefixing payloads compressed with that codec
+        compress: function compressing bytes
+        decompress: function decompressing bytes
+    """
+
+    def __init__(
+        self,
+        name: str,
+        header: int,
+        compress: Callable[[bytes], bytes],
+        decompress: Callable[[bytes], bytes],
+    ):
+        self.name = name
+        self.header = bytes([header])
+        self._compress = compress
+        self._decompress = decompress
+
+    def compress(self, data: bytes) -> bytes:
+        start = time.perf_counter()
+        payload = self.header + self._compress(data)
+        _record_timing(self.name, "compress", start, len(data), len(payload))
+        return payload
+
+    def decompress(self, payload: bytes) -> bytes:
+        start = time.perf_counter()
+        data = self._decompress(payload[1:])
+        _record_timing(self.name, "decompress", start, len(data), len(payload))
+        return data
+
+
+_codecs_by_name: Dict[str, CacheCodec] = {}
+_codecs_by_header: Dict[bytes, CacheCodec] = {}
+
+
+def register_codec(codec: CacheCodec) -> None:
+    """Make a codec available for compressing and decompressing cache
+    payloads."""
+    _codecs_by_name[codec.name] = codec
+    _codecs_by_header[codec.header] = codec
+
+
+register_codec(CacheCodec("none", 0, bytes, bytes))
+register_codec(CacheCodec("gzip", 1, gzip.compress, gzip.decompress))
+
+try:
+    import zstandard
+
+    # zstandard compressors and decompressors must not be used concurrently
+    # by multiple threads, keep one of each per thread
+    _zstd_contexts = threading.local()
+
+    def _zstd_compress(data: bytes) -> bytes:
+        if not hasattr(_zstd_contexts, "compressor"):
+            _zstd_contexts.compressor = zstandard.ZstdCompressor()
+        return _zstd_contexts.compressor.compress(data)
+
+    def _zstd_decompress(payload: bytes) -> bytes:
+        if not hasattr(_zstd_contexts, "decompressor"):
+            _zstd_contexts.decompressor = zstandard.ZstdDecompressor()
+        return _zstd_contexts.decompressor.decompress(payload)
+
+    register_codec(CacheCodec("zstd", 2, _zstd_compress, _zstd_decompress))
+except ImportError:
+    pass
+
+try:
+    import lz4.frame
+
+    register_codec(CacheCodec("lz4", 3, lz4.frame.compress, lz4.frame.decompress))
+except ImportError:
+    pass
+
+
+def available_codecs() -> Dict[str, CacheCodec]:
+    """Return the codecs that can be used in the current environment,
+    indexed by name."""
+    return dict(_codecs_by_name)
+
+
+@functools.lru_cache()
+def _configured_codec() -> CacheCodec:
+    config = get_config().get("cache_compression", {})
+    codec_name = config.get("codec", "gzip")
+    if codec_name not in _codecs_by_name:
+        logger.warning(
+            "Cache compression codec %s is not available, using gzip instead",
+            codec_name,
+        )
+        codec_name = "gzip"
+    return _codecs_by_name[codec_name]
+
+
+def compress(data: bytes) -> bytes:
+    """Compress serialized data before putting it in cache.
+
+    The codec set in the ``cache_compression`` configuration entry is used,
+    unless data size is lower than the ``min_size`` threshold in which case
+    data is stored uncompressed as it would not be worth it.
+    """
+    min_size = get_config().get("cache_compression", {}).get("min_size", 0)
+    if len(data) < min_size:
+        return _codecs_by_name["none"].compress(data)
+    return _configured_codec().compress(data)
+
+
+def decompress(payload: bytes) -> bytes:
+    """Decompress a payload fetched from cache.
+
+    Raises:
+        UnknownCodecError: payload codec is not available
+    """
+    codec = _codecs_by_header.get(payload[:1])
+    if codec is None:
+        raise UnknownCodecError(f"Unknown cache codec header {payload[:1]!r}")
+    return codec.decompress(payload)
+
+
+_timings_lock = threading.Lock()
+_timings: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+
+def _record_timing(
+    codec: str, operation: str, start: float, raw_size: int, payload_size: int
+) -> None:
+    elapsed = time.perf_counter() - start
+    with _timings_lock:
+        timings = _timings[codec]
+        timings[f"{operation}_calls"] += 1
+        timings[f"{operation}_seconds"] += elapsed
+        timings[f"{operation}_raw_bytes"] += raw_size
+        timings[f"{operation}_payload_bytes"] += payload_size
+
+
+def codec_timings(reset: bool = False) -> Dict[str, Dict[str, float]]:
+    """Return per codec statistics for the current process: number of
+    compress/decompress calls, time spent in seconds and sizes in bytes of
+    processed raw data and compressed payloads.
+
+    Args:
+        reset: if :const:`True`, reset statistics after returning them
+    """
+    with _timings_lock:
+        timings = {codec: dict(values) for codec, values in _timings.items()}
+        if reset:
+            _timings.clear()
+    return timings
@@ -14,9 +14,12 @@ from swh.model import hashutil
 from swh.model.model import (
     OriginVisit,
     OriginVisitStatus,
+    Person,
     RawExtrinsicMetadata,
     Release,
     Revision,
+    SnapshotBranch,
+    SnapshotTargetType,
     TimestampWithTimezone,
 )
 from swh.model.swhids import ObjectType
@@ -194,6 +197,43 @@ def from_swh(
     return new_dict
 
 
+# The converters below are called for each object of API responses, the most
+# frequently used ones produce the same output as from_swh with a single pass
+# over the object attributes or keys instead of a generic recursive one.
+
+
+def _hash_to_hex(value: Any) -> Any:
+    return value.hex() if isinstance(value, bytes) else value
+
+
+def _convert_hash(value: Any) -> Any:
+    """Convert a hash, or a structure holding hashes, to hexadecimal strings."""
+    if isinstance(value, bytes):
+        return value.hex()
+    return fmap(_hash_to_hex, value)
+
+
+def _decode_bytes(value: Any) -> Any:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def _set_decoded(converted: Dict[str, Any], key: str, value: Any) -> None:
+    """Decode bytes, or a structure holding bytes, and set the result under key
+    in converted dict, decoding failures are reported as in from_swh."""
+    try:
+        if isinstance(value, bytes):
+            converted[key] = value.decode("utf-8")
+        else:
+            converted[key] = fmap(_decode_bytes, value)
+    except UnicodeDecodeError:
+        converted.setdefault("decoding_failures", []).append(key)
+        converted[key] = fmap(decode_with_escape, value)
+
+
+def _convert_content_status(status: Optional[str]) -> Optional[str]:
+    return "absent" if status == "hidden" else status
+
+
 def from_origin(origin: Mapping[str, Any]) -> OriginInfo:
     """Convert from a swh origin to an origin dictionary."""
     return from_swh(origin, blocked={"id"})
@@ -260,6 +300,43 @@ def convert_metadata(metadata):
     return json.loads(json.dumps(metadata, cls=SWHMetadataEncoder))
 
 
+def _from_person(person: Optional[Person]) -> Optional[Dict[str, Any]]:
+    if person is None:
+        return None
+    converted: Dict[str, Any] = {}
+    _set_decoded(converted, "fullname", person.fullname)
+    _set_decoded(converted, "name", person.name)
+    _set_decoded(converted, "email", person.email)
+    return converted
+
+
+def _from_date(date: Optional[TimestampWithTimezone]) -> Optional[str]:
+    return date.to_datetime().isoformat() if date is not None else None
+
+
+def _from_revision_model(revision: Revision) -> Dict[str, Any]:
+    # same keys, in the same order, as Revision.to_dict
+    converted: Dict[str, Any] = {}
+    _set_decoded(converted, "message", revision.message)
+    converted["author"] = _from_person(revision.author)
+    converted["committer"] = _from_person(revision.committer)
+    converted["date"] = _from_date(revision.date)
+    converted["committer_date"] = _from_date(revision.committer_date)
+    converted["type"] = revision.type.value
+    converted["directory"] = revision.directory.hex()
+    converted["synthetic"] = revision.synthetic
+    converted["metadata"] = convert_metadata(
+        revision.metadata.to_dict() if revision.metadata is not None else None
+    )
+    converted["parents"] = tuple(parent.hex() for parent in revision.parents)
+    converted["id"] = revision.id.hex()
+    _set_decoded(converted, "extra_headers", revision.extra_headers)
+    if revision.raw_manifest is not None:
+        converted["raw_manifest"] = revision.raw_manifest
+    converted["merge"] = len(revision.parents) > 1
+    return converted
+
+
 def from_revision(revision: Union[Dict[str, Any], Revision]) -> Dict[str, Any]:
     """Convert swh revision model object to a json serializable revision dictionary.
 
@@ -277,11 +354,9 @@ def from_revision(revision: Union[Dict[str, Any], Revision]) -> Dict[str, Any]:
 
     """
     if isinstance(revision, Revision):
-        revision_d = revision.to_dict()
-    else:
-        revision_d = revision
+        return _from_revision_model(revision)
     revision_d = from_swh(
-        revision_d,
+        revision,
         hashess={"id", "directory", "parents", "children"},
         bytess={"name", "fullname", "email", "extra_headers", "message"},
         convert={"metadata"},
@@ -308,15 +383,33 @@ def from_raw_extrinsic_metadata(
     )
 
 
+_CONTENT_HASHES = frozenset({"sha1", "sha1_git", "sha256", "blake2s256"})
+
+
 def from_content(content):
     """Convert swh content to serializable content dictionary."""
-    return from_swh(
-        content,
-        hashess={"sha1", "sha1_git", "sha256", "blake2s256"},
-        blocked={"ctime"},
-        convert={"status"},
-        convert_fn=lambda v: "absent" if v == "hidden" else v,
-    )
+    if not content:
+        return content
+    converted = {}
+    for key, value in content.items():
+        if key == "ctime":
+            continue
+        if key == "status":
+            converted[key] = _convert_content_status(value)
+        elif isinstance(value, dict):
+            converted[key] = from_swh(
+                value,
+                hashess=_CONTENT_HASHES,
+                blocked={"ctime"},
+                convert={"status"},
+                convert_fn=_convert_content_status,
+            )
+        elif key in _CONTENT_HASHES:
+            converted[key] = _convert_hash(value)
+        else:
+            converted[key] = value
+    _group_checksums(converted)
+    return converted
 
 
 def from_person(person):
@@ -361,30 +454,65 @@ def from_snapshot(snapshot):
     return sv
 
 
+def _from_snapshot_branch(branch: Optional[SnapshotBranch]) -> Optional[Dict[str, str]]:
+    if branch is None:
+        return None
+    if branch.target_type == SnapshotTargetType.ALIAS:
+        # alias target existing branch names, not a sha1
+        target = decode_with_escape(branch.target)
+    else:
+        target = branch.target.hex()
+    return {"target": target, "target_type": branch.target_type.value}
+
+
 def from_partial_branches(branches: PartialBranches):
     """Convert PartialBranches to serializable partial snapshot dictionary"""
-    return from_snapshot(
-        {
-            "id": branches["id"],
-            "branches": {
-                branch_name: branch.to_dict() if branch else None
-                for (branch_name, branch) in branches["branches"].items()
-            },
-            "next_branch": branches["next_branch"],
-        }
-    )
+    converted: Dict[str, Any] = {
+        "id": _convert_hash(branches["id"]),
+        "branches": {
+            decode_with_escape(branch_name): _from_snapshot_branch(branch)
+            for branch_name, branch in branches["branches"].items()
+        },
+    }
+    _set_decoded(converted, "next_branch", branches["next_branch"])
+    return converted
+
+
+_DIRECTORY_ENTRY_HASHES = frozenset(
+    {"dir_id", "sha1_git", "sha1", "sha256", "blake2s256", "target"}
+)
+_DIRECTORY_ENTRY_REMOVABLES_IF_EMPTY = frozenset(
+    {"sha1", "sha1_git", "sha256", "blake2s256", "status"}
+)
 
 
 def from_directory_entry(dir_entry):
     """Convert swh directory to serializable directory dictionary."""
-    return from_swh(
-        dir_entry,
-        hashess={"dir_id", "sha1_git", "sha1", "sha256", "blake2s256", "target"},
-        bytess={"name"},
-        removables_if_empty={"sha1", "sha1_git", "sha256", "blake2s256", "status"},
-        convert={"status"},
-        convert_fn=lambda v: "absent" if v == "hidden" else v,
-    )
+    if not dir_entry:
+        return dir_entry
+    converted = {}
+    for key, value in dir_entry.items():
+        if not value and key in _DIRECTORY_ENTRY_REMOVABLES_IF_EMPTY:
+            continue
+        if key == "status":
+            converted[key] = _convert_content_status(value)
+        elif isinstance(value, dict):
+            converted[key] = from_swh(
+                value,
+                hashess=_DIRECTORY_ENTRY_HASHES,
+                bytess={"name"},
+                removables_if_empty=_DIRECTORY_ENTRY_REMOVABLES_IF_EMPTY,
+                convert={"status"},
+                convert_fn=_convert_content_status,
+            )
+        elif key in _DIRECTORY_ENTRY_HASHES:
+            converted[key] = _convert_hash(value)
+        elif key == "name":
+            _set_decoded(converted, key, value)
+        else:
+            converted[key] = value
+    _group_checksums(converted)
+    return converted
 
 
 def from_filetype(content_entry):
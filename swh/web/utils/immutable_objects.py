@@ -0,0 +1,185 @@
+# Copyright (C) 2026  The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU Affero General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+"""HTTP caching of the views serving immutable archived objects.
+
+Archived objects addressed by an intrinsic identifier (a SWHID or a checksum)
+never change, so the responses of views serving them can be cached without
+limit by clients and proxies. Such views are declared through the
+``immutable_object`` parameter of :func:`swh.web.api.apiurls.api_route` and
+:func:`swh.web.browse.browseurls.browse_route`, a function computing the
+identifier of the served object from the view arguments.
+
+Successful responses of these views get a strong ETag derived from that
+identifier and a far-future ``Cache-Control`` header. Conditional requests
+whose ``If-None-Match`` header matches the ETag are answered with a 304
+response before the view is called, so without any archive lookup. Views
+handling conditional requests themselves must use the same ETag, see
+:func:`request_immutable_object_etag`.
+Error responses are left untouched, as an object missing from the archive
+can be added later.
+"""
+
+import functools
+import hashlib
+from importlib.metadata import version
+from typing import Any, Callable, Optional
+
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from swh.model.swhids import ObjectType
+from swh.web.config import get_config
+
+ObjectIdentifier = Callable[..., str]
+"""Function computing the identifier of the object served by a view from the
+keyword arguments of that view."""
+
+
+def swhid_from_hash_arg(object_type: ObjectType, arg_name: str) -> ObjectIdentifier:
+    """Identify the object served by a view by the SWHID built from a view
+    argument holding a hexadecimal object identifier.
+
+    Args:
+        object_type: type of the served object
+        arg_name: name of the view argument holding the object identifier
+    """
+
+    def object_identifier(**kwargs: Any) -> str:
+        return f"swh:1:{object_type.value}:{kwargs[arg_name]}"
+
+    return object_identifier
+
+
+def content_from_checksum_arg(arg_name: str) -> ObjectIdentifier:
+    """Identify the content served by a view by a view argument holding a
+    ``[(hash_type):](hash)`` content checksum, the SWHID of the content is
+    used when the ``sha1_git`` checksum is provided.
+
+    Args:
+        arg_name: name of the view argument holding the content checksum
+    """
+
+    def object_identifier(**kwargs: Any) -> str:
+        hash_type, _, checksum = kwargs[arg_name].rpartition(":")
+        if hash_type == "sha1_git":
+            return f"swh:1:cnt:{checksum}"
+        return f"{hash_type or 'sha1'}:{checksum}"
+
+    return object_identifier
+
+
+def swhid_from_arg(arg_name: str) -> ObjectIdentifier:
+    """Identify the object served by a view by a view argument holding its SWHID.
+
+    Args:
+        arg_name: name of the view argument holding the SWHID
+    """
+
+    def object_identifier(**kwargs: Any) -> str:
+        return str(kwargs[arg_name])
+
+    return object_identifier
+
+
+@functools.lru_cache()
+def _swh_web_version() -> str:
+    return version("swh.web")
+
+
+def immutable_object_etag(request: HttpRequest, object_identifier: str) -> str:
+    """Compute the strong ETag of a response serving an immutable object.
+
+    Besides the identifier of the object, the response depends on the requested
+    URL, on the negotiated media type and on the swh-web version, a digest of
+    those is thus appended to the identifier.
+
+    Args:
+        request: input HTTP request
+        object_identifier: identifier of the served object
+
+    Returns:
+        The quoted ETag
+    """
+    digest = hashlib.sha1(
+        "\n".join(
+            [
+                request.build_absolute_uri(),
+                request.headers.get("Accept", ""),
+                _swh_web_version(),
+            ]
+        ).encode()
+    ).hexdigest()
+    return f'"{object_identifier}-{digest[:16]}"'
+
+
+def request_immutable_object_etag(request: HttpRequest) -> Optional[str]:
+    """Return the ETag of the response to a request processed by a view
+    serving an immutable object, :const:`None` for other views.
+
+    Args:
+        request: input HTTP request
+    """
+    return getattr(request, "_immutable_object_etag", None)
+
+
+def immutable_object_response(
+    request: HttpRequest,
+    object_identifier: str,
+    get_response: Callable[[], HttpResponseBase],
+) -> HttpResponseBase:
+    """Return the response of a view serving an immutable object, or a 304
+    response without calling the view if the client already has it.
+
+    Args:
+        request: input HTTP request
+        object_identifier: identifier of the served object
+        get_response: function calling the view
+
+    Returns:
+        The HTTP response
+    """
+    if request.method not in ("GET", "HEAD"):
+        return get_response()
+
+    etag = immutable_object_etag(request, object_identifier)
+    response: Optional[HttpResponseBase] = get_conditional_response(request, etag=etag)
+    if response is None:
+        request._immutable_object_etag = etag  # type: ignore[attr-defined]
+        response = get_response()
+
+    if response.status_code in (200, 206, 304):
+        response["ETag"] = etag
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=get_config()["immutable_objects_cache"]["max_age"],
+            immutable=True,
+        )
+    return response
+
+
+def immutable_object_view(
+    view: Callable[..., HttpResponseBase], object_identifier: ObjectIdentifier
+) -> Callable[..., HttpResponseBase]:
+    """Decorate a Django view serving an immutable object, see
+    :func:`immutable_object_response`.
+
+    Args:
+        view: the Django view
+        object_identifier: function computing the identifier of the served
+            object from the view keyword arguments
+    """
+
+    @functools.wraps(view)
+    def wrapper(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        return immutable_object_response(
+            request,
+            object_identifier(**kwargs),
+            lambda: view(request, *args, **kwargs),
+        )
+
+    return wrapper
@@ -0,0 +1,148 @@
+# Copyright (C) 2026  The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU Affero General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+
+def copy_decoded(obj: Any) -> Any:
+    """Copy the mutable containers of a value decoded from cache.
+
+    Values stored in the in-process cache are shared between all requests
+    processed by a worker while callers are allowed to modify what they get
+    from the cache (for instance to add URLs to directory entries). Only
+    containers are copied as other decoded types (str, bytes, int, datetime,
+    ...) are immutable.
+    """
+    if isinstance(obj, dict):
+        return {k: copy_decoded(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [copy_decoded(v) for v in obj]
+    elif isinstance(obj, tuple):
+        return tuple(copy_decoded(v) for v in obj)
+    return obj
+
+
+class _Entry(NamedTuple):
+    value: Any
+    size: int
+    expires_at: Optional[float]
+
+
+@dataclass
+class InProcessCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
+    size: int = 0
+
+
+class InProcessCache:
+    """Thread-safe LRU cache of decoded values bounded by memory size.
+
+    It is intended to sit in front of the Django cache in each web worker
+    process so that hot entries do not need to be fetched from memcached
+    and decoded again on each access.
+
+    Args:
+        max_size: maximum total size in bytes of cached values, as estimated
+            by the callers of :meth:`set`
+        max_timeout: upper bound in seconds for the lifetime of an entry,
+            entries set with a larger (or no) timeout are capped to it so
+            that values updated in the shared cache by other workers are
+            eventually picked up
+    """
+
+    def __init__(self, max_size: int, max_timeout: Optional[float] = None):
+        self.max_size = max_size
+        self.max_timeout = max_timeout
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = InProcessCacheStats()
+
+    def _expires_at(self, timeout: Optional[float]) -> Optional[float]:
+        if timeout is None or (
+            self.max_timeout is not None and timeout > self.max_timeout
+        ):
+            timeout = self.max_timeout
+        return time.monotonic() + timeout if timeout is not None else None
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._stats.size -= entry.size
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Get a value from the cache.
+
+        Returns:
+            a tuple whose first member indicates if the key was found in cache
+            and the second one is the cached value, it must not be modified
+            in place by the caller
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                entry.expires_at is not None and entry.expires_at <= time.monotonic()
+            ):
+                self._remove(key)
+                self._stats.expirations += 1
+                entry = None
+            if entry is None:
+                self._stats.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return True, entry.value
+
+    def set(
+        self, key: str, value: Any, size: int, timeout: Optional[float] = None
+    ) -> None:
+        """Put a value in the cache, least recently used entries are evicted
+        if the cache size exceeds its maximum size.
+
+        Args:
+            key: key of the value
+            value: the value to cache, it must not be modified in place
+                afterwards
+            size: estimated size in bytes of the value
+            timeout: number of seconds after which the entry expires,
+                :const:`None` means never (or ``max_timeout`` if set)
+        """
+        if size > self.max_size or (timeout is not None and timeout <= 0):
+            self.delete(key)
+            return
+        entry = _Entry(value, size, self._expires_at(timeout))
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._stats.size += size
+            while self._stats.size > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        """Remove a value from the cache if it exists."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Remove all values from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._stats.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss, eviction and expiration counters of the cache
+        together with its current number of entries and size in bytes."""
+        with self._lock:
+            self._stats.entries = len(self._entries)
+            return asdict(self._stats)
@@ -0,0 +1,208 @@
+# Copyright (C) 2026  The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU Affero General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+from datetime import datetime, timedelta, timezone
+import hashlib
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+
+from swh.model.model import (
+    Person,
+    Revision,
+    RevisionType,
+    SnapshotBranch,
+    SnapshotTargetType,
+    TimestampWithTimezone,
+)
+from swh.web.utils import converters
+
+
+def _sha1_git(seed: str) -> bytes:
+    return hashlib.sha1(seed.encode()).digest()
+
+
+def revisions(nb_objects: int) -> List[Revision]:
+    """Build revision model objects as returned by the archive."""
+    person = Person.from_fullname(b"John Doe <john.doe@example.org>")
+    date = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        Revision(
+            message=f"Commit number {i}\n\nSome details about it.".encode(),
+            author=person,
+            committer=person,
+            date=TimestampWithTimezone.from_datetime(date + timedelta(hours=i)),
+            committer_date=TimestampWithTimezone.from_datetime(
+                date + timedelta(hours=i)
+            ),
+            type=RevisionType.GIT,
+            directory=_sha1_git(f"directory-{i}"),
+            synthetic=False,
+            parents=(_sha1_git(f"revision-{i - 1}"),),
+            extra_headers=((b"gpgsig", b"signature"),),
+        )
+        for i in range(nb_objects)
+    ]
+
+
+def directory_entries(nb_objects: int) -> List[Dict[str, Any]]:
+    """Build directory entries as returned by the archive."""
+    return [
+        {
+            "dir_id": _sha1_git("directory"),
+            "type": "file",
+            "target": _sha1_git(f"content-{i}"),
+            "name": f"file-{i}.py".encode(),
+            "perms": 0o100644,
+            "status": "visible",
+            "length": i,
+            "sha1": hashlib.sha1(str(i).encode()).digest(),
+            "sha1_git": _sha1_git(f"content-{i}"),
+            "sha256": hashlib.sha256(str(i).encode()).digest(),
+            "blake2s256": hashlib.blake2s(str(i).encode()).digest(),
+        }
+        for i in range(nb_objects)
+    ]
+
+
+def contents(nb_objects: int) -> List[Dict[str, Any]]:
+    """Build content dictionaries as returned by the archive."""
+    return [
+        {
+            "sha1": hashlib.sha1(str(i).encode()).digest(),
+            "sha1_git": _sha1_git(f"content-{i}"),
+            "sha256": hashlib.sha256(str(i).encode()).digest(),
+            "blake2s256": hashlib.blake2s(str(i).encode()).digest(),
+            "length": i,
+            "status": "visible",
+            "ctime": datetime(2026, 1, 1, tzinfo=timezone.utc),
+        }
+        for i in range(nb_objects)
+    ]
+
+
+def partial_branches(nb_objects: int) -> List[Dict[str, Any]]:
+    """Build a page of snapshot branches, each branch counting as an object."""
+    branches: Dict[bytes, Any] = {
+        f"refs/heads/branch-{i}".encode(): SnapshotBranch(
+            target=_sha1_git(f"revision-{i}"), target_type=SnapshotTargetType.REVISION
+        )
+        for i in range(nb_objects)
+    }
+    if branches:
+        branches[b"HEAD"] = SnapshotBranch(
+            target=b"refs/heads/branch-0", target_type=SnapshotTargetType.ALIAS
+        )
+    return [{"id": _sha1_git("snapshot"), "branches": branches, "next_branch": None}]
+
+
+def _from_revision_generic(revision: Revision) -> Dict[str, Any]:
+    return converters.from_revision(revision.to_dict())
+
+
+def _from_directory_entry_generic(dir_entry: Dict[str, Any]) -> Dict[str, Any]:
+    return converters.from_swh(
+        dir_entry,
+        hashess={"dir_id", "sha1_git", "sha1", "sha256", "blake2s256", "target"},
+        bytess={"name"},
+        removables_if_empty={"sha1", "sha1_git", "sha256", "blake2s256", "status"},
+        convert={"status"},
+        convert_fn=lambda v: "absent" if v == "hidden" else v,
+    )
+
+
+def _from_content_generic(content: Dict[str, Any]) -> Dict[str, Any]:
+    return converters.from_swh(
+        content,
+        hashess={"sha1", "sha1_git", "sha256", "blake2s256"},
+        blocked={"ctime"},
+        convert={"status"},
+        convert_fn=lambda v: "absent" if v == "hidden" else v,
+    )
+
+
+def _from_partial_branches_generic(branches: Dict[str, Any]) -> Dict[str, Any]:
+    return converters.from_snapshot(
+        {
+            "id": branches["id"],
+            "branches": {
+                name: branch.to_dict() if branch else None
+                for name, branch in branches["branches"].items()
+            },
+            "next_branch": branches["next_branch"],
+        }
+    )
+
+
+Converter = Callable[[Any], Any]
+
+CONVERTERS: Dict[str, Tuple[Callable[[int], List[Any]], Converter, Converter]] = {
+    "revision": (revisions, _from_revision_generic, converters.from_revision),
+    "directory_entry": (
+        directory_entries,
+        _from_directory_entry_generic,
+        converters.from_directory_entry,
+    ),
+    "content": (contents, _from_content_generic, converters.from_content),
+    "branches": (
+        partial_branches,
+        _from_partial_branches_generic,
+        converters.from_partial_branches,
+    ),
+}
+"""For each object type: the builder of objects, the conversion using the
+generic :func:`swh.web.utils.converters.from_swh` and the specialized one."""
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare conversion throughputs of archive objects to JSON serializable "
+        "dictionaries using the generic and the specialized converters"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[10, 100, 1000, 10000],
+            help="Number of converted objects",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=10,
+            help="Number of conversions of the objects",
+        )
+
+    def _throughput(
+        self, converter: Converter, objects: List[Any], nb_objects: int, iterations: int
+    ) -> float:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for obj in objects:
+                converter(obj)
+        return nb_objects * iterations / (time.perf_counter() - start)
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'object type':<18}{'size':>8}"
+            f"{'generic (obj/s)':>18}{'specialized (obj/s)':>22}{'speedup':>10}"
+        )
+        for name, (builder, generic, specialized) in CONVERTERS.items():
+            for size in options["sizes"]:
+                objects = builder(size)
+                if any(generic(obj) != specialized(obj) for obj in objects):
+                    raise CommandError(f"Converters of {name} objects differ")
+                throughputs = [
+                    self._throughput(converter, objects, size, options["iterations"])
+                    for converter in (generic, specialized)
+                ]
+                self.stdout.write(
+                    f"{name:<18}{size:>8}"
+                    f"{throughputs[0]:>18.0f}{throughputs[1]:>22.0f}"
+                    f"{throughputs[1] / throughputs[0]:>9.1f}x"
+                )
@@ -3,11 +3,22 @@
 # License: GNU Affero General Public License version 3, or any later version
 # See top-level LICENSE file for more information
 
-from datetime import datetime
 from typing import List, Optional
 
-from swh.web.utils import archive, cache_get, cache_set, parse_iso8601_date_to_utc
+from swh.web.config import get_config
+from swh.web.utils import (
+    archive,
+    cache_get,
+    cache_set,
+    parse_iso8601_date_to_utc,
+    refresh_in_background,
+)
 from swh.web.utils.exc import NotFoundExc
+from swh.web.utils.origin_visits_cache import (
+    FINAL_VISIT_STATUSES,
+    OriginVisitsCache,
+    visit_sort_key,
+)
 from swh.web.utils.typing import OriginVisitInfo
 
 
@@ -19,7 +30,13 @@ def get_origin_visits(
 ) -> List[OriginVisitInfo]:
     """Function that returns the list of visits for a swh origin.
     That list is put in cache in order to speedup the navigation
-    in the swh web browse ui.
+    in the swh web browse ui, see
+    :class:`swh.web.utils.origin_visits_cache.OriginVisitsCache`.
+
+    If the ``origin_visits_stale_timeout`` configuration value is not zero,
+    cached visits are returned without checking for new visits until that
+    number of seconds elapsed, stale visits are then still returned while
+    new ones are fetched in a background thread.
 
     The returned visits are sorted according to their date in
     ascending order.
@@ -53,51 +70,106 @@ def get_origin_visits(
         origin_url, lookup_similar_urls=lookup_similar_urls
     )["url"]
 
-    cache_entry_id = "origin_visits_%s" % origin_url
-    cache_entry = cache_get(cache_entry_id)
+    visits_cache = OriginVisitsCache.load(origin_url)
+    cache_entry_id = OriginVisitsCache.cache_entry_id(origin_url)
+    origin_visits = None
+
+    stale_timeout = get_config().get("origin_visits_stale_timeout", 0)
+    if visits_cache and stale_timeout:
+        origin_visits = visits_cache.visits(limit)
+        if origin_visits is not None and cache_get(f"{cache_entry_id}_fresh") is None:
+            refresh_in_background(
+                cache_entry_id,
+                lambda: _update_origin_visits_cache(origin_url, limit),
+            )
+
+    if origin_visits is None:
+        origin_visits = _update_origin_visits_cache(origin_url, limit, visits_cache)
+
+    return _filter_visits_by_type(origin_visits, visit_type=visit_type)
+
+
+def _update_origin_visits_cache(
+    origin_url: str,
+    limit: Optional[int],
+    visits_cache: Optional[OriginVisitsCache] = None,
+) -> List[OriginVisitInfo]:
+    """Fetch visits of an origin not in cache yet and append them to the cache."""
+    if visits_cache is None:
+        visits_cache = OriginVisitsCache.load(origin_url)
+    if (
+        visits_cache is not None
+        and not visits_cache.complete
+        and (limit is None or visits_cache.count < limit)
+    ):
+        # only the most recent visits were cached for a lower limit
+        visits_cache = None
 
-    last_visit = None
-    origin_visits = []
-    new_visits = []
     per_page = archive.MAX_LIMIT
     if limit is not None and limit < per_page:
         per_page = limit
-    if cache_entry:
-        origin_visits = cache_entry
-        last_visit = origin_visits[-1]["visit"]
-        new_visits = list(
-            archive.lookup_origin_visits(
-                origin_url, last_visit=last_visit, per_page=per_page
-            )
+
+    origin_visits = None
+    if visits_cache is not None:
+        # fetch new visits including the most recent cached one as its
+        # status might have been updated since it was cached
+        last_visit = visits_cache.last_visit()
+        new_visits = _lookup_origin_visits_from(
+            origin_url, last_visit["visit"] - 1, per_page
         )
-        last_visit += len(new_visits)
-        if not new_visits:
-            if limit is not None and len(origin_visits) > limit:
-                origin_visits = origin_visits[-limit:]
-            last_snp = archive.lookup_latest_origin_snapshot(origin_url)
-            if not last_snp or last_snp["id"] == origin_visits[-1]["snapshot"]:
-                return _filter_visits_by_type(origin_visits, visit_type=visit_type)
-    else:
+        if not new_visits or new_visits == [last_visit]:
+            origin_visits = visits_cache.visits(limit)
+        else:
+            visits_cache.append(
+                sorted(new_visits, key=visit_sort_key),
+                replace_last=new_visits[0]["visit"] == last_visit["visit"],
+            )
+            origin_visits = visits_cache.visits(limit)
+
+    if origin_visits is None:
+        # no visits in cache or some of them were evicted,
         # retrieve visits from the most recent to the oldest
-        while True and (limit is None or len(new_visits) < limit):
+        last_visit_id = None
+        new_visits = []
+        complete = False
+        while limit is None or len(new_visits) < limit:
             visits = list(
                 archive.lookup_origin_visits(
                     origin_url,
-                    last_visit=last_visit,
+                    last_visit=last_visit_id,
                     per_page=per_page,
                     desc_order=True,
                 )
             )
             new_visits += visits
             if len(visits) < per_page:
+                complete = True
                 break
-            last_visit = visits[-1]["visit"]
+            last_visit_id = visits[-1]["visit"]
+
+        if new_visits:
+            # get new visits that we did not retrieve yet
+            new_visits += _lookup_origin_visits_from(
+                origin_url, new_visits[0]["visit"], per_page
+            )
+            origin_visits = sorted(new_visits, key=visit_sort_key)
+            OriginVisitsCache.create(origin_url, origin_visits, complete)
+        else:
+            origin_visits = []
+
+    if limit is not None and len(origin_visits) > limit:
+        origin_visits = origin_visits[-limit:]
+
+    _mark_origin_visits_cache_fresh(origin_url)
+
+    return origin_visits
 
-    if new_visits:
-        last_visit = new_visits[0]["visit"]
 
-    # get new visits that we did not retrieve yet
-    while True and (limit is None or len(new_visits) < limit):
+def _lookup_origin_visits_from(
+    origin_url: str, last_visit: int, per_page: int
+) -> List[OriginVisitInfo]:
+    new_visits: List[OriginVisitInfo] = []
+    while True:
         visits = list(
             archive.lookup_origin_visits(
                 origin_url, last_visit=last_visit, per_page=per_page
@@ -105,20 +177,15 @@ def get_origin_visits(
         )
         new_visits += visits
         if len(visits) < per_page:
-            break
+            return new_visits
         last_visit = visits[-1]["visit"]
 
-    # cache entry is already sorted with oldest visits
-    origin_visits += sorted(
-        new_visits, key=lambda v: (datetime.fromisoformat(v["date"]), v["visit"])
-    )
-
-    if limit is not None and len(origin_visits) > limit:
-        origin_visits = origin_visits[-limit:]
-
-    cache_set(cache_entry_id, origin_visits)
 
-    return _filter_visits_by_type(origin_visits, visit_type=visit_type)
+def _mark_origin_visits_cache_fresh(origin_url: str) -> None:
+    stale_timeout = get_config().get("origin_visits_stale_timeout", 0)
+    if stale_timeout:
+        cache_entry_id = OriginVisitsCache.cache_entry_id(origin_url)
+        cache_set(f"{cache_entry_id}_fresh", True, timeout=stale_timeout)
 
 
 def get_origin_visit(
@@ -177,12 +244,20 @@ def get_origin_visit(
         error_message_prefix += f" of type {visit_type}"
 
     if visit_ts:
-        visit = archive.origin_visit_find_by_date(
-            origin_url,
-            parse_iso8601_date_to_utc(visit_ts),
-            greater_or_equal=False,
-            type=visit_type,
+        visit_date = parse_iso8601_date_to_utc(visit_ts)
+        visits_cache = OriginVisitsCache.load(origin_url)
+        visit = (
+            visits_cache.find_by_date(visit_date, visit_type)
+            if visits_cache is not None
+            else None
         )
+        if visit is not None and visit.get("status") not in FINAL_VISIT_STATUSES:
+            # cached visit status might be outdated
+            visit = archive.lookup_origin_visit(origin_url, visit["visit"])
+        elif visit is None:
+            visit = archive.origin_visit_find_by_date(
+                origin_url, visit_date, greater_or_equal=False, type=visit_type
+            )
         if visit is not None:
             return visit
         else:
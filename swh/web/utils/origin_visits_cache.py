@@ -0,0 +1,382 @@
+# Copyright (C) 2026  The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU Affero General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+"""Append-only cache of origin visits.
+
+Visits of an origin are stored in django cache as a sequence of immutable
+segments holding :data:`VISITS_SEGMENT_SIZE` visits each, followed by a small
+mutable tail stored in the index entry of the origin. Adding new visits to the
+cache thus only rewrites the index, whose size is bounded, instead of the
+whole list of visits.
+
+Segments and tail use a compact columnar representation of visits (visit
+identifiers, dates as microseconds since epoch, status codes, snapshot
+identifiers as bytes, ...) whose dates can be bisected to find the visit
+closest to a given date without decoding all the visits of an origin.
+"""
+
+import bisect
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple, cast
+import uuid
+
+from swh.web.utils import cache_get, cache_set
+from swh.web.utils.typing import OriginVisitInfo
+
+VISITS_SEGMENT_SIZE = 1000
+"""Number of visits in an immutable segment of the cache."""
+
+_INDEX_VERSION = 1
+
+_VISIT_STATUSES = ("created", "ongoing", "full", "partial", "not_found", "failed")
+
+FINAL_VISIT_STATUSES = {"full", "partial", "not_found", "failed"}
+"""Statuses of visits that are not expected to change anymore."""
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+VisitsColumns = Dict[str, List[Any]]
+
+
+def encode_visits(visits: List[OriginVisitInfo]) -> VisitsColumns:
+    """Encode a list of visits of the same origin in a columnar way.
+
+    Args:
+        visits: list of visits as returned by
+            :func:`swh.web.utils.archive.lookup_origin_visits`
+
+    Returns:
+        a dict whose values are lists of visit attributes, visit types are
+        stored once in the ``types`` list and referenced by their index,
+        non empty metadata are stored as ``[visit position, metadata]`` pairs
+    """
+    columns: VisitsColumns = {
+        "visit": [],
+        "date": [],
+        "utc_offset": [],
+        "status": [],
+        "snapshot": [],
+        "type": [],
+        "types": [],
+        "metadata": [],
+    }
+    type_codes: Dict[str, int] = {}
+    for i, visit in enumerate(visits):
+        date = datetime.fromisoformat(visit["date"])
+        utc_offset = date.utcoffset() or timedelta(0)
+        # visits without any status only hold the origin visit fields
+        status: Any = visit.get("status")
+        if status in _VISIT_STATUSES:
+            status = _VISIT_STATUSES.index(status)
+        if visit["type"] not in type_codes:
+            type_codes[visit["type"]] = len(columns["types"])
+            columns["types"].append(visit["type"])
+        columns["visit"].append(visit["visit"])
+        columns["date"].append((date - _EPOCH) // _MICROSECOND)
+        columns["utc_offset"].append(utc_offset // timedelta(seconds=1))
+        columns["status"].append(status)
+        columns["snapshot"].append(
+            bytes.fromhex(visit["snapshot"]) if visit.get("snapshot") else None
+        )
+        columns["type"].append(type_codes[visit["type"]])
+        if visit.get("metadata"):
+            columns["metadata"].append([i, visit["metadata"]])
+    return columns
+
+
+def _decode_date(date: int, utc_offset: int) -> str:
+    tz = timezone.utc if utc_offset == 0 else timezone(timedelta(seconds=utc_offset))
+    return (_EPOCH + date * _MICROSECOND).astimezone(tz).isoformat()
+
+
+def _decode_visit(
+    origin_url: str, columns: VisitsColumns, i: int, metadata: Dict[str, Any]
+) -> OriginVisitInfo:
+    status = columns["status"][i]
+    snapshot = columns["snapshot"][i]
+    visit = {
+        "origin": origin_url,
+        "visit": columns["visit"][i],
+        "date": _decode_date(columns["date"][i], columns["utc_offset"][i]),
+        "type": columns["types"][columns["type"][i]],
+    }
+    if status is not None:
+        visit.update(
+            {
+                "status": (
+                    _VISIT_STATUSES[status] if isinstance(status, int) else status
+                ),
+                "snapshot": snapshot.hex() if snapshot else None,
+                "metadata": metadata,
+            }
+        )
+    return cast(OriginVisitInfo, visit)
+
+
+def decode_visits(
+    origin_url: str, columns: VisitsColumns, start: int = 0
+) -> List[OriginVisitInfo]:
+    """Decode visits encoded by :func:`encode_visits`.
+
+    Args:
+        origin_url: URL of the visited origin
+        columns: encoded visits
+        start: position of the first visit to decode
+
+    Returns:
+        the list of decoded visits
+    """
+    metadata = {i: m for i, m in columns["metadata"]}
+    return [
+        _decode_visit(origin_url, columns, i, metadata.get(i, {}))
+        for i in range(start, len(columns["visit"]))
+    ]
+
+
+class _SegmentEvicted(Exception):
+    pass
+
+
+def visit_sort_key(visit: OriginVisitInfo) -> Tuple[datetime, int]:
+    """Key to sort visits by date then identifier."""
+    return (datetime.fromisoformat(visit["date"]), visit["visit"])
+
+
+class OriginVisitsCache:
+    """Visits of an origin stored in cache as immutable segments and a tail.
+
+    Instances should be obtained using :meth:`load` or :meth:`create`.
+    """
+
+    def __init__(self, origin_url: str, index: Dict[str, Any]):
+        self.origin_url = origin_url
+        self._index = index
+        self._segments: Dict[int, VisitsColumns] = {}
+
+    @staticmethod
+    def cache_entry_id(origin_url: str) -> str:
+        return f"origin_visits_{origin_url}"
+
+    @classmethod
+    def load(cls, origin_url: str) -> Optional["OriginVisitsCache"]:
+        """Load the index of cached visits for an origin, segments are loaded
+        lazily when needed.
+
+        Returns:
+            the cached visits or :const:`None` if no visits are in cache
+        """
+        index = cache_get(cls.cache_entry_id(origin_url))
+        if (
+            not isinstance(index, dict)
+            or index.get("version") != _INDEX_VERSION
+            or not index["tail"]["visit"]
+        ):
+            return None
+        return cls(origin_url, index)
+
+    @classmethod
+    def create(
+        cls, origin_url: str, visits: List[OriginVisitInfo], complete: bool
+    ) -> "OriginVisitsCache":
+        """Put visits of an origin in cache, replacing those previously cached.
+
+        Args:
+            origin_url: URL of the visited origin
+            visits: non empty list of visits sorted by date
+            complete: whether the list contains all the visits of the origin
+                or only the most recent ones
+
+        Returns:
+            the cached visits
+        """
+        visits_cache = cls(
+            origin_url,
+            {
+                "version": _INDEX_VERSION,
+                "generation": uuid.uuid4().hex,
+                "complete": complete,
+                "sorted": True,
+                "segments": [],
+                "tail": encode_visits([]),
+            },
+        )
+        visits_cache.append(visits)
+        return visits_cache
+
+    @property
+    def complete(self) -> bool:
+        return self._index["complete"]
+
+    @property
+    def count(self) -> int:
+        return (
+            sum(count for _, _, count in self._index["segments"]) + self._tail_count()
+        )
+
+    def _tail_count(self) -> int:
+        return len(self._index["tail"]["visit"])
+
+    def _segment_key(self, segment: int) -> str:
+        return "%s_%s_%s" % (
+            self.cache_entry_id(self.origin_url),
+            self._index["generation"],
+            segment,
+        )
+
+    def _segment(self, segment: int) -> VisitsColumns:
+        if segment == len(self._index["segments"]):
+            return self._index["tail"]
+        if segment not in self._segments:
+            columns = cache_get(self._segment_key(segment))
+            if columns is None:
+                raise _SegmentEvicted(segment)
+            self._segments[segment] = columns
+        return self._segments[segment]
+
+    def last_visit(self) -> OriginVisitInfo:
+        """Return the most recent cached visit."""
+        tail = self._index["tail"]
+        return decode_visits(self.origin_url, tail, start=self._tail_count() - 1)[0]
+
+    def append(self, visits: List[OriginVisitInfo], replace_last: bool = False) -> None:
+        """Add new visits to the cache, only the index holding the tail and
+        the segments sealed from it are written.
+
+        Args:
+            visits: new visits sorted by date
+            replace_last: whether the first new visit is an update of the
+                most recent cached visit
+        """
+        tail = decode_visits(self.origin_url, self._index["tail"])
+        if replace_last and tail:
+            tail.pop()
+        if tail and visits and visit_sort_key(visits[0]) < visit_sort_key(tail[-1]):
+            self._index["sorted"] = False
+        tail += visits
+        segments = self._index["segments"]
+        while len(tail) > VISITS_SEGMENT_SIZE:
+            columns = encode_visits(tail[:VISITS_SEGMENT_SIZE])
+            segment = len(segments)
+            cache_set(self._segment_key(segment), columns)
+            self._segments[segment] = columns
+            segments.append(
+                [columns["date"][0], columns["date"][-1], VISITS_SEGMENT_SIZE]
+            )
+            tail = tail[VISITS_SEGMENT_SIZE:]
+        self._index["tail"] = encode_visits(tail)
+        cache_set(self.cache_entry_id(self.origin_url), self._index)
+
+    def visits(self, limit: Optional[int] = None) -> Optional[List[OriginVisitInfo]]:
+        """Return cached visits sorted by date.
+
+        Args:
+            limit: only return that number of most recent visits if provided
+
+        Returns:
+            the list of visits or :const:`None` if a segment was evicted
+            from the cache
+        """
+        visits: List[OriginVisitInfo] = []
+        segment = len(self._index["segments"])
+        while segment >= 0 and (limit is None or len(visits) < limit):
+            try:
+                columns = self._segment(segment)
+            except _SegmentEvicted:
+                return None
+            start = 0
+            if limit is not None:
+                start = max(0, len(columns["visit"]) - (limit - len(visits)))
+            visits = decode_visits(self.origin_url, columns, start) + visits
+            segment -= 1
+        return visits
+
+    def _iter_visits(
+        self, segment: int, position: Optional[int], step: int
+    ) -> Iterator[Tuple[int, int, VisitsColumns]]:
+        """Iterate on (segment, position, columns) of cached visits, starting
+        from the given position and going forward or backward."""
+        while 0 <= segment <= len(self._index["segments"]):
+            columns = self._segment(segment)
+            if position is None:
+                position = len(columns["visit"]) - 1 if step < 0 else 0
+            while 0 <= position < len(columns["visit"]):
+                yield segment, position, columns
+                position += step
+            segment += step
+            position = None
+
+    def find_by_date(
+        self, visit_date: datetime, visit_type: Optional[str] = None
+    ) -> Optional[OriginVisitInfo]:
+        """Find the cached visit whose date is the closest to the given one,
+        using the same criteria as
+        :meth:`swh.storage.interface.StorageInterface.origin_visit_find_by_date`.
+
+        As visits more recent than the cached ones may exist in the archive, a
+        visit is only returned when it is guaranteed to be the closest one.
+
+        Args:
+            visit_date: date to look for
+            visit_type: only consider visits of that type if provided
+
+        Returns:
+            the closest visit or :const:`None` if it could not be found in
+            cache, caller should then query the archive
+        """
+        segments = self._index["segments"]
+        tail = self._index["tail"]
+        date = (visit_date - _EPOCH) // _MICROSECOND
+        first_date = segments[0][0] if segments else tail["date"][0]
+        last_date = tail["date"][-1]
+        if not self._index["sorted"] or date >= last_date:
+            # more recent visits might not be cached yet
+            return None
+
+        def matches(columns: VisitsColumns, position: int) -> bool:
+            return (
+                visit_type is None
+                or columns["types"][columns["type"][position]] == visit_type
+            )
+
+        try:
+            segment = bisect.bisect_right(segments, date, key=lambda s: s[1])
+            position = bisect.bisect_right(self._segment(segment)["date"], date)
+
+            candidates = []
+            # closest visit dated before or at the given date, visits with
+            # the same date are sorted by increasing identifiers
+            for visit in self._iter_visits(segment, position - 1, -1):
+                if matches(visit[2], visit[1]):
+                    candidates.append(visit)
+                    break
+            # closest visits dated after the given date
+            after_date = None
+            for visit in self._iter_visits(segment, position, 1):
+                if after_date is not None and visit[2]["date"][visit[1]] != after_date:
+                    break
+                if matches(visit[2], visit[1]):
+                    candidates.append(visit)
+                    after_date = visit[2]["date"][visit[1]]
+        except _SegmentEvicted:
+            return None
+
+        if not candidates:
+            return None
+
+        distance, _, segment, position = min(
+            (abs(columns["date"][i] - date), -columns["visit"][i], segment, i)
+            for segment, i, columns in candidates
+        )
+        if distance >= last_date - date or (
+            not self.complete and distance > date - first_date
+        ):
+            # a visit not in cache might be closer
+            return None
+        columns = self._segment(segment)
+        metadata = {i: m for i, m in columns["metadata"]}
+        return _decode_visit(
+            self.origin_url, columns, position, metadata.get(position, {})
+        )
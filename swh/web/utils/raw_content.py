@@ -0,0 +1,171 @@
+# Copyright (C) 2026  The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU Affero General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+import re
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.http.response import HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header
+
+from swh.web.utils import archive
+from swh.web.utils.immutable_objects import request_immutable_object_etag
+
+RAW_CONTENT_CHUNK_SIZE = 64 * 1024
+"""Size in bytes of the chunks sent when streaming a raw content."""
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range_header(range_header: str, length: int) -> Optional[Tuple[int, int]]:
+    """Parse the value of a HTTP Range header for a resource of given length.
+
+    Only single byte ranges are supported, other ranges are ignored which
+    means the whole resource should be sent.
+
+    Args:
+        range_header: value of the Range header
+        length: length in bytes of the resource
+
+    Returns:
+        :const:`None` if the header should be ignored, the first and last
+        (excluded) byte positions of the range otherwise
+
+    Raises:
+        RangeNotSatisfiable: the range does not overlap the resource
+    """
+    match = _RANGE_RE.match(range_header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if not first:
+        # suffix range, the last bytes of the resource
+        start = max(0, length - int(last))
+        end = length
+    else:
+        start = int(first)
+        end = min(int(last) + 1, length) if last else length
+        if last and int(last) < start:
+            return None
+    if start >= end:
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+def _iter_chunks(data: bytes, start: int, end: int) -> Iterator[memoryview]:
+    view = memoryview(data)
+    for offset in range(start, end, RAW_CONTENT_CHUNK_SIZE):
+        yield view[offset : min(offset + RAW_CONTENT_CHUNK_SIZE, end)]
+
+
+def _content_etag(request: HttpRequest, content: Dict[str, Any]) -> str:
+    # views serving immutable objects answer to conditional requests using
+    # their own ETag before looking up the content
+    etag = request_immutable_object_etag(request)
+    if etag is None:
+        etag = '"%s"' % content["checksums"]["sha1_git"]
+    return etag
+
+
+def content_not_modified(
+    request: HttpRequest, content: Dict[str, Any]
+) -> Optional[HttpResponseBase]:
+    """Check if a conditional request for the raw bytes of a content can be
+    answered without sending them, using the ``sha1_git`` checksum of the
+    content as ETag, or the ETag of the view if it serves an immutable object.
+
+    Args:
+        request: input HTTP request
+        content: content metadata as returned by
+            :func:`swh.web.utils.archive.lookup_content`
+
+    Returns:
+        A 304 or 412 HTTP response if preconditions of the request
+        are not met, :const:`None` otherwise
+    """
+    etag = _content_etag(request, content)
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        response["ETag"] = etag
+    return response
+
+
+def raw_content_response(
+    request: HttpRequest,
+    content: Dict[str, Any],
+    filename: str,
+    content_type: str = "application/octet-stream",
+    as_attachment: bool = True,
+) -> HttpResponseBase:
+    """Create a HTTP response streaming the raw bytes of a content.
+
+    The ``sha1_git`` checksum of the content, or the ETag of the view if it
+    serves an immutable object, is used as ETag so conditional requests with
+    a matching ``If-None-Match`` header get a 304 response without the
+    content bytes being fetched. Single byte ranges requested
+    through the ``Range`` header are also supported.
+
+    Content bytes are only fetched from the archive once preconditions are
+    checked, unless they are provided in the ``raw_data`` entry of the
+    content dict, and are sent by chunks of :data:`RAW_CONTENT_CHUNK_SIZE`
+    bytes without being copied.
+
+    Args:
+        request: input HTTP request
+        content: content metadata as returned by
+            :func:`swh.web.utils.archive.lookup_content`
+        filename: name of the downloaded file
+        content_type: value of the Content-Type header
+        as_attachment: whether the content should be downloaded or displayed
+            by the browser
+
+    Returns:
+        The HTTP response
+    """
+    etag = _content_etag(request, content)
+    length = content["length"]
+
+    not_modified = content_not_modified(request, content)
+    if not_modified is not None:
+        return not_modified
+
+    byte_range = None
+    if "Range" in request.headers and request.headers.get("If-Range", etag) == etag:
+        try:
+            byte_range = parse_range_header(request.headers["Range"], length)
+        except RangeNotSatisfiable:
+            not_satisfiable = HttpResponse(status=416)
+            not_satisfiable["Content-Range"] = f"bytes */{length}"
+            return not_satisfiable
+
+    raw_data = content.get("raw_data")
+    if raw_data is None:
+        raw_data = archive.lookup_content(
+            "sha1:%s" % content["checksums"]["sha1"], with_data=True
+        )["data"]
+
+    start, end = byte_range or (0, length)
+    response = StreamingHttpResponse(
+        _iter_chunks(raw_data, start, end),
+        status=206 if byte_range else 200,
+        content_type=content_type,
+    )
+    response["Content-Length"] = str(end - start)
+    if byte_range:
+        response["Content-Range"] = f"bytes {start}-{end - 1}/{length}"
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    content_disposition = content_disposition_header(True, filename)
+    if not as_attachment:
+        # preserve the Content-Disposition header value previously sent
+        # by the raw content views for inline display
+        content_disposition = content_disposition.replace("attachment; ", "")
+    response["Content-Disposition"] = content_disposition
+    return response
@@ -0,0 +1,349 @@
+# Copyright (C) 2026  The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU Affero General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+"""Caching and streaming of the raw form of archived objects.
+
+The raw form of an object is the git-like manifest hashing to its intrinsic
+identifier (see :mod:`swh.model.git_objects`). As archived objects are
+immutable, raw objects are cached by SWHID: small ones in django cache,
+larger ones in a local disk cache directory, if configured. That directory
+must be owned by the user running swh-web and not writable by other users.
+
+Raw contents and snapshots larger than the django cache threshold are not
+built in memory but streamed. The git header of a snapshot manifest holds
+its length, which is computed by a first iteration over the snapshot
+branches before streaming them, both iterations only hold a page of
+branches in memory.
+"""
+
+import functools
+import logging
+import os
+import tempfile
+from typing import (
+    BinaryIO,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from swh.model.git_objects import (
+    directory_git_object,
+    git_object_header,
+    release_git_object,
+    revision_git_object,
+)
+from swh.model.model import SnapshotBranch, SnapshotTargetType
+from swh.model.swhids import CoreSWHID, ObjectType
+from swh.storage.algos.directory import directory_get
+from swh.web import config
+from swh.web.utils import archive, cache_get, cache_set
+from swh.web.utils.exc import NotFoundExc
+from swh.web.utils.raw_content import RAW_CONTENT_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_BRANCHES_PAGE_SIZE = 1000
+"""Number of branches fetched at once when streaming a raw snapshot."""
+
+
+class StreamedRawObject(NamedTuple):
+    """Raw object whose bytes are streamed."""
+
+    length: int
+    """Length in bytes of the raw object"""
+    chunks: Iterator[Union[bytes, memoryview]]
+    """Chunks of bytes of the raw object"""
+
+
+def _iter_content_chunks(
+    header: bytes, data: bytes
+) -> Iterator[Union[bytes, memoryview]]:
+    yield header
+    view = memoryview(data)
+    for offset in range(0, len(data), RAW_CONTENT_CHUNK_SIZE):
+        yield view[offset : offset + RAW_CONTENT_CHUNK_SIZE]
+
+
+def _raw_content(object_id: bytes) -> Optional[StreamedRawObject]:
+    try:
+        content = archive.lookup_content(
+            f"sha1_git:{object_id.hex()}", json_convert=False, with_data=True
+        )
+    except NotFoundExc:
+        return None
+    data = content["data"]
+    header = git_object_header("blob", len(data))
+    return StreamedRawObject(
+        len(header) + len(data), _iter_content_chunks(header, data)
+    )
+
+
+def _iter_snapshot_branches(
+    snapshot_id: bytes,
+) -> Iterator[Tuple[bytes, Optional[SnapshotBranch]]]:
+    storage = config.storage()
+    next_branch: Optional[bytes] = b""
+    while next_branch is not None:
+        partial_branches = storage.snapshot_get_branches(
+            snapshot_id,
+            branches_from=next_branch,
+            branches_count=SNAPSHOT_BRANCHES_PAGE_SIZE,
+        )
+        assert partial_branches is not None
+        # branches are returned sorted by name
+        yield from partial_branches["branches"].items()
+        next_branch = partial_branches["next_branch"]
+
+
+def _snapshot_has_branch(snapshot_id: bytes, name: bytes) -> bool:
+    partial_branches = config.storage().snapshot_get_branches(
+        snapshot_id, branches_from=name, branches_count=1
+    )
+    return partial_branches is not None and name in partial_branches["branches"]
+
+
+def _snapshot_branch_manifest(name: bytes, branch: Optional[SnapshotBranch]) -> bytes:
+    # same format as swh.model.git_objects.snapshot_git_object
+    if branch is None:
+        target_type = b"dangling"
+        target = b""
+    else:
+        target_type = branch.target_type.value.encode()
+        target = branch.target
+    return b"%s %s\x00%d:%s" % (target_type, name, len(target), target)
+
+
+def _raw_snapshot(snapshot_id: bytes) -> Optional[StreamedRawObject]:
+    if list(config.storage().snapshot_missing([snapshot_id])):
+        return None
+
+    length = 0
+    aliases: List[Tuple[bytes, bytes]] = []
+    for name, branch in _iter_snapshot_branches(snapshot_id):
+        length += len(_snapshot_branch_manifest(name, branch))
+        if branch is not None and branch.target_type == SnapshotTargetType.ALIAS:
+            aliases.append((name, branch.target))
+
+    # aliases targeting missing branches are rejected the same way as in
+    # swh.model.git_objects.snapshot_git_object
+    unresolved = [
+        (name, target)
+        for name, target in aliases
+        if target == name or not _snapshot_has_branch(snapshot_id, target)
+    ]
+    if unresolved:
+        raise ValueError(
+            "Branch aliases unresolved: %s"
+            % ", ".join("%r -> %r" % x for x in unresolved),
+            unresolved,
+        )
+
+    header = git_object_header("snapshot", length)
+    chunks = (
+        _snapshot_branch_manifest(name, branch)
+        for name, branch in _iter_snapshot_branches(snapshot_id)
+    )
+    return StreamedRawObject(len(header) + length, _prepend(header, chunks))
+
+
+def _prepend(chunk: bytes, chunks: Iterable[bytes]) -> Iterator[bytes]:
+    yield chunk
+    yield from chunks
+
+
+def _raw_object(swhid: CoreSWHID) -> Optional[Union[bytes, StreamedRawObject]]:
+    object_id = swhid.object_id
+    object_type = swhid.object_type
+    storage = config.storage()
+
+    if object_type == ObjectType.CONTENT:
+        return _raw_content(object_id)
+
+    elif object_type == ObjectType.SNAPSHOT:
+        return _raw_snapshot(object_id)
+
+    elif object_type == ObjectType.DIRECTORY:
+        dir_ = directory_get(storage, object_id)
+        return directory_git_object(dir_) if dir_ is not None else None
+
+    elif object_type == ObjectType.REVISION:
+        rev = storage.revision_get([object_id])[0]
+        return revision_git_object(rev) if rev is not None else None
+
+    elif object_type == ObjectType.RELEASE:
+        rel = storage.release_get([object_id])[0]
+        return release_git_object(rel) if rel is not None else None
+
+    else:
+        raise ValueError(f"Unexpected object type variant: {object_type}")
+
+
+def _raw_objects_cache_config():
+    return config.get_config()["raw_objects_cache"]
+
+
+def _cache_key(swhid: CoreSWHID) -> str:
+    return f"raw_object_{swhid}"
+
+
+def _disk_cache_path(swhid: CoreSWHID) -> Optional[str]:
+    disk_cache_dir = _raw_objects_cache_config()["disk_cache_dir"]
+    if disk_cache_dir is None:
+        return None
+    return os.path.join(disk_cache_dir, str(swhid).replace(":", "_"))
+
+
+def _disk_cache_dir_trusted(disk_cache_dir: str) -> bool:
+    """Whether the disk cache directory is owned by the current user and not
+    writable by other users, who could otherwise plant files served as raw
+    objects."""
+    try:
+        stat = os.stat(disk_cache_dir)
+    except OSError:
+        return False
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
+
+
+def _iter_file_chunks(f: BinaryIO) -> Iterator[bytes]:
+    with f:
+        yield from iter(functools.partial(f.read, RAW_CONTENT_CHUNK_SIZE), b"")
+
+
+def _read_from_disk_cache(path: str) -> Optional[StreamedRawObject]:
+    if not _disk_cache_dir_trusted(os.path.dirname(path)):
+        return None
+    try:
+        # the file is opened right away so that it can still be streamed
+        # if it is removed while pruning the disk cache in another worker
+        f = open(path, "rb")
+    except OSError:
+        return None
+    try:
+        length = os.fstat(f.fileno()).st_size
+        # modification times order cached files by last use for pruning
+        os.utime(f.fileno())
+    except OSError:
+        f.close()
+        return None
+    return StreamedRawObject(length, _iter_file_chunks(f))
+
+
+def _prune_disk_cache(disk_cache_dir: str, max_disk_size: int) -> None:
+    """Remove the least recently used files of the disk cache until its
+    size no longer exceeds the maximum one."""
+    cached_files = []
+    try:
+        with os.scandir(disk_cache_dir) as entries:
+            for entry in entries:
+                # skip temporary files being written
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                cached_files.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        logger.warning("Raw object cache directory %s cannot be pruned", disk_cache_dir)
+        return
+
+    disk_size = sum(size for _, size, _ in cached_files)
+    for _, size, path in sorted(cached_files):
+        if disk_size <= max_disk_size:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        disk_size -= size
+
+
+def _write_to_disk_cache(
+    path: str, raw_object: StreamedRawObject
+) -> Iterator[Union[bytes, memoryview]]:
+    """Stream a raw object while writing it to the disk cache, the cached file
+    is only created once the object has been entirely streamed."""
+    disk_cache_dir = os.path.dirname(path)
+    try:
+        os.makedirs(disk_cache_dir, mode=0o700, exist_ok=True)
+        if not _disk_cache_dir_trusted(disk_cache_dir):
+            raise PermissionError(disk_cache_dir)
+        fd, tmp_path = tempfile.mkstemp(dir=disk_cache_dir, prefix=".")
+    except OSError:
+        logger.warning(
+            "Raw object cache directory %s is not writable or is not owned "
+            "by the current user",
+            disk_cache_dir,
+        )
+        yield from raw_object.chunks
+        return
+
+    cached = False
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            for chunk in raw_object.chunks:
+                tmp_file.write(chunk)
+                yield chunk
+        os.replace(tmp_path, path)
+        cached = True
+    finally:
+        if not cached:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    _prune_disk_cache(disk_cache_dir, _raw_objects_cache_config()["max_disk_size"])
+
+
+def get_raw_object(swhid: CoreSWHID) -> Union[bytes, StreamedRawObject]:
+    """Return the raw form of an archived object, from cache if possible.
+
+    Raw objects up to the ``max_memory_size`` bytes set in the
+    ``raw_objects_cache`` configuration are returned as bytes and put in
+    django cache, larger ones are streamed and put in the disk cache.
+
+    Args:
+        swhid: SWHID of the object
+
+    Returns:
+        The bytes of the raw object or the length and the chunks of bytes
+        of the streamed raw object
+
+    Raises:
+        swh.web.utils.exc.NotFoundExc: if the object is not found
+    """
+    cache_config = _raw_objects_cache_config()
+    cache_key = _cache_key(swhid)
+
+    raw_bytes = cache_get(cache_key)
+    if raw_bytes is not None:
+        return raw_bytes
+
+    disk_cache_path = _disk_cache_path(swhid)
+    if disk_cache_path is not None:
+        cached_raw_object = _read_from_disk_cache(disk_cache_path)
+        if cached_raw_object is not None:
+            return cached_raw_object
+
+    raw_object = _raw_object(swhid)
+    if raw_object is None:
+        raise NotFoundExc(f"Object with id {swhid} not found.")
+
+    if isinstance(raw_object, bytes):
+        raw_object = StreamedRawObject(len(raw_object), iter([raw_object]))
+
+    if raw_object.length <= cache_config["max_memory_size"]:
+        raw_bytes = b"".join(raw_object.chunks)
+        cache_set(cache_key, raw_bytes, timeout=cache_config["timeout"])
+        return raw_bytes
+
+    if disk_cache_path is None:
+        return raw_object
+    return StreamedRawObject(
+        raw_object.length, _write_to_disk_cache(disk_cache_path, raw_object)
+    )
@@ -0,0 +1,224 @@
+# Copyright (C) 2026  The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU Affero General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+"""Resumable index of the revisions log of a revision.
+
+Identifiers of the revisions in the history of a revision, ordered by a
+revisions walker, are stored in django cache as 20 bytes binary strings.
+They are grouped in immutable blocks of :data:`REVISION_LOG_BLOCK_SIZE`
+identifiers followed by a small mutable tail, stored with the frontier of the
+revisions walker in the index entry of the log. Extending the log thus only
+rewrites the index, whose size does not depend on the number of identifiers
+already in the log, and reading a page of the log only fetches the blocks
+covering it.
+
+The set of revisions already visited by the walker is not stored as it is
+made of the logged revisions and of the missing ones, it is rebuilt from
+the blocks when the log needs to be extended. As that rebuild reads the whole
+log, the log is extended to at least twice its size each time, so the total
+cost of the rebuilds stays proportional to the size of the log.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import uuid
+
+from swh.model.hashutil import hash_to_hex
+from swh.storage.algos.revisions_walker import State
+from swh.web import config
+from swh.web.utils import archive, cache_get, cache_set
+
+REVISION_LOG_BLOCK_SIZE = 1000
+"""Number of revision identifiers in an immutable block of the log."""
+
+REVISION_LOG_CACHE_TIMEOUT = 60 * 60
+"""Time in seconds revisions logs are kept in cache."""
+
+_INDEX_VERSION = 2
+
+_ID_SIZE = 20
+
+
+def _split_ids(data: bytes) -> Iterator[bytes]:
+    for offset in range(0, len(data), _ID_SIZE):
+        yield data[offset : offset + _ID_SIZE]
+
+
+class _BlockEvicted(Exception):
+    pass
+
+
+class RevisionLogIndex:
+    """Revisions log of a revision for a given ordering, lazily extended
+    when pages past its end are requested.
+
+    Args:
+        revision_id: hexadecimal representation of the revision identifier
+        revs_ordering: the revisions walker type, see
+            :func:`swh.web.utils.archive.get_revisions_walker`
+    """
+
+    def __init__(self, revision_id: str, revs_ordering: str):
+        self.revision_id = revision_id
+        self.revs_ordering = revs_ordering
+        index = cache_get(self.cache_entry_id(revision_id, revs_ordering))
+        if not isinstance(index, dict) or index.get("version") != _INDEX_VERSION:
+            index = self._new_index()
+        self._index = index
+        self._blocks: Dict[int, bytes] = {}
+
+    @staticmethod
+    def cache_entry_id(revision_id: str, revs_ordering: str) -> str:
+        return f"revision_log_{revision_id}_{revs_ordering}"
+
+    @staticmethod
+    def _new_index() -> Dict[str, Any]:
+        return {
+            "version": _INDEX_VERSION,
+            "generation": uuid.uuid4().hex,
+            "blocks": 0,
+            "tail": b"",
+            "complete": False,
+            "walker_state": None,
+        }
+
+    @property
+    def count(self) -> int:
+        """Number of revisions currently in the log."""
+        return (
+            self._index["blocks"] * REVISION_LOG_BLOCK_SIZE
+            + len(self._index["tail"]) // _ID_SIZE
+        )
+
+    @property
+    def complete(self) -> bool:
+        """Whether the log contains the whole history of the revision."""
+        return self._index["complete"]
+
+    def _block_key(self, block: int) -> str:
+        return "%s_%s_%s" % (
+            self.cache_entry_id(self.revision_id, self.revs_ordering),
+            self._index["generation"],
+            block,
+        )
+
+    def _block(self, block: int) -> bytes:
+        if block == self._index["blocks"]:
+            return self._index["tail"]
+        if block not in self._blocks:
+            data = cache_get(self._block_key(block))
+            if data is None:
+                raise _BlockEvicted(block)
+            self._blocks[block] = data
+        return self._blocks[block]
+
+    def _walker_state(self) -> Optional[State]:
+        walker_state = self._index["walker_state"]
+        if walker_state is None:
+            return None
+        missing_revs = set(_split_ids(walker_state["missing_revs"]))
+        done = set(missing_revs)
+        for block in range(self._index["blocks"] + 1):
+            done.update(_split_ids(self._block(block)))
+        revs_to_visit = walker_state["revs_to_visit"]
+        if self.revs_ordering == "committer_date":
+            revs_to_visit = list(map(tuple, revs_to_visit))
+        last_rev = None
+        if walker_state["last_rev"] is not None:
+            revision = config.storage().revision_get([walker_state["last_rev"]])[0]
+            if revision is not None:
+                last_rev = revision.to_dict()
+        return State(
+            done=done,
+            revs_to_visit=revs_to_visit,
+            last_rev=last_rev,
+            num_revs=self.count,
+            missing_revs=missing_revs,
+        )
+
+    def _extend(self, count: int) -> None:
+        """Walk the history of the revision until the log contains ``count``
+        revisions or the walk is over, then store the updated log in cache."""
+        revs_walker = archive.get_revisions_walker(
+            self.revs_ordering,
+            self.revision_id,
+            max_revs=count,
+            state=self._walker_state(),
+            ids_only=True,
+        )
+        new_ids = list(revs_walker)
+        walker_state = revs_walker.export_state()
+
+        if self.count + len(new_ids) < count:
+            self._index["complete"] = True
+        tail = self._index["tail"] + b"".join(new_ids)
+        block_bytes = REVISION_LOG_BLOCK_SIZE * _ID_SIZE
+        while len(tail) >= block_bytes:
+            block = self._index["blocks"]
+            self._blocks[block] = tail[:block_bytes]
+            cache_set(
+                self._block_key(block),
+                self._blocks[block],
+                timeout=REVISION_LOG_CACHE_TIMEOUT,
+            )
+            self._index["blocks"] += 1
+            tail = tail[block_bytes:]
+        self._index["tail"] = tail
+        self._index["walker_state"] = {
+            "revs_to_visit": list(walker_state.revs_to_visit),
+            "missing_revs": b"".join(walker_state.missing_revs),
+            "last_rev": (
+                walker_state.last_rev["id"]
+                if walker_state.last_rev is not None
+                else None
+            ),
+        }
+        cache_set(
+            self.cache_entry_id(self.revision_id, self.revs_ordering),
+            self._index,
+            timeout=REVISION_LOG_CACHE_TIMEOUT,
+        )
+
+    def _ids(self, start: int, end: int) -> List[str]:
+        ids = []
+        while start < end:
+            block, position = divmod(start, REVISION_LOG_BLOCK_SIZE)
+            data = self._block(block)
+            nb_ids = min(end - start, REVISION_LOG_BLOCK_SIZE - position)
+            ids += [
+                hash_to_hex(rev_id)
+                for rev_id in _split_ids(
+                    data[position * _ID_SIZE : (position + nb_ids) * _ID_SIZE]
+                )
+            ]
+            start += nb_ids
+        return ids
+
+    def _revisions(self, offset: int, limit: int) -> Tuple[List[str], bool]:
+        end = offset + limit
+        if self.count <= end and not self.complete:
+            # walk at least twice the current log size to amortize the
+            # rebuild of the walker state
+            self._extend(max(end + 1, 2 * self.count))
+        return self._ids(offset, min(end, self.count)), self.count > end
+
+    def revisions(self, offset: int, limit: int) -> Tuple[List[str], bool]:
+        """Return a page of the revisions log.
+
+        Args:
+            offset: position of the first revision of the page in the log
+            limit: number of revisions in the page
+
+        Returns:
+            a tuple whose first member is the list of revision identifiers
+            in hexadecimal form and second member indicates if more revisions
+            follow that page in the log
+        """
+        try:
+            return self._revisions(offset, limit)
+        except _BlockEvicted:
+            # walk the history again from scratch
+            self._index = self._new_index()
+            self._blocks = {}
+            return self._revisions(offset, limit)
@@ -29,7 +29,7 @@ from swh.model.swhids import CoreSWHID, ObjectType
 from swh.storage.utils import now
 from swh.web.tests.data import random_content, random_sha1
 from swh.web.tests.strategies import new_origin, new_revision, visit_dates
-from swh.web.utils import archive
+from swh.web.utils import _compute_final_cache_key, archive
 from swh.web.utils.exc import BadInputExc, NotFoundExc
 from swh.web.utils.typing import OriginInfo, PagedResult
 
@@ -250,6 +250,46 @@ def test_lookup_origin(archive_data, mocker, patch_backend, django_cache, new_or
     search_origin_get.assert_called_once()
 
 
+def test_lookup_origin_url_variants_single_query(archive_data, mocker):
+    origin_url = "https://example.org/user/project/"
+    archive_data.origin_add([Origin(url=origin_url)])
+    storage_origin_get = mocker.spy(archive.config.storage(), "origin_get")
+
+    stats_before = archive.origin_lookup_stats()
+    for _ in range(2):
+        # mangled URL as sent by some HTTP clients
+        origin = archive.lookup_origin("https:/example.org/user/project/")
+        assert origin["url"] == origin_url
+
+    # all URL variants resolved in a single query, then from cache
+    storage_origin_get.assert_called_once_with(
+        [
+            "https:/example.org/user/project/",
+            "https:/example.org/user/project",
+            "https://example.org/user/project/",
+        ]
+    )
+    stats = archive.origin_lookup_stats()
+    assert stats["misses"] == stats_before["misses"] + 1
+    assert stats["hits"] == stats_before["hits"] + 1
+
+
+def test_lookup_origin_not_found_cached(archive_data, mocker):
+    origin_url = "https://example.org/user/unknown project"
+    storage_origin_get = mocker.spy(archive.config.storage(), "origin_get")
+
+    stats_before = archive.origin_lookup_stats()
+    for _ in range(2):
+        with pytest.raises(NotFoundExc, match="not found"):
+            archive.lookup_origin(origin_url)
+
+    storage_origin_get.assert_called_once()
+    assert (
+        archive.origin_lookup_stats()["not_found_hits"]
+        == stats_before["not_found_hits"] + 1
+    )
+
+
 def test_lookup_origin_snapshots(archive_data, origin_with_multiple_visits):
     origin_url = origin_with_multiple_visits["url"]
     visits = archive_data.origin_visit_get(origin_url)
@@ -678,6 +718,99 @@ def test_lookup_directory_empty(empty_directory):
     assert actual_directory_ls == []
 
 
+def test_lookup_directory_entries(archive_data, directory):
+    expected_directory_ls = sorted(
+        archive_data.directory_ls(directory), key=lambda e: e["name"]
+    )
+
+    entries, next_entry = archive.lookup_directory_entries(
+        directory, entries_count=len(expected_directory_ls)
+    )
+    assert entries == expected_directory_ls
+    assert next_entry is None
+
+    entries_from = ""
+    entries = []
+    while entries_from is not None:
+        page, entries_from = archive.lookup_directory_entries(
+            directory, entries_from or b"", entries_count=2
+        )
+        assert len(page) <= 2
+        entries += page
+
+    assert entries == expected_directory_ls
+
+
+def test_lookup_directory_entries_cached_pages(
+    archive_data, directory, mocker, django_cache
+):
+    mocker.patch.object(archive, "DIRECTORY_ENTRIES_PAGE_SIZE", 2)
+    spy_cache_entries = mocker.spy(archive, "_cache_directory_entries")
+    expected_directory_ls = sorted(
+        archive_data.directory_ls(directory), key=lambda e: e["name"]
+    )
+
+    entries_from = b""
+    entries = []
+    while entries_from is not None:
+        page, entries_from = archive.lookup_directory_entries(
+            directory, entries_from, entries_count=1
+        )
+        entries += page
+
+    assert entries == expected_directory_ls
+    assert spy_cache_entries.call_count == 1
+
+    django_cache.delete(
+        _compute_final_cache_key(archive._directory_entries_page_key(directory, 2, 0))
+    )
+    entries, _ = archive.lookup_directory_entries(
+        directory, entries_count=len(expected_directory_ls)
+    )
+    assert entries == expected_directory_ls
+    assert spy_cache_entries.call_count == 2
+
+
+def test_lookup_directory_entries_non_utf8_names(archive_data, content):
+    names = [b"a\xff", b"b", b"c\xfe"]
+    directory = Directory(
+        entries=tuple(
+            DirectoryEntry(
+                name=name,
+                type="file",
+                target=hash_to_bytes(content["sha1_git"]),
+                perms=DentryPerms.content,
+            )
+            for name in names
+        )
+    )
+    archive_data.directory_add([directory])
+
+    entries, next_entry = archive.lookup_directory_entries(
+        directory.id.hex(), entries_count=1
+    )
+    assert next_entry == b"b"
+    entries, next_entry = archive.lookup_directory_entries(
+        directory.id.hex(), b"b", entries_count=1
+    )
+    assert next_entry == b"c\xfe"
+    entries, next_entry = archive.lookup_directory_entries(
+        directory.id.hex(), next_entry, entries_count=1
+    )
+    assert [entry["name"] for entry in entries] == ["c\\xfe"]
+    assert next_entry is None
+
+
+def test_lookup_directory_entries_empty(empty_directory):
+    assert archive.lookup_directory_entries(empty_directory) == ([], None)
+
+
+def test_lookup_directory_entries_not_found():
+    unknown_directory = random_sha1()
+    with pytest.raises(NotFoundExc, match="Directory with sha1_git"):
+        archive.lookup_directory_entries(unknown_directory)
+
+
 def test_lookup_revision_by_nothing_found(origin):
     with pytest.raises(NotFoundExc):
         archive.lookup_revision_by(origin["url"], "invalid-branch-name")
@@ -1290,6 +1423,40 @@ def test_lookup_swhid_raw_intrinsic_metadata_top_level_dir(
     _check_intrinsic_citation_metadata(intrinsic_citation_metadata)
 
 
+def test_lookup_directory_intrinsic_citation_metadata_storage_calls(
+    archive_data, origin_with_metadata_file, mocker
+):
+    snapshot = archive.lookup_latest_origin_snapshot(origin_with_metadata_file["url"])
+    revision = archive.lookup_revision(
+        snapshot["branches"]["refs/heads/master"]["target"]
+    )
+    directory = Directory(
+        entries=(
+            DirectoryEntry(
+                name=b"root_dir",
+                type="dir",
+                target=hash_to_bytes(revision["directory"]),
+                perms=DentryPerms.directory,
+            ),
+        )
+    )
+    archive_data.directory_add([directory])
+
+    storage = archive.config.storage()
+    spy_directory_get_entries = mocker.spy(storage, "directory_get_entries")
+    spy_content_get = mocker.spy(storage, "content_get")
+
+    for _ in range(2):
+        _check_intrinsic_citation_metadata(
+            archive._lookup_directory_intrinsic_citation_metadata(directory.id.hex())
+        )
+
+    # one listing per traversed directory and a single batch of contents,
+    # metadata files being cached for subsequent lookups
+    assert spy_directory_get_entries.call_count == 2
+    assert spy_content_get.call_count == 1
+
+
 def test_lookup_swhid_raw_intrinsic_metadata_not_found(unknown_core_swhid):
     if unknown_core_swhid.object_type != ObjectType.CONTENT:
         with pytest.raises(NotFoundExc):
@@ -0,0 +1,111 @@
+# Copyright (C) 2026  The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU Affero General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+
+import pytest
+
+from swh.core.api.serializers import msgpack_dumps
+from swh.web.config import get_config
+from swh.web.utils import (
+    _compute_final_cache_key,
+    cache,
+    cache_codecs,
+    cache_get,
+    cache_set,
+)
+
+DATA = b"swh-web cache codec " * 100
+
+
+@pytest.fixture
+def cache_compression():
+    config = get_config()
+    config_backup = config.get("cache_compression")
+
+    def set_config(codec, min_size=0):
+        config["cache_compression"] = {"codec": codec, "min_size": min_size}
+        cache_codecs._configured_codec.cache_clear()
+
+    yield set_config
+    config["cache_compression"] = config_backup
+    cache_codecs._configured_codec.cache_clear()
+
+
+@pytest.mark.parametrize("codec_name", list(cache_codecs.available_codecs()))
+def test_cache_codec_roundtrip(cache_compression, codec_name):
+    cache_compression(codec_name)
+    codec = cache_codecs.available_codecs()[codec_name]
+    payload = cache_codecs.compress(DATA)
+    assert payload[:1] == codec.header
+    assert cache_codecs.decompress(payload) == DATA
+
+
+@pytest.mark.parametrize("codec_name", list(cache_codecs.available_codecs()))
+def test_cache_codec_concurrent_roundtrip(codec_name):
+    codec = cache_codecs.available_codecs()[codec_name]
+    datas = [DATA * i for i in range(1, 33)]
+
+    def roundtrip(data):
+        return codec.decompress(codec.compress(data))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert list(executor.map(roundtrip, datas)) == datas
+
+
+def test_cache_codec_size_threshold(cache_compression):
+    cache_compression("gzip", min_size=len(DATA) + 1)
+    payload = cache_codecs.compress(DATA)
+    assert payload == b"\x00" + DATA
+    assert cache_codecs.decompress(payload) == DATA
+
+
+def test_cache_codec_unavailable_fallback(cache_compression):
+    cache_compression("unknown")
+    payload = cache_codecs.compress(DATA)
+    assert payload[:1] == cache_codecs.available_codecs()["gzip"].header
+
+
+def test_cache_codec_unknown_header():
+    with pytest.raises(cache_codecs.UnknownCodecError):
+        cache_codecs.decompress(b"\xff" + DATA)
+
+
+def test_cache_codec_timings(cache_compression):
+    cache_compression("gzip")
+    cache_codecs.codec_timings(reset=True)
+    cache_codecs.decompress(cache_codecs.compress(DATA))
+    timings = cache_codecs.codec_timings()["gzip"]
+    assert timings["compress_calls"] == timings["decompress_calls"] == 1
+    assert timings["compress_raw_bytes"] == timings["decompress_raw_bytes"] == len(DATA)
+    assert timings["compress_payload_bytes"] < len(DATA)
+    assert timings["compress_seconds"] > 0
+
+
+def test_cache_get_legacy_gzip_entry_not_read():
+    # entries of previous swh-web versions are stored under unversioned keys
+    legacy_cache_key = _compute_final_cache_key("key").replace(
+        f".v{cache_codecs.CACHE_FORMAT_VERSION}.", "."
+    )
+    cache.set(legacy_cache_key, gzip.compress(msgpack_dumps({"foo": "bar"})))
+    assert cache_get("key") is None
+
+    cache_set("key", {"foo": "baz"})
+    assert cache.get(legacy_cache_key) == gzip.compress(msgpack_dumps({"foo": "bar"}))
+    assert cache_get("key") == {"foo": "baz"}
+
+
+def test_cache_get_unknown_codec_entry():
+    cache.set(_compute_final_cache_key("key"), b"\xff" + DATA)
+    assert cache_get("key") is None
+
+
+@pytest.mark.parametrize("codec_name", list(cache_codecs.available_codecs()))
+def test_cache_set_get_codec(cache_compression, codec_name):
+    cache_compression(codec_name)
+    value = {"foo": ["bar"] * 100}
+    cache_set("key", value)
+    assert cache_get("key") == value
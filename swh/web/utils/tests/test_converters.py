@@ -5,8 +5,14 @@
 
 import datetime
 import hashlib
+from io import StringIO
+
+from hypothesis import given
+
+from django.core.management import call_command
 
 from swh.model import hashutil
+from swh.model.hypothesis_strategies import revisions, snapshots
 from swh.model.model import (
     ObjectType,
     OriginVisit,
@@ -15,6 +21,8 @@ from swh.model.model import (
     Release,
     Revision,
     RevisionType,
+    SnapshotBranch,
+    SnapshotTargetType,
     TimestampWithTimezone,
 )
 from swh.web.utils import converters
@@ -345,6 +353,36 @@ def test_from_revision_model_object():
     assert actual_revision == expected_revision
 
 
+def _from_revision_dict(revision):
+    return converters.from_revision(revision.to_dict())
+
+
+@given(revisions())
+def test_from_revision_model_object_same_as_dict(revision):
+    assert converters.from_revision(revision) == _from_revision_dict(revision)
+
+
+def test_from_revision_model_object_invalid_utf8():
+    revision = Revision(
+        directory=hashutil.hash_to_bytes("7834ef7e7c357ce2af928115c6c6a42b7e2a44e6"),
+        author=None,
+        committer=Person(fullname=b"bob \xff", name=b"bob \xff", email=None),
+        message=b"invalid \xff message",
+        date=None,
+        committer_date=None,
+        synthetic=False,
+        type=RevisionType.GIT,
+        extra_headers=((b"gpgsig", b"invalid \xff signature"),),
+    )
+
+    actual_revision = converters.from_revision(revision)
+
+    assert actual_revision == _from_revision_dict(revision)
+    assert actual_revision["decoding_failures"] == ["message", "extra_headers"]
+    assert actual_revision["committer"]["decoding_failures"] == ["fullname", "name"]
+    assert actual_revision["merge"] is False
+
+
 def test_from_revision():
     ts = datetime.datetime(
         2000, 1, 17, 11, 23, 54, tzinfo=datetime.timezone.utc
@@ -680,6 +718,24 @@ def test_from_content():
     assert actual_content == expected_content
 
 
+def test_from_content_nested_dict():
+    sha1 = hashutil.hash_to_bytes("5c6f0e2750f48fa0bd0c4cf5976ba0b9e02ebda5")
+    content_input = {
+        "sha1": sha1,
+        "sha1_git": None,
+        "content": {"sha1": sha1, "ctime": "filtered-out", "status": "hidden"},
+    }
+
+    assert converters.from_content(content_input) == {
+        "sha1_git": None,
+        "content": {
+            "status": "absent",
+            "checksums": {"sha1": "5c6f0e2750f48fa0bd0c4cf5976ba0b9e02ebda5"},
+        },
+        "checksums": {"sha1": "5c6f0e2750f48fa0bd0c4cf5976ba0b9e02ebda5"},
+    }
+
+
 def test_from_person():
     person_input = {
         "id": 10,
@@ -740,6 +796,60 @@ def test_from_directory_entries():
     assert actual_dir_entries == expected_dir_entries
 
 
+def test_from_directory_entry_missing_checksums_invalid_utf8():
+    dir_entry_input = {
+        "dir_id": hashutil.hash_to_bytes("40e71b8614fcd89ccd17ca2b1d9e66c5b00a6d03"),
+        "type": "file",
+        "target": hashutil.hash_to_bytes("40e71b8614fcd89ccd17ca2b1d9e66c5b00a6d03"),
+        "name": b"invalid \xff name",
+        "perms": 0o100644,
+        "sha1": None,
+        "sha256": None,
+        "status": None,
+        "length": None,
+    }
+
+    assert converters.from_directory_entry(dir_entry_input) == {
+        "dir_id": "40e71b8614fcd89ccd17ca2b1d9e66c5b00a6d03",
+        "type": "file",
+        "target": "40e71b8614fcd89ccd17ca2b1d9e66c5b00a6d03",
+        "decoding_failures": ["name"],
+        "name": "invalid \\xff name",
+        "perms": 0o100644,
+        "length": None,
+    }
+
+
+@given(snapshots(min_size=1, max_size=10))
+def test_from_partial_branches_same_as_from_snapshot(snapshot):
+    branches = dict(snapshot.branches)
+    branches[b"invalid \xff name"] = None
+    branches[b"invalid \xff alias"] = SnapshotBranch(
+        target=b"invalid \xff name", target_type=SnapshotTargetType.ALIAS
+    )
+    for next_branch in (None, b"refs/heads/next", b"invalid \xff next"):
+        partial_branches = {
+            "id": snapshot.id,
+            "branches": branches,
+            "next_branch": next_branch,
+        }
+        expected_snapshot = converters.from_snapshot(
+            {
+                "id": snapshot.id,
+                "branches": {
+                    name: branch.to_dict() if branch else None
+                    for name, branch in branches.items()
+                },
+                "next_branch": next_branch,
+            }
+        )
+
+        actual_snapshot = converters.from_partial_branches(partial_branches)
+
+        assert actual_snapshot == expected_snapshot
+        assert list(actual_snapshot) == list(expected_snapshot)
+
+
 def test_from_filetype():
     content_filetype = {
         "id": hashutil.hash_to_bytes("5c6f0e2750f48fa0bd0c4cf5976ba0b9e02ebda5"),
@@ -756,3 +866,19 @@ def test_from_filetype():
     actual_content_filetype = converters.from_filetype(content_filetype)
 
     assert actual_content_filetype == expected_content_filetype
+
+
+def test_benchmark_converters_command():
+    out = StringIO()
+    call_command(
+        "benchmark_converters",
+        "--sizes",
+        "1",
+        "10",
+        "--iterations",
+        "1",
+        stdout=out,
+    )
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 9
+    assert lines[1].split()[:2] == ["revision", "1"]
@@ -0,0 +1,147 @@
+# Copyright (C) 2026  The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU Affero General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+import sys
+
+import pytest
+
+from swh.web.config import get_config
+from swh.web.utils import cache, cache_get, cache_set, django_cache, inprocess_cache
+from swh.web.utils.inprocess_cache import InProcessCache, copy_decoded
+
+
+@pytest.fixture
+def l1_cache_enabled():
+    config = get_config()
+    config_backup = config.get("inprocess_cache")
+    config["inprocess_cache"] = {
+        "enabled": True,
+        "max_size": 1024 * 1024,
+        "max_timeout": 60,
+    }
+    inprocess_cache.cache_clear()
+    yield inprocess_cache()
+    config["inprocess_cache"] = config_backup
+    inprocess_cache.cache_clear()
+
+
+def test_inprocess_cache_get_set():
+    l1_cache = InProcessCache(max_size=100)
+    assert l1_cache.get("foo") == (False, None)
+    l1_cache.set("foo", "bar", size=10)
+    assert l1_cache.get("foo") == (True, "bar")
+    assert l1_cache.stats() == {
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+        "expirations": 0,
+        "entries": 1,
+        "size": 10,
+    }
+
+
+def test_inprocess_cache_lru_eviction():
+    l1_cache = InProcessCache(max_size=30)
+    for key in ("a", "b", "c"):
+        l1_cache.set(key, key, size=10)
+    # mark a as recently used
+    assert l1_cache.get("a") == (True, "a")
+    l1_cache.set("d", "d", size=10)
+
+    assert l1_cache.get("b") == (False, None)
+    for key in ("a", "c", "d"):
+        assert l1_cache.get(key) == (True, key)
+    assert l1_cache.stats()["evictions"] == 1
+    assert l1_cache.stats()["size"] == 30
+
+
+def test_inprocess_cache_value_too_large():
+    l1_cache = InProcessCache(max_size=30)
+    l1_cache.set("a", "a", size=10)
+    l1_cache.set("a", "b", size=40)
+    assert l1_cache.get("a") == (False, None)
+    assert l1_cache.stats()["size"] == 0
+
+
+def test_inprocess_cache_timeout(mocker):
+    mock_monotonic = mocker.patch("swh.web.utils.inprocess_cache.time.monotonic")
+    mock_monotonic.return_value = 0
+    l1_cache = InProcessCache(max_size=100, max_timeout=60)
+    l1_cache.set("a", "a", size=10, timeout=10)
+    l1_cache.set("b", "b", size=10, timeout=None)
+    l1_cache.set("c", "c", size=10, timeout=0)
+
+    assert l1_cache.get("c") == (False, None)
+
+    mock_monotonic.return_value = 10
+    assert l1_cache.get("a") == (False, None)
+    assert l1_cache.get("b") == (True, "b")
+
+    mock_monotonic.return_value = 60
+    assert l1_cache.get("b") == (False, None)
+    assert l1_cache.stats()["expirations"] == 2
+
+
+def test_copy_decoded():
+    value = {"a": [{"b": 1}, (2, {"c": b"d"})]}
+    copy = copy_decoded(value)
+    assert copy == value
+    assert copy is not value
+    assert copy["a"][0] is not value["a"][0]
+    assert copy["a"][1][1] is not value["a"][1][1]
+
+
+def test_cache_get_set_inprocess_cache(l1_cache_enabled, mocker):
+    spy_cache_get = mocker.spy(cache, "get")
+    cache_set("foo", {"bar": [1, 2, 3]})
+
+    value = cache_get("foo")
+    assert value == {"bar": [1, 2, 3]}
+    assert spy_cache_get.call_count == 0
+
+    # returned values can be modified without altering cached ones
+    value["bar"].append(4)
+    assert cache_get("foo") == {"bar": [1, 2, 3]}
+    assert spy_cache_get.call_count == 0
+
+
+def test_cache_get_inprocess_cache_same_types_as_django_cache(l1_cache_enabled):
+    cache_set("foo", {"bar": (1, 2, 3)})
+
+    l1_value = cache_get("foo")
+    l1_cache_enabled.clear()
+    l2_value = cache_get("foo")
+
+    assert l1_value == l2_value == {"bar": [1, 2, 3]}
+
+
+def test_cache_get_fills_inprocess_cache(l1_cache_enabled, mocker):
+    cache_set("foo", "bar")
+    l1_cache_enabled.clear()
+
+    spy_cache_get = mocker.spy(cache, "get")
+    assert cache_get("foo") == "bar"
+    assert cache_get("foo") == "bar"
+    assert spy_cache_get.call_count == 1
+    assert l1_cache_enabled.stats()["hits"] == 1
+
+
+def add(x, y):
+    return x + y
+
+
+def test_django_cache_inprocess_cache(l1_cache_enabled, mocker):
+    spy_add = mocker.spy(sys.modules[__name__], "add")
+    spy_cache_get = mocker.spy(cache, "get")
+
+    cached_add = django_cache()(add)
+
+    assert cached_add(1, 2) == 3
+    assert cached_add(1, 2) == 3
+    assert cached_add(1, 2) == 3
+
+    assert spy_add.call_count == 1
+    # only the first call reached the django cache
+    assert spy_cache_get.call_count == 1
@@ -3,7 +3,9 @@
 # License: GNU Affero General Public License version 3, or any later version
 # See top-level LICENSE file for more information
 
+from copy import deepcopy
 from datetime import timedelta
+import time
 
 from hypothesis import given, settings
 import iso8601
@@ -11,9 +13,17 @@ import pytest
 
 from swh.model.model import Origin, OriginVisit, OriginVisitStatus
 from swh.storage.utils import now
+from swh.web.config import get_config
 from swh.web.tests.strategies import new_origin, new_snapshots
+from swh.web.utils import _compute_final_cache_key, cache, parse_iso8601_date_to_utc
 from swh.web.utils.exc import NotFoundExc
 from swh.web.utils.origin_visits import get_origin_visit, get_origin_visits
+import swh.web.utils.origin_visits_cache
+from swh.web.utils.origin_visits_cache import (
+    OriginVisitsCache,
+    decode_visits,
+    encode_visits,
+)
 
 
 @settings(max_examples=1)
@@ -257,7 +267,7 @@ def test_get_origin_visit_latest_snapshot(mocker, origin_with_multiple_visits):
 
 
 def test_get_origin_visits_with_limit(archive_data):
-    origin_url = "https//example.org/origin-visits-with-limit-test"
+    origin_url = "https://example.org/origin-visits-with-limit-test"
     archive_data.origin_add([Origin(url=origin_url)])
     # create 6 visits
     for i in range(6):
@@ -289,3 +299,190 @@ def test_get_origin_visits_with_limit(archive_data):
     assert len(visits) == 2
     assert visits[0]["visit"] == 5
     assert visits[-1]["visit"] == 6
+
+
+def _add_origin_visit(archive_data, origin_url, visit_date):
+    visit = archive_data.origin_visit_add(
+        [OriginVisit(origin=origin_url, date=visit_date, type="git")]
+    )[0]
+    archive_data.origin_visit_status_add(
+        [
+            OriginVisitStatus(
+                origin=origin_url,
+                visit=visit.visit,
+                date=visit_date + timedelta(minutes=5),
+                status="full",
+                snapshot=None,
+            )
+        ]
+    )
+
+
+def test_get_origin_visits_stale_while_revalidate(archive_data, mocker):
+    config = deepcopy(get_config())
+    config["origin_visits_stale_timeout"] = 60
+    mocker.patch("swh.web.utils.origin_visits.get_config").return_value = config
+
+    origin_url = "https://example.org/origin-visits-stale-test"
+    archive_data.origin_add([Origin(url=origin_url)])
+    for i in range(2):
+        _add_origin_visit(archive_data, origin_url, now() + timedelta(days=i))
+
+    assert len(get_origin_visits(origin_url)) == 2
+
+    _add_origin_visit(archive_data, origin_url, now() + timedelta(days=2))
+
+    from swh.web.utils import archive
+
+    spy_lookup_origin_visits = mocker.spy(archive, "lookup_origin_visits")
+
+    # cached visits are fresh, no lookup for new visits
+    assert len(get_origin_visits(origin_url)) == 2
+    assert spy_lookup_origin_visits.call_count == 0
+
+    # cached visits are stale, they are returned and refreshed in background
+    cache.delete(_compute_final_cache_key(f"origin_visits_{origin_url}_fresh"))
+    assert len(get_origin_visits(origin_url)) == 2
+
+    for _ in range(50):
+        visits = get_origin_visits(origin_url)
+        if len(visits) == 3:
+            break
+        time.sleep(0.1)
+    assert len(visits) == 3
+    assert spy_lookup_origin_visits.call_count > 0
+
+
+def test_encode_decode_visits():
+    visits = [
+        {
+            "origin": "https://example.org/repo",
+            "visit": 1,
+            "date": "2016-02-23T18:05:23.312045+00:00",
+            "type": "git",
+            "status": "full",
+            "snapshot": "1a8893e6a86f444e8be8e7bda6cb34fb1735a00e",
+            "metadata": {},
+        },
+        {
+            "origin": "https://example.org/repo",
+            "visit": 2,
+            "date": "2016-03-28T01:35:06+02:00",
+            "type": "hg",
+            "status": "ongoing",
+            "snapshot": None,
+            "metadata": {"foo": "bar"},
+        },
+        {
+            "origin": "https://example.org/repo",
+            "visit": 3,
+            "date": "2016-06-18T01:22:24.808485+00:00",
+            "type": "git",
+            "status": "unknown",
+            "snapshot": None,
+            "metadata": {},
+        },
+        {
+            # visit without any status
+            "origin": "https://example.org/repo",
+            "visit": 4,
+            "date": "2016-07-01T10:00:00+00:00",
+            "type": "git",
+        },
+    ]
+    columns = encode_visits(visits)
+    assert columns["types"] == ["git", "hg"]
+    assert columns["type"] == [0, 1, 0, 0]
+    assert decode_visits("https://example.org/repo", columns) == visits
+    assert decode_visits("https://example.org/repo", columns, start=2) == visits[2:]
+
+
+@pytest.fixture
+def small_visits_segments(mocker):
+    mocker.patch("swh.web.utils.origin_visits_cache.VISITS_SEGMENT_SIZE", 2)
+
+
+def test_get_origin_visits_segments(archive_data, small_visits_segments, mocker):
+    origin_url = "https://example.org/origin-visits-segments-test"
+    archive_data.origin_add([Origin(url=origin_url)])
+    for i in range(5):
+        _add_origin_visit(archive_data, origin_url, now() + timedelta(days=i))
+
+    visits = get_origin_visits(origin_url)
+    assert [v["visit"] for v in visits] == [1, 2, 3, 4, 5]
+
+    visits_cache = OriginVisitsCache.load(origin_url)
+    assert visits_cache.count == 5
+    assert visits_cache.visits() == visits
+
+    _add_origin_visit(archive_data, origin_url, now() + timedelta(days=5))
+
+    spy_cache_set = mocker.spy(swh.web.utils.origin_visits_cache, "cache_set")
+    visits = get_origin_visits(origin_url)
+    assert [v["visit"] for v in visits] == [1, 2, 3, 4, 5, 6]
+    # only the index holding the tail of cached visits was rewritten
+    assert [call.args[0] for call in spy_cache_set.call_args_list] == [
+        OriginVisitsCache.cache_entry_id(origin_url)
+    ]
+
+    visits = get_origin_visits(origin_url, limit=3)
+    assert [v["visit"] for v in visits] == [4, 5, 6]
+
+
+def test_get_origin_visits_segment_evicted(archive_data, small_visits_segments, mocker):
+    origin_url = "https://example.org/origin-visits-evicted-segment-test"
+    archive_data.origin_add([Origin(url=origin_url)])
+    for i in range(5):
+        _add_origin_visit(archive_data, origin_url, now() + timedelta(days=i))
+
+    visits = get_origin_visits(origin_url)
+
+    visits_cache = OriginVisitsCache.load(origin_url)
+    cache.delete(_compute_final_cache_key(visits_cache._segment_key(0)))
+
+    assert get_origin_visits(origin_url) == visits
+
+
+def test_get_origin_visit_by_date_cached(archive_data, small_visits_segments, mocker):
+    origin_url = "https://example.org/origin-visits-find-by-date-test"
+    archive_data.origin_add([Origin(url=origin_url)])
+    visit_dates = [
+        iso8601.parse_date(date)
+        for date in (
+            "2015-07-09T21:09:24+00:00",
+            "2016-02-23T18:05:23.312045+00:00",
+            "2016-02-23T18:05:23.312045+00:00",
+            "2016-03-28T01:35:06.554111+00:00",
+            "2016-06-18T01:22:24.808485+00:00",
+            "2016-08-14T12:10:00.536702+00:00",
+        )
+    ]
+    for visit_date in visit_dates:
+        _add_origin_visit(archive_data, origin_url, visit_date)
+
+    get_origin_visits(origin_url)
+
+    from swh.web.utils import archive
+
+    spy_find_by_date = mocker.spy(archive, "origin_visit_find_by_date")
+
+    for visit_ts in (
+        "2014-01-01",
+        "2015-07-09T21:09:24+00:00",
+        "2016-02-20",
+        "2016-02-23T18:05:23.312045+00:00",
+        "2016-03-01",
+        "2016-06-18T01:22",
+        "2016-08-14T12:10",
+    ):
+        expected_visit = archive_data.origin_visit_get_by(
+            origin_url,
+            archive_data.storage.origin_visit_find_by_date(
+                origin_url, parse_iso8601_date_to_utc(visit_ts)
+            ).visit,
+        )
+        assert get_origin_visit(origin_url, visit_ts=visit_ts) == expected_visit
+
+    # all lookups but the one more recent than the last cached visit
+    # were performed in cache
+    assert spy_find_by_date.call_count == 1
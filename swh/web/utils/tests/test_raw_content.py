@@ -0,0 +1,103 @@
+# Copyright (C) 2026  The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU Affero General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+import pytest
+
+from django.test import RequestFactory
+
+from swh.web.utils import archive
+from swh.web.utils.raw_content import (
+    RangeNotSatisfiable,
+    parse_range_header,
+    raw_content_response,
+)
+
+
+@pytest.mark.parametrize(
+    "range_header,expected_range",
+    [
+        ("bytes=0-99", (0, 100)),
+        ("bytes=100-", (100, 1000)),
+        ("bytes=-100", (900, 1000)),
+        ("bytes=900-2000", (900, 1000)),
+        ("bytes=-2000", (0, 1000)),
+        ("bytes=10-5", None),
+        ("bytes=0-10,20-30", None),
+        ("bytes=-", None),
+        ("lines=0-10", None),
+    ],
+)
+def test_parse_range_header(range_header, expected_range):
+    assert parse_range_header(range_header, 1000) == expected_range
+
+
+def test_parse_range_header_not_satisfiable():
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range_header("bytes=1000-", 1000)
+
+
+def _get(content, **headers):
+    request = RequestFactory().get("/", headers=headers)
+    return raw_content_response(request, content, filename="foo.txt")
+
+
+def test_raw_content_response(archive_data, content):
+    content_info = archive.lookup_content(f"sha1:{content['sha1']}")
+    data = archive_data.content_get_data(content["sha1"])["data"]
+
+    response = _get(content_info)
+    assert response.status_code == 200
+    assert response["ETag"] == f'"{content_info["checksums"]["sha1_git"]}"'
+    assert response["Accept-Ranges"] == "bytes"
+    assert response["Content-Length"] == str(len(data))
+    assert response["Content-Disposition"] == 'attachment; filename="foo.txt"'
+    assert b"".join(response.streaming_content) == data
+
+
+def test_raw_content_response_not_modified(archive_data, content, mocker):
+    content_info = archive.lookup_content(f"sha1:{content['sha1']}")
+    spy_lookup_content = mocker.spy(archive, "lookup_content")
+
+    response = _get(
+        content_info, if_none_match=f'"{content_info["checksums"]["sha1_git"]}"'
+    )
+    assert response.status_code == 304
+    assert response["ETag"] == f'"{content_info["checksums"]["sha1_git"]}"'
+    # content bytes were not fetched
+    assert spy_lookup_content.call_count == 0
+
+    response = _get(content_info, if_none_match='"foo"')
+    assert response.status_code == 200
+
+
+def test_raw_content_response_range(archive_data, content):
+    content_info = archive.lookup_content(f"sha1:{content['sha1']}")
+    data = archive_data.content_get_data(content["sha1"])["data"]
+    length = len(data)
+
+    response = _get(content_info, range="bytes=1-")
+    assert response.status_code == 206
+    assert response["Content-Range"] == f"bytes 1-{length - 1}/{length}"
+    assert response["Content-Length"] == str(length - 1)
+    assert b"".join(response.streaming_content) == data[1:]
+
+    # If-Range does not match, the whole content is sent
+    response = _get(content_info, range="bytes=1-", if_range='"foo"')
+    assert response.status_code == 200
+    assert b"".join(response.streaming_content) == data
+
+    response = _get(content_info, range=f"bytes={length}-")
+    assert response.status_code == 416
+    assert response["Content-Range"] == f"bytes */{length}"
+
+
+def test_raw_content_response_chunks(archive_data, content, mocker):
+    mocker.patch("swh.web.utils.raw_content.RAW_CONTENT_CHUNK_SIZE", 10)
+    content_info = archive.lookup_content(f"sha1:{content['sha1']}")
+    data = archive_data.content_get_data(content["sha1"])["data"]
+
+    chunks = list(_get(content_info).streaming_content)
+    assert all(len(chunk) <= 10 for chunk in chunks)
+    assert b"".join(chunks) == data
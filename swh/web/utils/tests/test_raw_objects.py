@@ -0,0 +1,187 @@
+# Copyright (C) 2026  The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU Affero General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+import hashlib
+import os
+
+import pytest
+
+from swh.model.hashutil import hash_to_bytes
+from swh.model.swhids import CoreSWHID
+from swh.web.utils import raw_objects
+from swh.web.utils.exc import NotFoundExc
+from swh.web.utils.raw_objects import StreamedRawObject, get_raw_object
+
+
+@pytest.fixture
+def raw_objects_cache(config_updater, tmp_path):
+    """Configure the raw objects cache to use a temporary disk cache directory,
+    which is returned."""
+    disk_cache_dir = tmp_path / "raw_objects"
+
+    def update_config(**kwargs):
+        config_updater(
+            {
+                "raw_objects_cache": {
+                    "timeout": 60,
+                    "max_memory_size": 1024 * 1024,
+                    "disk_cache_dir": str(disk_cache_dir),
+                    "max_disk_size": 1024 * 1024,
+                    **kwargs,
+                }
+            }
+        )
+        return disk_cache_dir
+
+    return update_config
+
+
+def _raw_object_bytes(raw_object):
+    if isinstance(raw_object, bytes):
+        return raw_object
+    raw_bytes = b"".join(raw_object.chunks)
+    assert len(raw_bytes) == raw_object.length
+    return raw_bytes
+
+
+def _check_raw_object(raw_object, object_id):
+    raw_bytes = _raw_object_bytes(raw_object)
+    assert hashlib.sha1(raw_bytes).digest() == hash_to_bytes(object_id)
+
+
+@pytest.fixture
+def swhids(content, directory, revision, release, snapshot):
+    return [
+        CoreSWHID.from_string(f"swh:1:cnt:{content['sha1_git']}"),
+        CoreSWHID.from_string(f"swh:1:dir:{directory}"),
+        CoreSWHID.from_string(f"swh:1:rev:{revision}"),
+        CoreSWHID.from_string(f"swh:1:rel:{release}"),
+        CoreSWHID.from_string(f"swh:1:snp:{snapshot}"),
+    ]
+
+
+def test_get_raw_object_cached_in_memory(mocker, raw_objects_cache, swhids):
+    disk_cache_dir = raw_objects_cache()
+    for swhid in swhids:
+        raw_object = get_raw_object(swhid)
+        assert isinstance(raw_object, bytes)
+        _check_raw_object(raw_object, swhid.object_id.hex())
+
+    assert not disk_cache_dir.exists()
+
+    mocker.patch("swh.web.config.storage").side_effect = Exception("no storage")
+    for swhid in swhids:
+        _check_raw_object(get_raw_object(swhid), swhid.object_id.hex())
+
+
+def test_get_raw_object_streamed_and_cached_on_disk(mocker, raw_objects_cache, swhids):
+    disk_cache_dir = raw_objects_cache(max_memory_size=0, max_disk_size=1024**3)
+    for swhid in swhids:
+        raw_object = get_raw_object(swhid)
+        assert isinstance(raw_object, StreamedRawObject)
+        _check_raw_object(raw_object, swhid.object_id.hex())
+
+    assert len(os.listdir(disk_cache_dir)) == len(swhids)
+
+    mocker.patch("swh.web.config.storage").side_effect = Exception("no storage")
+    for swhid in swhids:
+        raw_object = get_raw_object(swhid)
+        assert isinstance(raw_object, StreamedRawObject)
+        _check_raw_object(raw_object, swhid.object_id.hex())
+
+
+def test_get_raw_object_streamed_without_disk_cache(
+    tmp_path, raw_objects_cache, swhids
+):
+    raw_objects_cache(max_memory_size=0, disk_cache_dir=None)
+    for swhid in swhids:
+        raw_object = get_raw_object(swhid)
+        assert isinstance(raw_object, StreamedRawObject)
+        _check_raw_object(raw_object, swhid.object_id.hex())
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_get_raw_snapshot_paginated(mocker, raw_objects_cache, snapshot):
+    raw_objects_cache(max_memory_size=0)
+    mocker.patch.object(raw_objects, "SNAPSHOT_BRANCHES_PAGE_SIZE", 2)
+    snapshot_get_branches = mocker.spy(
+        raw_objects.config.storage(), "snapshot_get_branches"
+    )
+
+    raw_object = get_raw_object(CoreSWHID.from_string(f"swh:1:snp:{snapshot}"))
+
+    _check_raw_object(raw_object, snapshot)
+    assert all(
+        call.kwargs["branches_count"] <= 2
+        for call in snapshot_get_branches.call_args_list
+    )
+
+
+def test_get_raw_object_interrupted_stream_not_cached(raw_objects_cache, snapshot):
+    disk_cache_dir = raw_objects_cache(max_memory_size=0)
+    swhid = CoreSWHID.from_string(f"swh:1:snp:{snapshot}")
+
+    raw_object = get_raw_object(swhid)
+    next(raw_object.chunks)
+    raw_object.chunks.close()
+
+    assert os.listdir(disk_cache_dir) == []
+
+
+def test_get_raw_object_disk_cache_pruned(raw_objects_cache, swhids):
+    disk_cache_dir = raw_objects_cache(max_memory_size=0, max_disk_size=0)
+    for swhid in swhids:
+        _raw_object_bytes(get_raw_object(swhid))
+
+    assert os.listdir(disk_cache_dir) == []
+
+
+def test_prune_disk_cache_least_recently_used(tmp_path):
+    for i, name in enumerate(["a", "b", "c", ".tmp"]):
+        path = tmp_path / name
+        path.write_bytes(b"x" * 10)
+        os.utime(path, (i, i))
+    os.utime(tmp_path / "a", (10, 10))
+
+    raw_objects._prune_disk_cache(str(tmp_path), 20)
+
+    assert sorted(os.listdir(tmp_path)) == [".tmp", "a", "c"]
+
+
+def test_get_raw_object_not_found(raw_objects_cache, unknown_core_swhid):
+    raw_objects_cache()
+    with pytest.raises(NotFoundExc, match=f"Object with id {unknown_core_swhid}"):
+        get_raw_object(unknown_core_swhid)
+
+
+def test_get_raw_object_from_disk_cache_removed_while_streamed(
+    raw_objects_cache, snapshot
+):
+    disk_cache_dir = raw_objects_cache(max_memory_size=0)
+    swhid = CoreSWHID.from_string(f"swh:1:snp:{snapshot}")
+    raw_bytes = _raw_object_bytes(get_raw_object(swhid))
+
+    raw_object = get_raw_object(swhid)
+    # the cached file is pruned by another worker before the response is sent
+    for cached_file in os.listdir(disk_cache_dir):
+        os.remove(disk_cache_dir / cached_file)
+
+    assert raw_object.length == len(raw_bytes)
+    assert b"".join(raw_object.chunks) == raw_bytes
+
+
+def test_get_raw_object_untrusted_disk_cache_dir(raw_objects_cache, snapshot):
+    disk_cache_dir = raw_objects_cache(max_memory_size=0)
+    swhid = CoreSWHID.from_string(f"swh:1:snp:{snapshot}")
+    raw_bytes = _raw_object_bytes(get_raw_object(swhid))
+    assert os.listdir(disk_cache_dir)
+
+    # files of a disk cache directory writable by other users are not served
+    os.chmod(disk_cache_dir, 0o777)
+    for cached_file in os.listdir(disk_cache_dir):
+        (disk_cache_dir / cached_file).write_bytes(b"planted")
+
+    assert _raw_object_bytes(get_raw_object(swhid)) == raw_bytes
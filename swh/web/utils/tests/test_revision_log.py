@@ -0,0 +1,125 @@
+# Copyright (C) 2026  The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU Affero General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+import pytest
+
+from swh.web.utils import _compute_final_cache_key, archive, cache, revision_log
+from swh.web.utils.revision_log import RevisionLogIndex
+
+
+@pytest.fixture
+def small_log_blocks(mocker):
+    mocker.patch.object(revision_log, "REVISION_LOG_BLOCK_SIZE", 3)
+
+
+def _full_log(revision_id, revs_ordering):
+    return [
+        rev["id"] for rev in archive.get_revisions_walker(revs_ordering, revision_id)
+    ]
+
+
+def _paginate(revision_id, revs_ordering, per_page):
+    revs = []
+    offset = 0
+    has_more = True
+    while has_more:
+        # reload index from cache for each page like browse views
+        page, has_more = RevisionLogIndex(revision_id, revs_ordering).revisions(
+            offset, per_page
+        )
+        revs += page
+        offset += per_page
+    return revs
+
+
+@pytest.mark.parametrize("revs_ordering", ["committer_date", "dfs", "dfs_post", "bfs"])
+def test_revision_log_index_pagination(
+    small_log_blocks, ancestor_revisions, revs_ordering
+):
+    revision_id = ancestor_revisions["sha1_git_root"]
+    full_log = _full_log(revision_id, revs_ordering)
+
+    assert _paginate(revision_id, revs_ordering, per_page=2) == full_log
+
+    index = RevisionLogIndex(revision_id, revs_ordering)
+    assert index.complete
+    assert index.count == len(full_log)
+    assert index.revisions(len(full_log), 2) == ([], False)
+
+
+def test_revision_log_index_page_from_blocks(
+    small_log_blocks, ancestor_revisions, mocker
+):
+    revision_id = ancestor_revisions["sha1_git_root"]
+    full_log = _full_log(revision_id, "committer_date")
+
+    revs, has_more = RevisionLogIndex(revision_id, "committer_date").revisions(4, 5)
+    assert revs == full_log[4:9]
+    assert has_more == (len(full_log) > 9)
+
+    # pages already in the log are read from cached blocks
+    mock_walker = mocker.patch.object(archive, "get_revisions_walker")
+    revs, _ = RevisionLogIndex(revision_id, "committer_date").revisions(1, 5)
+    assert revs == full_log[1:6]
+    mock_walker.assert_not_called()
+
+
+def test_revision_log_index_walker_yields_ids(ancestor_revisions, mocker):
+    revision_id = ancestor_revisions["sha1_git_root"]
+    spy_from_revision = mocker.spy(archive.converters, "from_revision")
+
+    RevisionLogIndex(revision_id, "committer_date").revisions(0, 5)
+
+    # only the start revision is converted, when checking it exists
+    assert spy_from_revision.call_count == 1
+
+
+def test_revision_log_index_block_evicted(small_log_blocks, ancestor_revisions):
+    revision_id = ancestor_revisions["sha1_git_root"]
+    full_log = _full_log(revision_id, "dfs")
+
+    index = RevisionLogIndex(revision_id, "dfs")
+    index.revisions(0, 7)
+    cache.delete(_compute_final_cache_key(index._block_key(0)))
+
+    assert RevisionLogIndex(revision_id, "dfs").revisions(0, 7)[0] == full_log[:7]
+    assert _paginate(revision_id, "dfs", per_page=4) == full_log
+
+
+def test_revision_log_index_geometric_growth(
+    small_log_blocks, ancestor_revisions, mocker
+):
+    revision_id = ancestor_revisions["sha1_git_root"]
+    full_log = _full_log(revision_id, "committer_date")
+    spy_walker = mocker.spy(archive, "get_revisions_walker")
+
+    assert _paginate(revision_id, "committer_date", per_page=1) == full_log
+
+    # the log size at least doubles each time it is extended
+    assert spy_walker.call_count <= len(full_log).bit_length() + 1
+
+
+@pytest.mark.parametrize("revs_ordering", ["committer_date", "dfs", "dfs_post", "bfs"])
+def test_revision_log_index_resumed_walker_state(
+    small_log_blocks, ancestor_revisions, revs_ordering
+):
+    revision_id = ancestor_revisions["sha1_git_root"]
+
+    index = RevisionLogIndex(revision_id, revs_ordering)
+    index.revisions(0, 2)
+    count = index.count
+
+    walker = archive.get_revisions_walker(revs_ordering, revision_id, max_revs=count)
+    list(walker)
+    state = walker.export_state()
+
+    # the walker state rebuilt from cache matches the one of a walk that was
+    # not interrupted
+    resumed_state = RevisionLogIndex(revision_id, revs_ordering)._walker_state()
+    assert resumed_state.done == state.done
+    assert list(resumed_state.revs_to_visit) == list(state.revs_to_visit)
+    assert resumed_state.last_rev == state.last_rev
+    assert resumed_state.num_revs == state.num_revs
+    assert resumed_state.missing_revs == state.missing_revs
@@ -6,6 +6,8 @@
 import datetime
 import math
 import sys
+import threading
+import time
 from urllib.parse import quote
 
 import attr
@@ -17,15 +19,18 @@ from django.urls import re_path as url
 from django.urls.exceptions import NoReverseMatch
 
 from swh.web.utils import (
+    _background_refresh_pending,
     cache,
     django_cache,
     format_utc_iso_date,
     gen_path_info,
     origin_visit_types,
     parse_iso8601_date_to_utc,
+    refresh_in_background,
     reverse,
     rst_to_html,
     shorten_path,
+    single_flight_stats,
     strtobool,
 )
 from swh.web.utils.exc import BadInputExc
@@ -514,6 +519,139 @@ def test_django_cache_get_pass_through_on_errors(mocker):
     assert cached_add(1, 1) == 2
 
 
+def slow_add(x, y):
+    time.sleep(0.3)
+    return x + y
+
+
+def _call_concurrently(func, nb_calls, *args):
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(func(*args)))
+        for _ in range(nb_calls)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_django_cache_single_flight(mocker):
+    spy_add = mocker.spy(sys.modules[__name__], "slow_add")
+    stats_before = single_flight_stats()
+
+    cached_add = django_cache(single_flight=True)(slow_add)
+
+    assert _call_concurrently(cached_add, 5, 1, 2) == [3] * 5
+
+    assert spy_add.call_count == 1
+    stats = single_flight_stats()
+    assert stats["computations"] - stats_before["computations"] == 1
+    assert stats["avoided_computations"] - stats_before["avoided_computations"] == 4
+
+
+def test_django_cache_single_flight_wait_timeout(mocker):
+    spy_add = mocker.spy(sys.modules[__name__], "slow_add")
+    stats_before = single_flight_stats()
+
+    cached_add = django_cache(single_flight=True, single_flight_timeout=0)(slow_add)
+
+    # make the lock held by another worker
+    mocker.patch("swh.web.utils._single_flight_acquire").return_value = False
+
+    assert cached_add(1, 2) == 3
+    assert spy_add.call_count == 1
+    stats = single_flight_stats()
+    assert stats["wait_timeouts"] - stats_before["wait_timeouts"] == 1
+
+
+def test_django_cache_single_flight_computation_error(mocker):
+    nb_calls = 0
+
+    def failing_first_add(x, y):
+        nonlocal nb_calls
+        nb_calls += 1
+        time.sleep(0.3)
+        if nb_calls == 1:
+            raise ValueError("error")
+        return x + y
+
+    cached_add = django_cache(
+        single_flight=True, catch_exception=True, exception_return_value=0
+    )(failing_first_add)
+
+    results = _call_concurrently(cached_add, 2, 1, 2)
+
+    # the other caller computes the value once the lock is released
+    assert sorted(results) == [0, 3]
+    assert nb_calls == 2
+
+
+def test_django_cache_stale_timeout():
+    nb_calls = 0
+
+    def incr():
+        nonlocal nb_calls
+        nb_calls += 1
+        return nb_calls
+
+    cached_incr = django_cache(stale_timeout=0)(incr)
+
+    assert cached_incr() == 1
+    # stale value is returned and refreshed in background
+    assert cached_incr() == 1
+
+    for _ in range(50):
+        if nb_calls == 2:
+            break
+        time.sleep(0.1)
+    assert nb_calls == 2
+    assert cached_incr() == 2
+
+
+def test_django_cache_stale_timeout_fresh_value():
+    nb_calls = 0
+
+    def incr():
+        nonlocal nb_calls
+        nb_calls += 1
+        return nb_calls
+
+    cached_incr = django_cache(stale_timeout=60)(incr)
+
+    assert cached_incr() == cached_incr() == 1
+    time.sleep(0.2)
+    assert nb_calls == 1
+
+
+def test_refresh_in_background_deduplication(mocker):
+    mocker.patch("swh.web.utils._background_refresh_executor")
+    refresh = mocker.Mock()
+    assert refresh_in_background("key", refresh)
+    assert not refresh_in_background("key", refresh)
+    _background_refresh_pending.clear()
+
+
+@pytest.mark.parametrize(
+    "lock_timeout,expected_lock_timeout", [(None, 60), (3600, 3600)]
+)
+def test_refresh_in_background_lock_timeout(
+    mocker, lock_timeout, expected_lock_timeout
+):
+    mock_executor = mocker.patch("swh.web.utils._background_refresh_executor")
+    mock_executor.return_value.submit.side_effect = lambda fn: fn()
+    mock_acquire = mocker.patch(
+        "swh.web.utils._single_flight_acquire", return_value=True
+    )
+    refresh = mocker.Mock()
+
+    assert refresh_in_background("key", refresh, lock_timeout=lock_timeout)
+
+    refresh.assert_called_once()
+    assert mock_acquire.call_args.args[1] == expected_lock_timeout
+
+
 @pytest.mark.parametrize("value", ["y", "YES", "t", "True", "on", "1"])
 def test_strtobool_true(value):
     assert strtobool(value)
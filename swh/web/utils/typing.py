@@ -84,7 +84,7 @@ class SnapshotReleaseInfo(TypedDict):
     """optional directory associated to the release"""
     id: str
     """release identifier"""
-    message: str
+    message: Optional[str]
     """release message"""
     name: str
     """release name"""